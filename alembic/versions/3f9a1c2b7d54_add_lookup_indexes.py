@@ -0,0 +1,88 @@
+"""Add lookup indexes
+
+Revision ID: 3f9a1c2b7d54
+Revises: 9133ef089841
+Create Date: 2026-10-18 12:04:31.218640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import core
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2b7d54'
+down_revision = '9133ef089841'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the most advanced member of each player on a server
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_members AS
+        SELECT uuid FROM (
+            SELECT members.uuid, row_number() OVER (
+                PARTITION BY members.player_uuid, members.server_uuid
+                ORDER BY levels.value DESC NULLS LAST, members.exp DESC
+            ) AS position
+            FROM members
+            LEFT JOIN levels ON levels.uuid = members.level_uuid
+        ) AS ranked
+        WHERE ranked.position > 1
+    """)
+    op.execute("""
+        DELETE FROM member_role_association
+        WHERE member_uuid IN (SELECT uuid FROM duplicate_members)
+    """)
+    op.execute("""
+        DELETE FROM members
+        WHERE uuid IN (SELECT uuid FROM duplicate_members)
+    """)
+    op.execute("DROP TABLE duplicate_members")
+
+    op.create_unique_constraint(
+        'uq_members_player_uuid_server_uuid', 'members',
+        ['player_uuid', 'server_uuid']
+    )
+    op.create_index(
+        'ix_members_server_uuid_exp', 'members',
+        ['server_uuid', sa.text('exp DESC')]
+    )
+    op.create_index(
+        'ix_member_role_association_member_uuid', 'member_role_association',
+        ['member_uuid']
+    )
+    op.create_index('ix_levels_value', 'levels', ['value'])
+    op.create_index('ix_roles_server_uuid', 'roles', ['server_uuid'])
+    op.create_index('ix_roleemojis_identifier', 'roleemojis', ['identifier'])
+    op.create_index(
+        'ix_commands_name_server_uuid', 'commands', ['name', 'server_uuid']
+    )
+    op.create_index(
+        'ix_dota_guilds_server_uuid', 'dota_guilds', ['server_uuid']
+    )
+    op.create_index(
+        'ix_steamposts_subscriptions_channel_id', 'steamposts_subscriptions',
+        ['channel_id']
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_steamposts_subscriptions_channel_id',
+        table_name='steamposts_subscriptions'
+    )
+    op.drop_index('ix_dota_guilds_server_uuid', table_name='dota_guilds')
+    op.drop_index('ix_commands_name_server_uuid', table_name='commands')
+    op.drop_index('ix_roleemojis_identifier', table_name='roleemojis')
+    op.drop_index('ix_roles_server_uuid', table_name='roles')
+    op.drop_index('ix_levels_value', table_name='levels')
+    op.drop_index(
+        'ix_member_role_association_member_uuid',
+        table_name='member_role_association'
+    )
+    op.drop_index('ix_members_server_uuid_exp', table_name='members')
+    op.drop_constraint(
+        'uq_members_player_uuid_server_uuid', 'members', type_='unique'
+    )
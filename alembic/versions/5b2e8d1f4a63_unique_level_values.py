@@ -0,0 +1,48 @@
+"""Make level values unique
+
+Revision ID: 5b2e8d1f4a63
+Revises: 3f9a1c2b7d54
+Create Date: 2026-10-18 15:20:12.504118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import core
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2e8d1f4a63'
+down_revision = '3f9a1c2b7d54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep one level of each value and move members onto it
+    op.execute("""
+        CREATE TEMPORARY TABLE duplicate_levels AS
+        SELECT uuid, first_value(uuid) OVER (
+            PARTITION BY value ORDER BY uuid
+        ) AS kept
+        FROM levels
+    """)
+    op.execute("""
+        UPDATE members SET level_uuid = duplicate_levels.kept
+        FROM duplicate_levels
+        WHERE members.level_uuid = duplicate_levels.uuid
+        AND duplicate_levels.uuid <> duplicate_levels.kept
+    """)
+    op.execute("""
+        DELETE FROM levels USING duplicate_levels
+        WHERE levels.uuid = duplicate_levels.uuid
+        AND duplicate_levels.uuid <> duplicate_levels.kept
+    """)
+    op.execute("DROP TABLE duplicate_levels")
+
+    op.drop_index('ix_levels_value', table_name='levels')
+    op.create_index('ix_levels_value', 'levels', ['value'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_levels_value', table_name='levels')
+    op.create_index('ix_levels_value', 'levels', ['value'])
@@ -6,6 +6,26 @@ from pydantic import BaseSettings, AnyHttpUrl
 class Settings(BaseSettings):
     SERVER_NAME: str = os.environ.get("SERVER_NAME", "Hellshade-bot")
     DATABASE_URL: str = os.environ.get("DB_URL", f"postgresql://{os.environ.get('DB_USER')}:{os.environ.get('DB_PASS')}@db/{os.environ.get('DB_NAME')}")
+    IMAGE_CACHE_BYTES: int = os.environ.get("IMAGE_CACHE_BYTES", 64 * 1024 * 1024)
+    IMAGE_MAX_AGE: int = os.environ.get("IMAGE_MAX_AGE", 3600)
+    RENDER_WORKERS: int = os.environ.get("RENDER_WORKERS", 2)
+    RENDER_QUEUE_SIZE: int = os.environ.get("RENDER_QUEUE_SIZE", 16)
+    RENDER_TIMEOUT: float = os.environ.get("RENDER_TIMEOUT", 10)
+    LIVE_CHANNEL: str = os.environ.get("LIVE_CHANNEL", "member_changes")
+    LIVE_QUEUE_SIZE: int = os.environ.get("LIVE_QUEUE_SIZE", 100)
+    LIVE_KEEPALIVE: float = os.environ.get("LIVE_KEEPALIVE", 15)
+    STATS_TTL: float = os.environ.get("STATS_TTL", 30)
+    STATS_CACHE_SIZE: int = os.environ.get("STATS_CACHE_SIZE", 1000)
+    GRAPHQL_CACHE_SIZE: int = os.environ.get("GRAPHQL_CACHE_SIZE", 1000)
+    GRAPHQL_CACHE_TTL: float = os.environ.get("GRAPHQL_CACHE_TTL", 30)
+    GRAPHQL_LEVELS_TTL: float = os.environ.get("GRAPHQL_LEVELS_TTL", 300)
+    GRAPHQL_MAX_DEPTH: int = os.environ.get("GRAPHQL_MAX_DEPTH", 10)
+    GRAPHQL_MAX_COST: int = os.environ.get("GRAPHQL_MAX_COST", 20000)
+    GRAPHQL_DEFAULT_LIST_SIZE: int = os.environ.get("GRAPHQL_DEFAULT_LIST_SIZE", 100)
+    GRAPHQL_MAX_LIST_SIZE: int = os.environ.get("GRAPHQL_MAX_LIST_SIZE", 500)
+    GRAPHQL_PERSISTED_QUERIES: str = os.environ.get("GRAPHQL_PERSISTED_QUERIES", "persisted_queries.json")
+    GRAPHQL_PERSISTED_SIZE: int = os.environ.get("GRAPHQL_PERSISTED_SIZE", 1000)
+    GRAPHQL_PERSISTED_ONLY: bool = os.environ.get("GRAPHQL_PERSISTED_ONLY", False)
     ORIGINS: List[AnyHttpUrl] = os.environ.get("ORIGINS", ["http://localhost:3080", "http://localhost:8080", os.environ.get('SITE_URL')])
 
     class Config:
@@ -1,25 +1,83 @@
 from graphene import relay, ObjectType, Schema, Field, String, Int, Boolean, \
-    List, DateTime
-from graphene_sqlalchemy import SQLAlchemyConnectionField
-from core.database.schemas.graphql.levels import Level
+    List, DateTime, Enum, Argument
+from graphql_relay import cursor_to_offset
+from sqlalchemy import nullslast
+from core.database.models.levels import Level as LevelModel
+from core.database.models.members import Member as MemberModel
+from core.database.models.players import Player as PlayerModel
+from core.database.models.servers import Server as ServerModel
+from core.database.stats import get_level_histogram
+from core.database.schemas.graphql.fields import \
+    BoundedSQLAlchemyConnectionField
+from core.database.schemas.graphql.levels import Level, LevelCount
 from core.database.schemas.graphql.servers import Server
 from core.database.schemas.graphql.members import Member
 from core.database.schemas.graphql.players import Player
 
 
+class MemberOrder(Enum):
+    LEVEL = "level"
+    EXP = "exp"
+    NAME = "name"
+
+
+def paginate(query, first=None, after=None, offset=None):
+    """
+    Apply pagination to a query. Plain lists are not bounded, only
+    connections have a maximum page size.
+    :param query: Ordered query
+    :param first: Maximum number of results, all results if not given
+    :param after: Cursor of the last result of the previous page
+    :param offset: Number of results to skip, used when after is not given
+    :return: Paginated query
+    """
+    if after is not None:
+        cursor = cursor_to_offset(after)
+        if cursor is not None:
+            offset = cursor + 1
+
+    if offset is not None and offset > 0:
+        query = query.offset(offset)
+
+    if first is not None:
+        query = query.limit(first)
+
+    return query
+
+
+def order_members(query, order_by=None):
+    if order_by == MemberOrder.LEVEL:
+        return query.outerjoin(
+            LevelModel, LevelModel.uuid == MemberModel.level_uuid
+        ).order_by(
+            nullslast(LevelModel.value.desc()),
+            MemberModel.exp.desc(),
+            MemberModel.uuid
+        )
+    elif order_by == MemberOrder.EXP:
+        return query.order_by(MemberModel.exp.desc(), MemberModel.uuid)
+    elif order_by == MemberOrder.NAME:
+        return query.order_by(PlayerModel.name, MemberModel.uuid)
+
+    return query.order_by(MemberModel.uuid)
+
+
 class Query(ObjectType):
     node = relay.Node.Field()
-    all_levels = SQLAlchemyConnectionField(Level.connection)
-    all_servers = SQLAlchemyConnectionField(Server.connection)
-    all_members = SQLAlchemyConnectionField(Member.connection)
-    all_players = SQLAlchemyConnectionField(Player.connection)
+    all_levels = BoundedSQLAlchemyConnectionField(Level.connection)
+    all_servers = BoundedSQLAlchemyConnectionField(Server.connection)
+    all_members = BoundedSQLAlchemyConnectionField(Member.connection)
+    all_players = BoundedSQLAlchemyConnectionField(Player.connection)
 
     level = List(
         Level,
         uuid=String(),
         value=Int(),
         title=String(),
-        exp=Int()
+        exp=Int(),
+        first=Int(),
+        after=String(),
+        offset=Int()
     )
     server = List(
         Server,
@@ -28,7 +86,10 @@ class Query(ObjectType):
         name=String(),
         server_exp=Int(),
         channel=String(),
-        last_seen=DateTime()
+        last_seen=DateTime(),
+        first=Int(),
+        after=String(),
+        offset=Int()
     )
     member = List(
         Member,
@@ -36,31 +97,89 @@ class Query(ObjectType):
         exp=Int(),
         player_uuid=String(),
         server_uuid=String(),
-        level_uuid=String()
+        level_uuid=String(),
+        first=Int(),
+        after=String(),
+        offset=Int(),
+        order_by=Argument(MemberOrder),
+        exclude_hidden=Boolean(default_value=False)
     )
+    top_members = List(
+        Member,
+        server_uuid=String(required=True),
+        n=Int(default_value=10),
+        exclude_hidden=Boolean(default_value=False)
+    )
+    level_histogram = List(LevelCount, server_uuid=String())
     player = List(
         Player,
         uuid=String(),
         discord_id=String(),
         name=String(),
-        hidden=Boolean()
+        hidden=Boolean(),
+        first=Int(),
+        after=String(),
+        offset=Int(),
+        exclude_hidden=Boolean(default_value=False)
     )
 
-    def resolve_level(self, info, **kwargs):
-        query = Level.get_query(info).filter_by(**kwargs)
-        return query.all()
+    def resolve_level(
+            self, info, first=None, after=None, offset=None, **kwargs
+    ):
+        query = Level.get_query(info).filter_by(**kwargs).\
+            order_by(LevelModel.value, LevelModel.uuid)
+        return paginate(query, first, after, offset).all()
 
-    def resolve_server(self, info, **kwargs):
-        query = Server.get_query(info).filter_by(**kwargs)
-        return query.all()
+    def resolve_server(
+            self, info, first=None, after=None, offset=None, **kwargs
+    ):
+        query = Server.get_query(info).filter_by(**kwargs).\
+            order_by(ServerModel.name, ServerModel.uuid)
+        return paginate(query, first, after, offset).all()
 
-    def resolve_member(self, info, **kwargs):
+    def resolve_member(
+            self, info, first=None, after=None, offset=None, order_by=None,
+            exclude_hidden=False, **kwargs
+    ):
         query = Member.get_query(info).filter_by(**kwargs)
-        return query.all()
 
-    def resolve_player(self, info, **kwargs):
+        if exclude_hidden or order_by == MemberOrder.NAME:
+            query = query.join(
+                PlayerModel, PlayerModel.uuid == MemberModel.player_uuid
+            )
+        if exclude_hidden:
+            query = query.filter(PlayerModel.hidden.is_(False))
+
+        query = order_members(query, order_by)
+        return paginate(query, first, after, offset).all()
+
+    def resolve_top_members(self, info, server_uuid, n, exclude_hidden):
+        query = Member.get_query(info).filter_by(server_uuid=server_uuid)
+
+        if exclude_hidden:
+            query = query.join(
+                PlayerModel, PlayerModel.uuid == MemberModel.player_uuid
+            ).filter(PlayerModel.hidden.is_(False))
+
+        return order_members(query, MemberOrder.LEVEL).limit(n).all()
+
+    def resolve_level_histogram(self, info, server_uuid=None):
+        return [
+            {"level": level, "count": count}
+            for level, count in get_level_histogram(server_uuid)
+        ]
+
+    def resolve_player(
+            self, info, first=None, after=None, offset=None,
+            exclude_hidden=False, **kwargs
+    ):
         query = Player.get_query(info).filter_by(**kwargs)
-        return query.all()
+
+        if exclude_hidden:
+            query = query.filter(PlayerModel.hidden.is_(False))
+
+        query = query.order_by(PlayerModel.name, PlayerModel.uuid)
+        return paginate(query, first, after, offset).all()
 
 
 schema = Schema(query=Query)
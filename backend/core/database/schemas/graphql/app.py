@@ -0,0 +1,260 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from inspect import isawaitable
+from pathlib import Path
+from typing import Optional
+
+from graphql import DocumentNode, GraphQLError, OperationDefinitionNode, \
+    OperationType, execute, parse, validate
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette_graphene3 import GraphQLApp
+
+from config import settings
+from core.database.schemas.graphql.cache import CachedResult, QueryCache, \
+    cache_plan
+from core.database.schemas.graphql.limits import check_limits
+
+logger = logging.getLogger(__name__)
+
+
+class PersistedQueries:
+    """Queries stored by their SHA-256 hash"""
+
+    def __init__(self, maxsize: int, path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.__data: "OrderedDict[str, str]" = OrderedDict()
+
+        # Queries known in advance are never evicted
+        self.__known = {}
+        if path and Path(path).exists():
+            with open(path, "r") as f:
+                self.__known = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self.__known) + len(self.__data)
+
+    def get(self, sha256: str) -> Optional[str]:
+        query = self.__known.get(sha256)
+        if query is not None:
+            return query
+
+        query = self.__data.get(sha256)
+        if query is not None:
+            self.__data.move_to_end(sha256)
+        return query
+
+    def set(self, sha256: str, query: str):
+        if sha256 in self.__known:
+            return
+
+        self.__data[sha256] = query
+        self.__data.move_to_end(sha256)
+
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+
+def error(message: str, status_code: int = 400, code: str = None):
+    body = {"message": message}
+    if code is not None:
+        body["extensions"] = {"code": code}
+    return JSONResponse({"errors": [body]}, status_code=status_code)
+
+
+class PublicGraphQLApp(GraphQLApp):
+    """
+    GraphQL app for the public API. Supports persisted queries, rejects
+    queries over the depth and cost limits before executing them and serves
+    repeated queries from a QueryCache.
+
+    Persisted queries can also be sent with GET, so that browsers cache the
+    responses and revalidate them with their ETag. Other GET requests are
+    passed to on_get.
+    """
+
+    def __init__(
+            self, schema, cache: QueryCache, persisted: PersistedQueries,
+            **kwargs
+    ):
+        super().__init__(schema, **kwargs)
+        self.cache = cache
+        self.persisted = persisted
+        self.rejected = 0
+
+    async def _get_on_get(self, request: Request) -> Optional[Response]:
+        params = request.query_params
+        if "extensions" not in params:
+            return await super()._get_on_get(request)
+
+        operation = {"operationName": params.get("operationName")}
+        for name in ("extensions", "variables"):
+            if name not in params:
+                continue
+            try:
+                operation[name] = json.loads(params[name])
+            except ValueError:
+                return error(f"{name} is not a valid JSON")
+
+        # Only queries already known by their hash are served over GET
+        if "query" in params:
+            return error("Send the full query with POST")
+
+        return await self.__handle_operation(request, operation)
+
+    async def _handle_http_request(self, request: Request) -> Response:
+        content_type = request.headers.get("Content-Type", "").split(";")[0]
+        if content_type != "application/json":
+            return error("Content-type must be application/json")
+
+        try:
+            operation = await request.json()
+        except (TypeError, ValueError):
+            return error("Request body is not a valid JSON")
+
+        return await self.__handle_operation(request, operation)
+
+    async def __handle_operation(
+            self, request: Request, operation
+    ) -> Response:
+        if not isinstance(operation, dict):
+            return error("This server does not support batching")
+
+        query = operation.get("query")
+        variables = operation.get("variables")
+        operation_name = operation.get("operationName")
+
+        # Automatic persisted queries: clients send the hash alone and the
+        # full query only when it is not known yet
+        extensions = operation.get("extensions") or {}
+        persisted = extensions.get("persistedQuery") \
+            if isinstance(extensions, dict) else None
+        sha256 = persisted.get("sha256Hash") \
+            if isinstance(persisted, dict) else None
+
+        if sha256 is not None and query is None:
+            query = self.persisted.get(sha256)
+            if query is None:
+                return error(
+                    "PersistedQueryNotFound", 200, "PERSISTED_QUERY_NOT_FOUND"
+                )
+        elif sha256 is not None:
+            if hashlib.sha256(query.encode('UTF-8')).hexdigest() != sha256:
+                return error("provided sha does not match query")
+        elif settings.GRAPHQL_PERSISTED_ONLY:
+            return error(
+                "Only persisted queries are allowed", 400,
+                "PERSISTED_QUERY_REQUIRED"
+            )
+
+        if not isinstance(query, str):
+            return error("Query must be a string")
+
+        try:
+            document = parse(query)
+        except GraphQLError as e:
+            return JSONResponse({"errors": [e.formatted]}, status_code=400)
+
+        operations = [
+            d for d in document.definitions
+            if isinstance(d, OperationDefinitionNode)
+            and (operation_name is None or
+                 (d.name is not None and d.name.value == operation_name))
+        ]
+        if len(operations) != 1:
+            return error("Operation could not be determined")
+
+        if request.method == "GET" and \
+                operations[0].operation != OperationType.QUERY:
+            return error("Only queries can be sent with GET", 405)
+
+        reason = check_limits(
+            self.schema.graphql_schema, document, operations[0], variables
+        )
+        if reason is not None:
+            self.rejected += 1
+            return error(reason, 400, "QUERY_TOO_COMPLEX")
+
+        if sha256 is not None:
+            self.persisted.set(sha256, query)
+
+        plan = cache_plan(document, operations[0], variables, operation_name)
+        if plan is None:
+            return await self.__execute(
+                request, document, variables, operation_name
+            )
+
+        key, ttl, fields, servers = plan
+        result = self.cache.get(key)
+
+        if result is None:
+            response = await self.__execute(
+                request, document, variables, operation_name
+            )
+            if response.status_code != 200 or \
+                    "errors" in json.loads(response.body):
+                return response
+
+            result = CachedResult(
+                expires=time.monotonic() + ttl,
+                etag=f'"{key[:32]}-{hashlib.md5(response.body).hexdigest()}"',
+                body=response.body,
+                fields=fields,
+                servers=servers
+            )
+            self.cache.set(key, result)
+
+        headers = {"ETag": result.etag, "Cache-Control": "no-cache"}
+        if request.headers.get("if-none-match") == result.etag:
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            result.body, media_type=JSONResponse.media_type, headers=headers
+        )
+
+    async def __execute(
+            self, request: Request, document: DocumentNode,
+            variables: Optional[dict], operation_name: Optional[str]
+    ) -> JSONResponse:
+        context_value = await self._get_context_value(request)
+
+        # The document is already parsed, so validate and execute it as is
+        errors = validate(self.schema.graphql_schema, document)
+        if errors:
+            return JSONResponse(
+                {"data": None, "errors": [e.formatted for e in errors]},
+                status_code=400
+            )
+
+        result = execute(
+            self.schema.graphql_schema,
+            document,
+            context_value=context_value,
+            root_value=self.root_value,
+            middleware=self.middleware,
+            variable_values=variables,
+            operation_name=operation_name,
+            execution_context_class=self.execution_context_class,
+        )
+        if isawaitable(result):
+            result = await result
+
+        response = {"data": result.data}
+        if result.errors:
+            for e in result.errors:
+                if e.original_error:
+                    logger.error(
+                        "An exception occurred in resolvers",
+                        exc_info=e.original_error,
+                    )
+            response["errors"] = [
+                self.error_formatter(e) for e in result.errors
+            ]
+
+        return JSONResponse(
+            response, status_code=200,
+            background=context_value.get("background"),
+        )
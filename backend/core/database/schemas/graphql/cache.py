@@ -0,0 +1,182 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, FrozenSet, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from graphql import DocumentNode, FieldNode, OperationDefinitionNode, \
+    OperationType, StringValueNode, VariableNode, print_ast
+
+from config import settings
+
+# Seconds that results of each root field stay fresh. Queries with other
+# root fields are not cached.
+FIELD_TTLS = {
+    "level": settings.GRAPHQL_LEVELS_TTL,
+    "allLevels": settings.GRAPHQL_LEVELS_TTL,
+    "levelHistogram": settings.GRAPHQL_CACHE_TTL,
+    "server": settings.GRAPHQL_CACHE_TTL,
+    "allServers": settings.GRAPHQL_CACHE_TTL,
+    "member": settings.GRAPHQL_CACHE_TTL,
+    "allMembers": settings.GRAPHQL_CACHE_TTL,
+    "topMembers": settings.GRAPHQL_CACHE_TTL,
+    "player": settings.GRAPHQL_CACHE_TTL,
+    "allPlayers": settings.GRAPHQL_CACHE_TTL,
+    "node": settings.GRAPHQL_CACHE_TTL,
+}
+
+# Root fields whose results change when members gain experience
+MEMBER_FIELDS = frozenset(FIELD_TTLS) - {"level", "allLevels"}
+
+
+class CachedResult(NamedTuple):
+    expires: float
+    etag: str
+    body: bytes
+    fields: FrozenSet[str]
+    # Servers whose changes affect the result, None for all of them
+    servers: Optional[FrozenSet[str]] = None
+
+
+class QueryCache:
+    """LRU cache for results of GraphQL queries"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.__data: "OrderedDict[str, CachedResult]" = OrderedDict()
+        # Keys of results by server, None for results of every server
+        self.__servers: Dict[Optional[str], Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        result = self.__data.get(key)
+
+        if result is None or result.expires < time.monotonic():
+            self.__remove(key)
+            self.misses += 1
+            return None
+
+        self.__data.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def set(self, key: str, result: CachedResult):
+        self.__remove(key)
+        self.__data[key] = result
+
+        for server in result.servers or (None,):
+            self.__servers[server].add(key)
+
+        while len(self.__data) > self.maxsize:
+            self.__remove(next(iter(self.__data)))
+
+    def __remove(self, key: str):
+        result = self.__data.pop(key, None)
+        if result is None:
+            return
+
+        for server in result.servers or (None,):
+            keys = self.__servers[server]
+            keys.discard(key)
+            if not keys:
+                del self.__servers[server]
+
+    def invalidate(self, fields: FrozenSet[str], server: str):
+        """
+        Drop results of queries that select any of the given root fields
+        and depend on the server
+        :param fields: Root field names
+        :param server: uuid of the server that changed
+        :return:
+        """
+        keys = self.__servers.get(server, set()) | \
+            self.__servers.get(None, set())
+
+        for key in [k for k in keys if self.__data[k].fields & fields]:
+            self.__remove(key)
+            self.invalidations += 1
+
+
+def normalize_uuid(value: str) -> str:
+    try:
+        return str(UUID(value))
+    except ValueError:
+        return value
+
+
+def field_server(
+        field: FieldNode, variables: Optional[dict]
+) -> Optional[str]:
+    """
+    Server a root field is limited to
+    :param field: Root field
+    :param variables: Variables of the query
+    :return: uuid of the server or None if not limited to one
+    """
+    for argument in field.arguments or ():
+        name = argument.name.value
+        if name != "serverUuid" and \
+                (name != "uuid" or field.name.value != "server"):
+            continue
+
+        value = argument.value
+        if isinstance(value, StringValueNode):
+            return normalize_uuid(value.value)
+        if isinstance(value, VariableNode):
+            value = (variables or {}).get(value.name.value)
+            if isinstance(value, str):
+                return normalize_uuid(value)
+
+    return None
+
+
+def cache_plan(
+        document: DocumentNode, operation: OperationDefinitionNode,
+        variables: Optional[dict], operation_name: Optional[str]
+) -> Optional[Tuple[str, float, FrozenSet[str], Optional[FrozenSet[str]]]]:
+    """
+    Work out how a query can be cached
+    :param document: Parsed query
+    :param operation: Operation to be executed
+    :param variables: Variables of the query
+    :param operation_name: Name of the operation to execute
+    :return: (cache key, TTL, root fields, servers the result depends on
+        or None for all) or None if it can't be cached
+    """
+    if operation.operation != OperationType.QUERY:
+        return None
+
+    fields = set()
+    servers = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, FieldNode) or \
+                selection.name.value not in FIELD_TTLS:
+            return None
+        fields.add(selection.name.value)
+
+        if selection.name.value in MEMBER_FIELDS and servers is not None:
+            server = field_server(selection, variables)
+            servers = None if server is None else servers | {server}
+
+    # Queries that differ only in formatting share the same key
+    normalized = json.dumps(
+        [print_ast(document), variables or {}, operation_name],
+        sort_keys=True
+    )
+    key = hashlib.sha256(normalized.encode('UTF-8')).hexdigest()
+
+    return (
+        key, min(FIELD_TTLS[f] for f in fields), frozenset(fields),
+        frozenset(servers) if servers is not None else None
+    )
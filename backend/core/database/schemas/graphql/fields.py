@@ -0,0 +1,63 @@
+from graphene import relay
+from graphene_sqlalchemy import SQLAlchemyConnectionField
+from graphql_relay import cursor_to_offset
+
+from config import settings
+
+
+def limit_arguments(args: dict) -> dict:
+    """
+    Bound the page of a connection, so that it never holds more items than
+    the cost of the query was estimated with
+    :param args: Arguments of the connection field
+    :return: Arguments with first set and within the limit
+    """
+    first = args.get("first")
+    if first is None:
+        first = settings.GRAPHQL_DEFAULT_LIST_SIZE
+
+    args = dict(args, first=min(first, settings.GRAPHQL_MAX_LIST_SIZE))
+    if args.get("last") is not None:
+        args["last"] = min(args["last"], args["first"])
+    return args
+
+
+def rows_needed(args: dict) -> int:
+    """
+    Number of rows to load for a page of a connection, including one more
+    to tell whether there is a next page
+    :param args: Bounded arguments of the connection field
+    :return: Number of rows
+    """
+    start = 0
+    if args.get("after") is not None:
+        offset = cursor_to_offset(args["after"])
+        if offset is not None:
+            start = offset + 1
+
+    return start + args["first"] + 1
+
+
+class BoundedConnectionField(relay.ConnectionField):
+    """Connection field whose pages are bounded"""
+
+    @classmethod
+    def connection_resolver(
+            cls, resolver, connection_type, root, info, **args
+    ):
+        return super().connection_resolver(
+            resolver, connection_type, root, info, **limit_arguments(args)
+        )
+
+
+class BoundedSQLAlchemyConnectionField(SQLAlchemyConnectionField):
+    """SQLAlchemy connection field whose pages are bounded"""
+
+    @classmethod
+    def connection_resolver(
+            cls, resolver, connection_type, model, root, info, **args
+    ):
+        return super().connection_resolver(
+            resolver, connection_type, model, root, info,
+            **limit_arguments(args)
+        )
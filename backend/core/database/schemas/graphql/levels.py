@@ -1,4 +1,4 @@
-from graphene import relay
+from graphene import relay, ObjectType, Int
 from graphene_sqlalchemy import SQLAlchemyObjectType
 from core.database.models.levels import Level as LevelModel
 
@@ -7,3 +7,8 @@ class Level(SQLAlchemyObjectType):
     class Meta:
         model = LevelModel
         interfaces = (relay.Node,)
+
+
+class LevelCount(ObjectType):
+    level = Int()
+    count = Int()
@@ -0,0 +1,160 @@
+from typing import Dict, Optional
+
+from graphql import DocumentNode, FieldNode, FragmentDefinitionNode, \
+    FragmentSpreadNode, GraphQLObjectType, GraphQLSchema, InlineFragmentNode, \
+    IntValueNode, OperationDefinitionNode, OperationType, SelectionSetNode, \
+    VariableNode, get_named_type, get_nullable_type, is_list_type, \
+    is_object_type
+
+from config import settings
+
+# Arguments that bound the number of items a list field returns
+LIMIT_ARGUMENTS = ("first", "last", "n")
+
+
+class QueryCost:
+    """Estimates depth and cost of a query before it is executed"""
+
+    def __init__(
+            self, schema: GraphQLSchema, document: DocumentNode,
+            variables: Optional[dict]
+    ):
+        self.schema = schema
+        self.variables = variables or {}
+        self.fragments: Dict[str, FragmentDefinitionNode] = {
+            d.name.value: d for d in document.definitions
+            if isinstance(d, FragmentDefinitionNode)
+        }
+        self.depth = 0
+        self.cost = 0
+        self.invalid: Optional[str] = None
+
+    def __list_size(self, field: FieldNode) -> Optional[int]:
+        for argument in field.arguments or ():
+            if argument.name.value not in LIMIT_ARGUMENTS:
+                continue
+
+            value = argument.value
+            size = None
+            if isinstance(value, IntValueNode):
+                size = int(value.value)
+            elif isinstance(value, VariableNode):
+                size = self.variables.get(value.name.value)
+
+            if not isinstance(size, int):
+                continue
+
+            # A size below one would make the cost of the field negative
+            if size < 1:
+                self.invalid = f"{argument.name.value} must be positive"
+                return 1
+            return size
+
+        return None
+
+    def visit(
+            self, selection_set: SelectionSetNode,
+            parent: GraphQLObjectType, depth: int, multiplier: int,
+            visited: frozenset = frozenset(), size: Optional[int] = None
+    ):
+        """
+        Add depth and cost of a selection set
+        :param selection_set: Selections to visit
+        :param parent: Type the selections are made on
+        :param depth: Depth of the selections
+        :param multiplier: How many times the selections are resolved
+        :param visited: Names of fragments being visited
+        :param size: Limit of a connection, applied to its first list
+        :return:
+        """
+        self.depth = max(self.depth, depth)
+
+        for selection in selection_set.selections:
+            if isinstance(selection, FragmentSpreadNode):
+                name = selection.name.value
+                fragment = self.fragments.get(name)
+                if fragment is None or name in visited:
+                    continue
+                fragment_type = self.schema.get_type(
+                    fragment.type_condition.name.value
+                )
+                self.visit(
+                    fragment.selection_set,
+                    fragment_type if is_object_type(fragment_type) else parent,
+                    depth, multiplier, visited | {name}, size
+                )
+                continue
+
+            if isinstance(selection, InlineFragmentNode):
+                fragment_type = parent
+                if selection.type_condition is not None:
+                    fragment_type = self.schema.get_type(
+                        selection.type_condition.name.value
+                    )
+                self.visit(
+                    selection.selection_set,
+                    fragment_type if is_object_type(fragment_type) else parent,
+                    depth, multiplier, visited, size
+                )
+                continue
+
+            field = parent.fields.get(selection.name.value) \
+                if is_object_type(parent) else None
+            self.cost += multiplier
+
+            if field is None or selection.selection_set is None:
+                continue
+
+            field_size = self.__list_size(selection)
+            field_multiplier = multiplier
+            if is_list_type(get_nullable_type(field.type)):
+                # Connections return at most the maximum page size
+                field_multiplier *= min(
+                    field_size or size or settings.GRAPHQL_DEFAULT_LIST_SIZE,
+                    settings.GRAPHQL_MAX_LIST_SIZE
+                )
+                field_size = None
+            elif field_size is None:
+                field_size = size
+
+            self.visit(
+                selection.selection_set, get_named_type(field.type),
+                depth + 1, field_multiplier, visited, field_size
+            )
+
+
+def check_limits(
+        schema: GraphQLSchema, document: DocumentNode,
+        operation: OperationDefinitionNode, variables: Optional[dict]
+) -> Optional[str]:
+    """
+    Check that a query is within the depth and cost limits
+    :param schema: GraphQL schema
+    :param document: Parsed query
+    :param operation: Operation to be executed
+    :param variables: Variables of the query
+    :return: Reason for rejecting the query or None if it is allowed
+    """
+    root = {
+        OperationType.QUERY: schema.query_type,
+        OperationType.MUTATION: schema.mutation_type,
+        OperationType.SUBSCRIPTION: schema.subscription_type,
+    }.get(operation.operation)
+    if root is None:
+        return None
+
+    cost = QueryCost(schema, document, variables)
+    cost.visit(operation.selection_set, root, 1, 1)
+
+    if cost.invalid is not None:
+        return cost.invalid
+
+    if cost.depth > settings.GRAPHQL_MAX_DEPTH:
+        return f"Query depth {cost.depth} exceeds the limit of " \
+               f"{settings.GRAPHQL_MAX_DEPTH}"
+
+    if cost.cost > settings.GRAPHQL_MAX_COST:
+        return f"Query cost {cost.cost} exceeds the limit of " \
+               f"{settings.GRAPHQL_MAX_COST}"
+
+    return None
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from typing import List
+
+from aiodataloader import DataLoader
+from sqlalchemy import func
+from sqlalchemy.orm import aliased, lazyload
+
+from core.database import Session
+from core.database.models.levels import Level
+from core.database.models.members import Member
+from core.database.models.players import Player
+from core.database.models.servers import Server
+from core.database.stats import get_server_stats
+
+
+class ByUuidLoader(DataLoader):
+    """Loads objects of a model by their uuids with a single query"""
+
+    def __init__(self, model, options=()):
+        super().__init__()
+        self.model = model
+        self.options = options
+
+    async def batch_load_fn(self, uuids: List) -> List:
+        objs = Session.query(self.model).options(*self.options).filter(
+            self.model.uuid.in_(uuids)
+        ).all()
+
+        by_uuid = {obj.uuid: obj for obj in objs}
+        return [by_uuid.get(uuid) for uuid in uuids]
+
+
+class MembersLoader(DataLoader):
+    """
+    Loads the first members of many servers or players with a single query
+    """
+
+    def __init__(self, column, limit: int):
+        super().__init__()
+        self.column = column
+        self.limit = limit
+
+    async def batch_load_fn(self, uuids: List) -> List[List[Member]]:
+        position = func.row_number().over(
+            partition_by=self.column, order_by=Member.uuid
+        ).label("position")
+        ranked = Session.query(Member, position).\
+            filter(self.column.in_(uuids)).subquery()
+
+        members = Session.query(aliased(Member, ranked)).\
+            filter(ranked.c.position <= self.limit).\
+            order_by(ranked.c.position).all()
+
+        by_uuid = defaultdict(list)
+        for member in members:
+            by_uuid[getattr(member, self.column.key)].append(member)
+        return [by_uuid[uuid] for uuid in uuids]
+
+
+class ServerStatsLoader(DataLoader):
+    """Loads aggregate statistics of many servers at once"""
+
+    async def batch_load_fn(self, uuids: List) -> List:
+        stats = get_server_stats(uuids)
+        return [stats[uuid] for uuid in uuids]
+
+
+class Loaders:
+    """Dataloaders of a single GraphQL request"""
+
+    def __init__(self):
+        self.level = ByUuidLoader(Level)
+        self.server = ByUuidLoader(Server)
+        # Memberships are resolved by their own loader, not joined
+        self.player = ByUuidLoader(Player, (lazyload(Player.memberships),))
+        self.server_stats = ServerStatsLoader()
+        self.__members = {}
+
+    def members(self, column, limit: int) -> MembersLoader:
+        """
+        Loader of the first members of servers or players
+        :param column: Member column to load by
+        :param limit: Maximum number of members of each
+        :return: MembersLoader
+        """
+        key = (column.key, limit)
+        loader = self.__members.get(key)
+
+        if loader is None:
+            loader = self.__members[key] = MembersLoader(column, limit)
+
+        return loader
+
+
+def get_loaders(info) -> Loaders:
+    """
+    Get dataloaders of the current request, creating them on first use
+    :param info: GraphQL resolve info
+    :return: Loaders
+    """
+    loaders = info.context.get("loaders")
+
+    if loaders is None:
+        loaders = info.context["loaders"] = Loaders()
+
+    return loaders
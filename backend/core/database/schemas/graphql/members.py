@@ -1,9 +1,29 @@
-from graphene import relay
+from graphene import relay, Field
 from graphene_sqlalchemy import SQLAlchemyObjectType
 from core.database.models.members import Member as MemberModel
+from core.database.schemas.graphql.loaders import get_loaders
 
 
 class Member(SQLAlchemyObjectType):
     class Meta:
         model = MemberModel
         interfaces = (relay.Node,)
+
+    # Relationships are batched per request instead of loaded per member
+    player = Field("core.database.schemas.graphql.players.Player")
+    server = Field("core.database.schemas.graphql.servers.Server")
+    level = Field("core.database.schemas.graphql.levels.Level")
+
+    @staticmethod
+    def resolve_player(root, info):
+        return get_loaders(info).player.load(root.player_uuid)
+
+    @staticmethod
+    def resolve_server(root, info):
+        return get_loaders(info).server.load(root.server_uuid)
+
+    @staticmethod
+    def resolve_level(root, info):
+        if root.level_uuid is None:
+            return None
+        return get_loaders(info).level.load(root.level_uuid)
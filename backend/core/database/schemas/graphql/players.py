@@ -1,9 +1,22 @@
 from graphene import relay
 from graphene_sqlalchemy import SQLAlchemyObjectType
+from core.database.models.members import Member as MemberModel
 from core.database.models.players import Player as PlayerModel
+from core.database.schemas.graphql.fields import BoundedConnectionField, \
+    rows_needed
+from core.database.schemas.graphql.loaders import get_loaders
+from core.database.schemas.graphql.members import Member
 
 
 class Player(SQLAlchemyObjectType):
     class Meta:
         model = PlayerModel
         interfaces = (relay.Node,)
+
+    memberships = BoundedConnectionField(Member.connection)
+
+    @staticmethod
+    def resolve_memberships(root, info, **kwargs):
+        return get_loaders(info).members(
+            MemberModel.player_uuid, rows_needed(kwargs)
+        ).load(root.uuid)
@@ -1,9 +1,44 @@
-from graphene import relay
+from graphene import relay, Int, List
 from graphene_sqlalchemy import SQLAlchemyObjectType
 from core.database.models.servers import Server as ServerModel
+from core.database.models.members import Member as MemberModel
+from core.database.schemas.graphql.fields import BoundedConnectionField, \
+    rows_needed
+from core.database.schemas.graphql.levels import LevelCount
+from core.database.schemas.graphql.loaders import get_loaders
+from core.database.schemas.graphql.members import Member
 
 
 class Server(SQLAlchemyObjectType):
     class Meta:
         model = ServerModel
         interfaces = (relay.Node,)
+
+    members = BoundedConnectionField(Member.connection)
+    member_count = Int()
+    total_exp = Int()
+    level_histogram = List(LevelCount)
+
+    @staticmethod
+    def resolve_members(root, info, **kwargs):
+        return get_loaders(info).members(
+            MemberModel.server_uuid, rows_needed(kwargs)
+        ).load(root.uuid)
+
+    @staticmethod
+    async def resolve_member_count(root, info):
+        stats = await get_loaders(info).server_stats.load(root.uuid)
+        return stats.member_count
+
+    @staticmethod
+    async def resolve_total_exp(root, info):
+        stats = await get_loaders(info).server_stats.load(root.uuid)
+        return stats.total_exp
+
+    @staticmethod
+    async def resolve_level_histogram(root, info):
+        stats = await get_loaders(info).server_stats.load(root.uuid)
+        return [
+            {"level": level, "count": count}
+            for level, count in stats.level_histogram
+        ]
@@ -0,0 +1,101 @@
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+
+from config import settings
+from core.database import Session
+from core.database.models.levels import Level
+from core.database.models.members import Member
+from core.utils.cache import TTLCache
+
+
+class ServerStats(NamedTuple):
+    member_count: int
+    total_exp: int
+    level_histogram: List[Tuple[int, int]]
+
+
+stats_cache = TTLCache(settings.STATS_TTL, settings.STATS_CACHE_SIZE)
+
+
+def get_server_stats(server_uuids: List[UUID]) -> Dict[UUID, ServerStats]:
+    """
+    Compute aggregate statistics of servers, using cached results when
+    they are fresh enough
+    :param server_uuids: uuids of servers
+    :return: Statistics of each server
+    """
+    stats = {}
+    for uuid in server_uuids:
+        cached = stats_cache.get(("server", uuid))
+        if cached is not None:
+            stats[uuid] = cached
+
+    missing = [uuid for uuid in server_uuids if uuid not in stats]
+    if not missing:
+        return stats
+
+    # Experience needed to reach each level from zero
+    cumulative = Session.query(
+        Level.uuid,
+        func.sum(Level.exp).over(order_by=Level.value).label("total")
+    ).subquery()
+
+    totals = Session.query(
+        Member.server_uuid,
+        func.count(Member.uuid),
+        func.coalesce(
+            func.sum(Member.exp + func.coalesce(cumulative.c.total, 0)), 0
+        )
+    ).outerjoin(cumulative, cumulative.c.uuid == Member.level_uuid).\
+        filter(Member.server_uuid.in_(missing)).\
+        group_by(Member.server_uuid).all()
+
+    histograms = defaultdict(list)
+    for server_uuid, value, count in Session.query(
+            Member.server_uuid, Level.value, func.count(Member.uuid)
+    ).join(Level, Level.uuid == Member.level_uuid).\
+            filter(Member.server_uuid.in_(missing)).\
+            group_by(Member.server_uuid, Level.value).\
+            order_by(Level.value).all():
+        histograms[server_uuid].append((value, count))
+
+    counts = {
+        server_uuid: (member_count, int(total_exp))
+        for server_uuid, member_count, total_exp in totals
+    }
+    for uuid in missing:
+        member_count, total_exp = counts.get(uuid, (0, 0))
+        stats[uuid] = ServerStats(
+            member_count, total_exp, histograms.get(uuid, [])
+        )
+        stats_cache.set(("server", uuid), stats[uuid])
+
+    return stats
+
+
+def get_level_histogram(
+        server_uuid: Optional[str] = None
+) -> List[Tuple[int, int]]:
+    """
+    Count members on each level
+    :param server_uuid: Only count members of this server
+    :return: Tuples of (level value, member count), lowest level first
+    """
+    key = ("histogram", server_uuid)
+    histogram = stats_cache.get(key)
+
+    if histogram is None:
+        query = Session.query(Level.value, func.count(Member.uuid)).\
+            join(Level, Level.uuid == Member.level_uuid)
+
+        if server_uuid is not None:
+            query = query.filter(Member.server_uuid == server_uuid)
+
+        histogram = query.group_by(Level.value).order_by(Level.value).all()
+        histogram = [(value, count) for value, count in histogram]
+        stats_cache.set(key, histogram)
+
+    return histogram
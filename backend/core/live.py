@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set
+
+import psycopg2
+import psycopg2.extensions
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of the changes a slow subscriber missed
+RELOAD = None
+
+
+class ChangeFeed:
+    """
+    Listens to member changes published by the bot on a single database
+    connection and fans them out to subscribers of each server.
+    """
+
+    def __init__(self, dsn: str, channel: str, queue_size: int):
+        self.dsn = dsn
+        self.channel = channel
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.__connection = None
+        self.__reconnect: Optional[asyncio.Task] = None
+        self.__subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.__listeners: List[Callable[[dict], None]] = []
+
+    def __repr__(self) -> str:
+        subscribers = sum(len(x) for x in self.__subscribers.values())
+        return f"ChangeFeed({self.channel=}, {subscribers=}, {self.dropped=})"
+
+    def start(self):
+        try:
+            self.__listen()
+        except psycopg2.Error as e:
+            logger.warning(f"Could not listen to {self.channel}! {e}")
+            self.__reconnect = asyncio.ensure_future(self.__restart())
+
+    def __listen(self):
+        loop = asyncio.get_running_loop()
+
+        self.__connection = psycopg2.connect(self.dsn)
+        self.__connection.set_isolation_level(
+            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT
+        )
+        with self.__connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}";')
+
+        loop.add_reader(self.__connection.fileno(), self.__receive)
+        logger.info(f"Listening to {self.channel}")
+
+    def stop(self):
+        if self.__reconnect is not None:
+            self.__reconnect.cancel()
+            self.__reconnect = None
+
+        if self.__connection is not None:
+            try:
+                asyncio.get_running_loop().remove_reader(
+                    self.__connection.fileno()
+                )
+            except psycopg2.Error:
+                pass
+            self.__connection.close()
+            self.__connection = None
+
+    async def __restart(self):
+        while True:
+            await asyncio.sleep(5)
+            try:
+                self.__listen()
+                self.__reconnect = None
+                return
+            except psycopg2.Error as e:
+                logger.warning(f"Could not listen to {self.channel}! {e}")
+
+    def __receive(self):
+        try:
+            self.__connection.poll()
+        except psycopg2.Error as e:
+            logger.warning(f"Lost connection to {self.channel}! {e}")
+            self.stop()
+            self.__reconnect = asyncio.ensure_future(self.__restart())
+            return
+
+        while self.__connection.notifies:
+            notify = self.__connection.notifies.pop(0)
+
+            try:
+                change = json.loads(notify.payload)
+                server_uuid = change["server"]
+            except (ValueError, KeyError, TypeError):
+                continue
+
+            for listener in self.__listeners:
+                listener(change)
+
+            for queue in self.__subscribers.get(server_uuid, ()):
+                try:
+                    queue.put_nowait(notify.payload)
+                except asyncio.QueueFull:
+                    # Slow clients miss deltas and catch up on a full reload
+                    self.dropped += 1 + queue.qsize()
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(RELOAD)
+
+    def add_listener(self, listener: Callable[[dict], None]):
+        """
+        Call a function with every change
+        :param listener: Function taking the decoded change
+        :return:
+        """
+        self.__listeners.append(listener)
+
+    def subscribe(self, server_uuid: str) -> asyncio.Queue:
+        """
+        Subscribe to changes of a server
+        :param server_uuid: uuid of the server
+        :return: Queue of JSON encoded changes, or RELOAD when changes were
+                 missed
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self.__subscribers[server_uuid].add(queue)
+        return queue
+
+    def unsubscribe(self, server_uuid: str, queue: asyncio.Queue):
+        subscribers = self.__subscribers.get(server_uuid)
+
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self.__subscribers[server_uuid]
+
+
+change_feed = ChangeFeed(
+    settings.DATABASE_URL, settings.LIVE_CHANNEL, settings.LIVE_QUEUE_SIZE
+)
@@ -0,0 +1,132 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+
+def etag_for(key: Hashable) -> str:
+    """
+    Content address of a rendered image
+    :param key: Everything the image is rendered from
+    :return: Quoted ETag
+    """
+    digest = hashlib.sha256(repr(key).encode('UTF-8')).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class ImageCache:
+    """LRU cache for rendered images with a total byte budget"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__data: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __repr__(self) -> str:
+        return f"ImageCache(items={len(self)}, {self.size=}, " \
+               f"{self.hits=}, {self.misses=})"
+
+    def get(self, etag: str) -> Optional[bytes]:
+        """
+        Get a cached image
+        :param etag: ETag of the image
+        :return: Image or None if not cached
+        """
+        image = self.__data.get(etag)
+
+        if image is None:
+            self.misses += 1
+            return None
+
+        self.__data.move_to_end(etag)
+        self.hits += 1
+        return image
+
+    def set(self, etag: str, image: bytes):
+        """
+        Cache an image, evicting the least recently used ones over budget
+        :param etag: ETag of the image
+        :param image: Image
+        :return:
+        """
+        if len(image) > self.max_bytes:
+            return
+
+        previous = self.__data.pop(etag, None)
+        if previous is not None:
+            self.size -= len(previous)
+
+        self.__data[etag] = image
+        self.size += len(image)
+
+        while self.size > self.max_bytes:
+            _, evicted = self.__data.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class TTLCache:
+    """LRU cache whose values expire after a fixed time"""
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.__purged = time.monotonic()
+        self.__data: "OrderedDict[Hashable, Tuple[float, Any]]" = \
+            OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value
+        :param key: Key of the value
+        :return: Value or None if missing or expired
+        """
+        item = self.__data.get(key)
+
+        if item is None:
+            return None
+
+        expires, value = item
+        if expires < time.monotonic():
+            del self.__data[key]
+            return None
+
+        self.__data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache a value, evicting the least recently used ones over the size
+        :param key: Key of the value
+        :param value: Value
+        :return:
+        """
+        now = time.monotonic()
+
+        # Drop values nobody asked for again once they expire
+        if now - self.__purged > self.ttl:
+            self.purge(now)
+
+        self.__data[key] = (now + self.ttl, value)
+        self.__data.move_to_end(key)
+
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+    def purge(self, now: Optional[float] = None):
+        """
+        Remove expired values
+        :param now: Current monotonic time
+        :return:
+        """
+        now = time.monotonic() if now is None else now
+        for key in [k for k, (e, _) in self.__data.items() if e < now]:
+            del self.__data[key]
+        self.__purged = now
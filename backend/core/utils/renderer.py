@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from fastapi import HTTPException
+
+from core.utils.svg import svg_to_png
+
+
+class Renderer:
+    """
+    Renders SVGs to PNGs in worker processes, with a bounded number of
+    renders waiting for a worker.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.__pool: Optional[ProcessPoolExecutor] = None
+
+    def __repr__(self) -> str:
+        return f"Renderer({self.workers=}, {self.pending=}, " \
+               f"{self.rejected=}, {self.timeouts=})"
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self.__pool
+
+    async def png(self, svg: str) -> bytes:
+        """
+        Render an SVG to PNG
+        :param svg: SVG document
+        :return: PNG image
+        :raises HTTPException: 503 if overloaded or the render timed out
+        """
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503, detail="Renderer is overloaded",
+                headers={"Retry-After": "1"}
+            )
+
+        loop = asyncio.get_running_loop()
+        future = self.pool.submit(svg_to_png, svg)
+
+        # A render keeps its slot until the worker is done with it, even if
+        # the request has already timed out
+        self.pending += 1
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self.__release)
+        )
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout
+            )
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise HTTPException(
+                status_code=503, detail="Rendering timed out",
+                headers={"Retry-After": "1"}
+            )
+
+    def __release(self):
+        self.pending -= 1
+
+    def close(self):
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=False)
+            self.__pool = None
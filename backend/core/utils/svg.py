@@ -1,6 +1,14 @@
+import cairosvg
 from jinja2 import Environment, FileSystemLoader
 from datetime import date
 
+# Templates are compiled once and shared by every request
+env = Environment(
+    loader=FileSystemLoader('templates')
+)
+level_template = env.get_template('discord_level_progress.svg')
+ip_template = env.get_template('ip_template.svg')
+
 
 def translate(value, leftMin, leftMax, rightMin, rightMax):
     # Figure out how 'wide' each range is
@@ -14,20 +22,17 @@ def translate(value, leftMin, leftMax, rightMin, rightMax):
     return rightMin + (valueScaled * rightSpan)
 
 
-def render_ip(ip: str):
-    env = Environment(
-        loader=FileSystemLoader('templates')
-    )
-    template = env.get_template('ip_template.svg')
+def svg_to_png(svg: str) -> bytes:
+    return cairosvg.svg2png(svg.encode('UTF-8'))
 
-    return template.render(**{
+
+def render_ip(ip: str):
+    return ip_template.render(**{
         "ip": ip
     })
 
-def render(name: str, current_exp: int, needed_exp: int, level: int, url: str):
-    env = Environment(
-        loader=FileSystemLoader('templates')
-    )
+def render(name: str, current_exp: int, needed_exp: int, level: int, url: str,
+           dt: date = None):
     left_bound = -320
     right_bound = 230
     #left_limit = -255
@@ -42,8 +47,7 @@ def render(name: str, current_exp: int, needed_exp: int, level: int, url: str):
 
     anchor = "middle"
 
-    template = env.get_template('discord_level_progress.svg')
-    return template.render(**{
+    return level_template.render(**{
         "name": name,
         "current_exp": current_exp,
         "needed_exp": needed_exp,
@@ -53,5 +57,5 @@ def render(name: str, current_exp: int, needed_exp: int, level: int, url: str):
         "anchor": anchor,
         "x": x,
         "px": p*552,
-        "dt": date.today()
+        "dt": dt or date.today()
     })
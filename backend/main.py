@@ -1,11 +1,17 @@
-import io
-import cairosvg
+import asyncio
+from datetime import date
 from fastapi import FastAPI, Query, Response, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.responses import StreamingResponse
-from starlette_graphene3 import GraphQLApp, make_graphiql_handler
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette_graphene3 import make_graphiql_handler
 
 from core.database.schemas.graphql import schema
+from core.database.schemas.graphql.app import PublicGraphQLApp, \
+    PersistedQueries
+from core.database.schemas.graphql.cache import QueryCache, MEMBER_FIELDS
+from core.live import RELOAD, change_feed
+from core.utils.cache import ImageCache, etag_for
+from core.utils.renderer import Renderer
 from core.utils.svg import render, render_ip
 
 from config import settings
@@ -19,20 +25,65 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-app.add_route("/", GraphQLApp(schema=schema, on_get=make_graphiql_handler()))
+query_cache = QueryCache(settings.GRAPHQL_CACHE_SIZE)
+persisted_queries = PersistedQueries(
+    settings.GRAPHQL_PERSISTED_SIZE, settings.GRAPHQL_PERSISTED_QUERIES
+)
+graphql_app = PublicGraphQLApp(
+    schema, query_cache, persisted_queries, on_get=make_graphiql_handler()
+)
+app.add_route("/", graphql_app)
+
+image_cache = ImageCache(settings.IMAGE_CACHE_BYTES)
+renderer = Renderer(
+    settings.RENDER_WORKERS,
+    settings.RENDER_QUEUE_SIZE,
+    settings.RENDER_TIMEOUT
+)
+
+
+@app.on_event("startup")
+def start_change_feed():
+    change_feed.add_listener(
+        lambda change: query_cache.invalidate(MEMBER_FIELDS, change["server"])
+    )
+    change_feed.start()
+
+
+@app.on_event("shutdown")
+def shutdown_renderer():
+    renderer.close()
+    change_feed.stop()
 
 
 @app.get('/level-image')
 async def level_image(
+        request: Request,
         name: str = Query("[NAME]"),
         current_exp: int = Query(0),
         needed_exp: int = Query(1000),
         level: int = Query(0),
         icon: str = Query(None)
 ):
-    svg = render(name, current_exp, needed_exp, level, icon)
-    bts = cairosvg.svg2png(svg.encode('UTF-8'))
-    return StreamingResponse(io.BytesIO(bts), media_type="image/png")
+    # The card shows the date, so the same card is rendered again daily
+    today = date.today()
+    etag = etag_for((name, level, current_exp, needed_exp, icon, today))
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.IMAGE_MAX_AGE}"
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    bts = image_cache.get(etag)
+    if bts is None:
+        svg = render(name, current_exp, needed_exp, level, icon, today)
+        bts = await renderer.png(svg)
+        image_cache.set(etag, bts)
+
+    return Response(bts, media_type="image/png", headers=headers)
+
 
 @app.get('/ip')
 async def ip(request: Request):
@@ -42,5 +93,55 @@ async def ip(request: Request):
         )
     )
     svg = render_ip(client_ip)
-    bts = cairosvg.svg2png(svg.encode('UTF-8'))
-    return StreamingResponse(io.BytesIO(bts), media_type="image/png")
+    bts = await renderer.png(svg)
+    return Response(bts, media_type="image/png")
+
+
+@app.get('/servers/{server_uuid}/events')
+async def server_events(request: Request, server_uuid: str):
+    async def stream():
+        queue = change_feed.subscribe(server_uuid)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), settings.LIVE_KEEPALIVE
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if payload is RELOAD:
+                    yield "event: reload\ndata: {}\n\n"
+                else:
+                    yield f"event: members\ndata: {payload}\n\n"
+        finally:
+            change_feed.unsubscribe(server_uuid, queue)
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get('/metrics')
+async def metrics():
+    samples = {
+        "graphql_cache_hits_total": query_cache.hits,
+        "graphql_cache_misses_total": query_cache.misses,
+        "graphql_cache_hit_ratio": query_cache.hit_ratio,
+        "graphql_cache_invalidations_total": query_cache.invalidations,
+        "graphql_cache_entries": len(query_cache),
+        "graphql_rejected_total": graphql_app.rejected,
+        "graphql_persisted_queries": len(persisted_queries),
+        "image_cache_hits_total": image_cache.hits,
+        "image_cache_misses_total": image_cache.misses,
+        "image_cache_bytes": image_cache.size,
+        "render_pending": renderer.pending,
+        "render_rejected_total": renderer.rejected,
+        "render_timeouts_total": renderer.timeouts,
+        "live_dropped_total": change_feed.dropped,
+    }
+    return PlainTextResponse(
+        "".join(f"{name} {value}\n" for name, value in samples.items())
+    )
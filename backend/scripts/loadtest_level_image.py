@@ -0,0 +1,85 @@
+"""
+Load test for /level-image.
+
+Sends requests from a number of concurrent clients and reports latency
+percentiles, throughput and how many requests were shed with 503. Run it
+against a backend before and after a change to compare them:
+
+    python scripts/loadtest_level_image.py http://localhost:3080 \
+        --requests 2000 --concurrency 32
+
+By default every request asks for a different card, so that each one is
+rendered. Use --cached to request the same card over and over.
+"""
+import argparse
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+
+def fetch(url: str, timeout: float):
+    start = time.perf_counter()
+    try:
+        with urlopen(url, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except HTTPError as e:
+        status = e.code
+    except (URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - start
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("base_url", help="URL of the backend")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument(
+        "--cached", action="store_true",
+        help="Request the same card every time"
+    )
+    args = parser.parse_args()
+
+    def url(i: int) -> str:
+        exp = 0 if args.cached else i
+        return f"{args.base_url.rstrip('/')}/level-image?" + urlencode({
+            "name": "Load test", "current_exp": exp,
+            "needed_exp": 1000 + exp, "level": 5
+        })
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        results = list(pool.map(
+            lambda i: fetch(url(i), args.timeout), range(args.requests)
+        ))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    ok = [latency for status, latency in results if status == 200]
+
+    print(f"Requests:    {args.requests} ({args.concurrency} concurrent)")
+    print(f"Duration:    {elapsed:.2f} s")
+    print(f"Throughput:  {len(ok) / elapsed:.1f} images/s")
+    print(f"Statuses:    {dict(sorted(statuses.items()))}")
+    if ok:
+        print(f"Latency p50: {percentile(ok, 50) * 1000:.1f} ms")
+        print(f"Latency p99: {percentile(ok, 99) * 1000:.1f} ms")
+        print(f"Latency max: {max(ok) * 1000:.1f} ms")
+        print(f"Latency avg: {statistics.mean(ok) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
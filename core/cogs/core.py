@@ -2,11 +2,16 @@ from nextcord.ext import commands, tasks
 from datetime import datetime
 
 from core.database.utils import get_create
-from core.database import Session, session_lock
+from core.database import Session, unit_of_work
 from core.database.crud.servers import server as crud_server
+from core.database.crud.players import player as crud_player
+from core.database.crud.members import member as crud_member
+from core.database.crud.levels import level as crud_level
+from core.leaderboard import leaderboards
 from core.database.schemas.servers import CreateServer, UpdateServer
 
 from core.config import logger
+from core.interfaces.http import http
 
 
 class Core(commands.Cog):
@@ -20,10 +25,24 @@ class Core(commands.Cog):
         await self.__bot.wait_until_ready()
         logger.info("Heartbeat.")
 
-        async with session_lock:
-            with Session() as session:
+        for crud in (crud_server, crud_player, crud_member):
+            logger.info(
+                f"{crud.identities!r}, hit ratio {crud.identities.hit_ratio:.2%}"
+            )
+        logger.info(f"{http!r}")
+
+        async with Session() as session:
+            # Resync level table with the database
+            table = await crud_level.load_table(session)
+            logger.info(f"Level table loaded with {table.highest} levels.")
+
+            # Resync leaderboards with changes made outside the bot
+            await leaderboards.rebuild(session)
+
+            # Commit all servers at once
+            async with unit_of_work(session):
                 for guild in self.__bot.guilds:
-                    server = get_create(
+                    server = await get_create(
                         session, crud_server, obj_in=CreateServer(**{
                             "discord_id": str(guild.id),
                             "name": guild.name,
@@ -35,7 +54,7 @@ class Core(commands.Cog):
                     # Update last seen
                     now = datetime.now()
 
-                    crud_server.update(
+                    await crud_server.update(
                         session, db_obj=server, obj_in=UpdateServer(**{
                             "last_seen": now
                         })
@@ -4,17 +4,18 @@ import time
 import datetime
 import random
 import nextcord
-import requests
 import re
 
 # from discord_ui import cogs, SlashInteraction
-from aiohttp import ClientSession
+from aiohttp import ClientError
 from pathlib import Path
 
 from core.config import settings, logger
+from core.metrics import timed
 
-from core.database import session_lock, Session
-from core.database.models import Member, Server
+from core.database import Session, unit_of_work
+from core.database.cache import IdentityCache
+from core.database.models import Server
 from core.database.utils import get_create
 from core.database.crud.steamnews import (
     post as crud_post,
@@ -26,33 +27,48 @@ from core.database.schemas.dota_guild import CreateDotaGuild, UpdateDotaGuild
 from core.database.crud.members import member as crud_member
 from core.database.crud.servers import server as crud_server
 from core.database.schemas.servers import CreateServer
+from core.interfaces.cache import DiskCacheEntry, disk_cache
 from core.interfaces.dota2api import (
+    Dota2GuildSummary,
+    Dota2Hero,
     get_guild_summary,
     get_guild_persona_infos,
     get_heroes,
+    get_patches,
 )
+from core.interfaces.http import http
+from core.interfaces.steamapi import SteamAppNews, get_app_news
+from core.role_queue import role_queue
 from core.utils import Colors
 
 
+# Patch state was kept in this file before the disk cache
+LEGACY_PATCH_FILE = Path("/files/last_title")
+
+
 class Games(commands.Cog):
     def __init__(self, bot):
         self.__bot = bot
 
         self.__heroes = []
+        self.__hero_list = disk_cache.load("dota_heroes")
+        if self.__hero_list is not None:
+            self.__set_heroes(
+                [Dota2Hero.parse_obj(x) for x in self.__hero_list.data]
+            )
+        self.__app_news: dict[int, SteamAppNews] = {}
+        self.__persona_guild_ids: IdentityCache[str, set[int]] = IdentityCache(
+            "dota_persona_guild_ids",
+            settings.DOTA_PERSONA_CACHE_SIZE,
+            settings.DOTA_PERSONA_TTL,
+        )
 
         self.update_heroes.start()
         self.patch_notes.start()
         self.get_steam_news.start()
         self.dota_guild_sync.start()
 
-    @tasks.loop(hours=24)
-    async def update_heroes(self):
-        await self.__bot.wait_until_ready()
-        logger.info("Fetching Dota 2 heroes...")
-
-        async with ClientSession() as client:
-            heroes = await get_heroes(client)
-
+    def __set_heroes(self, heroes: list[Dota2Hero]):
         self.__heroes = [
             {
                 "name": hero.name_loc,
@@ -61,89 +77,134 @@ class Games(commands.Cog):
             for hero in heroes
         ]
 
-        logger.info("Done fetching heroes.")
-
-    @tasks.loop(minutes=30)
-    async def get_steam_news(self):
+    @tasks.loop(hours=24)
+    async def update_heroes(self):
         await self.__bot.wait_until_ready()
-        logger.info("Fetching Steam news...")
-        async with session_lock:
-            with Session() as session:
-                subs = crud_subscription.get_multi(session)
-                all_new_posts = []
-                async with ClientSession() as client:
-                    for s in subs:
-                        logger.info(f"Fetching news: {s.channel_id=} {s.app_id=}")
-                        async with client.get(
-                            f"https://api.steampowered.com/ISteamNews/GetNewsForApp/v0002/?appid={s.app_id}&count=100&maxlength=1500&format=json"
-                        ) as r:
-                            if r.status >= 400:
-                                logger.warning(
-                                    f"Could not find news for app {s.app_id}!"
-                                )
-                                continue
+        logger.info("Fetching Dota 2 heroes...")
 
-                            data = await r.json()
+        cached = self.__hero_list
+        hero_list = await get_heroes(
+            http,
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None,
+        )
 
-                            if (
-                                "appnews" not in data
-                                or "newsitems" not in data["appnews"]
-                            ):
-                                logger.warning(
-                                    f"Could not find news for app {s.app_id}!"
-                                )
-                                continue
+        if hero_list is None:
+            return
 
-                            new_posts = []
+        if not hero_list.modified:
+            logger.info("Heroes are up to date.")
+            return
 
-                            for p in data["appnews"]["newsitems"]:
-                                if p["feed_type"] != 1:
-                                    continue
+        self.__set_heroes(hero_list.heroes)
+        self.__hero_list = DiskCacheEntry(
+            etag=hero_list.etag,
+            last_modified=hero_list.last_modified,
+            data=[hero.dict() for hero in hero_list.heroes],
+        )
+        disk_cache.store("dota_heroes", self.__hero_list)
 
-                                db_post = crud_post.get_by_gid(session, p["gid"])
+        logger.info("Done fetching heroes.")
 
-                                if db_post is not None:
-                                    continue
+    async def __fetch_app_news(
+            self, semaphore: asyncio.Semaphore,
+            app_id: int
+    ) -> SteamAppNews | None:
+        """
+        Fetch news of an app, revalidating the previous response
+        :param semaphore: Limits concurrent requests
+        :param app_id: Steam App ID
+        :return: News or None if fetching failed
+        """
+        previous = self.__app_news.get(app_id)
 
-                                new_posts.append(p)
+        async with semaphore:
+            logger.info(f"Fetching news: {app_id=}")
+            try:
+                news = await get_app_news(
+                    http, app_id, settings.STEAM_NEWS_COUNT,
+                    etag=previous.etag if previous else None,
+                    last_modified=previous.last_modified if previous else None,
+                )
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Could not fetch news for app {app_id}! {e}")
+                return None
 
-                            for p in new_posts:
-                                all_new_posts.append(p)
+        return news
 
-                                embed = nextcord.Embed()
+    @tasks.loop(minutes=30)
+    @timed("get_steam_news")
+    async def get_steam_news(self):
+        await self.__bot.wait_until_ready()
+        logger.info("Fetching Steam news...")
 
-                                embed.set_author(
-                                    name=f"Steam News - {p['author']}",
-                                    icon_url="https://logos-world.net/wp-content/uploads/2020/10/Steam-Logo.png",
-                                )
-                                embed.title = p["title"]
-                                embed.url = p["url"]
-                                desc = re.sub(r"\{\S*\}\/\S*", "\n", p["contents"])
-                                embed.description = desc
+        async with Session() as session:
+            subs = await crud_subscription.get_multi(session)
+
+        # Fetch each app once, no matter how many channels subscribe to it
+        channels = {}
+        for s in subs:
+            channels.setdefault(s.app_id, []).append(s.channel_id)
+
+        semaphore = asyncio.Semaphore(settings.STEAM_NEWS_CONCURRENCY)
+        results = await asyncio.gather(*[
+            self.__fetch_app_news(semaphore, app_id) for app_id in channels
+        ])
+
+        posts = {}
+        modified = {}
+        for news in results:
+            if news is None or not news.modified:
+                continue
+
+            modified[news.app_id] = news
+            for p in news.items:
+                if p.feed_type == 1:
+                    posts[p.gid] = (news.app_id, p)
+
+        if not posts:
+            self.__app_news.update(modified)
+            logger.info("Done fetching Steam news.")
+            return
 
-                                channel = self.__bot.get_channel(int(s.channel_id))
+        # Add all new posts to database so they wont be sent again
+        async with Session() as session:
+            existing = await crud_post.get_existing_gids(session, list(posts))
+            created = await crud_post.create_many_missing(session, [
+                CreatePost(**{
+                    "steam_gid": p.gid,
+                    "title": p.title,
+                    "content": p.contents,
+                })
+                for gid, (_, p) in posts.items() if gid not in existing
+            ])
+            await session.commit()
+
+        # Revalidate only once the posts are stored, otherwise posts of a
+        # failed run would never be fetched again
+        self.__app_news.update(modified)
+
+        for gid in created:
+            app_id, p = posts[gid]
 
-                                await channel.send(embed=embed)
-                                await asyncio.sleep(0.5)
+            embed = nextcord.Embed()
 
-                # Add all new posts to database so they wont be sent again
-                for p in all_new_posts:
-                    old_p = crud_post.get_by_gid(session, p["gid"])
+            embed.set_author(
+                name=f"Steam News - {p.author}",
+                icon_url="https://logos-world.net/wp-content/uploads/2020/10/Steam-Logo.png",
+            )
+            embed.title = p.title
+            embed.url = p.url
+            desc = re.sub(r"\{\S*\}\/\S*", "\n", p.contents)
+            embed.description = desc
 
-                    # Skip if already added
-                    if old_p is not None:
-                        continue
+            for channel_id in channels[app_id]:
+                channel = self.__bot.get_channel(int(channel_id))
+                if channel is None:
+                    continue
 
-                    crud_post.create(
-                        session,
-                        obj_in=CreatePost(
-                            **{
-                                "steam_gid": p["gid"],
-                                "title": p["title"],
-                                "content": p["contents"],
-                            }
-                        ),
-                    )
+                await channel.send(embed=embed)
+                await asyncio.sleep(0.5)
 
         logger.info("Done fetching Steam news.")
 
@@ -152,28 +213,40 @@ class Games(commands.Cog):
         await self.__bot.wait_until_ready()
         logger.info("Fetching Dota 2 patch notes...")
 
-        r = requests.get(
-            "https://www.dota2.com/datafeed/patchnoteslist?language=english"
+        cached = disk_cache.load("dota_patches")
+        patch_list = await get_patches(
+            http,
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None,
         )
-        data = r.json()
-        if "patches" not in data:
-            logger.warning("Could not fetch patch notes :/")
+
+        if patch_list is None:
             return
 
-        latest = data["patches"][-1]["patch_name"]
+        if not patch_list.modified:
+            logger.info("Patch notes are up to date.")
+            return
+
+        if not patch_list.patches:
+            return
 
-        patch_file = Path("/files/last_title")
+        latest = patch_list.patches[-1].patch_name
 
-        if patch_file.exists():
-            with open("/files/last_title", "r") as pfr:
-                last_title = pfr.read()
+        if cached is not None:
+            last_title = cached.data
+        elif LEGACY_PATCH_FILE.exists():
+            last_title = LEGACY_PATCH_FILE.read_text()
         else:
             last_title = ""
 
+        disk_cache.store("dota_patches", DiskCacheEntry(
+            etag=patch_list.etag,
+            last_modified=patch_list.last_modified,
+            data=latest,
+        ))
+
         if latest != last_title:
             logger.info("New patch notes found!")
-            with open("/files/last_title", "w") as pfw:
-                pfw.write(latest)
 
             embed = nextcord.Embed()
 
@@ -191,93 +264,136 @@ class Games(commands.Cog):
 
         logger.info("Done fetching Dota 2 patch notes.")
 
+    async def __fetch_persona_guild_ids(
+            self, semaphore: asyncio.Semaphore, steam_id: str
+    ) -> set[int] | None:
+        """
+        Fetch ids of the Dota guilds a Steam account belongs to
+        :param semaphore: Limits concurrent requests
+        :param steam_id: Steam account ID
+        :return: Set of guild ids or None if fetching failed
+        """
+        guild_ids = self.__persona_guild_ids.get(steam_id)
+        if guild_ids is not None:
+            return guild_ids
+
+        async with semaphore:
+            try:
+                persona_infos = await get_guild_persona_infos(http, steam_id)
+            except (ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Could not fetch Dota Guild Persona {steam_id}! {e}")
+                return None
+
+        if persona_infos is None:
+            return None
+
+        guild_ids = {x.guild_id for x in persona_infos}
+        self.__persona_guild_ids.set(steam_id, guild_ids)
+        return guild_ids
+
     @tasks.loop(minutes=30)
+    @timed("dota_guild_sync")
     async def dota_guild_sync(self):
         await self.__bot.wait_until_ready()
         logger.info("Syncing Dota Guilds!...")
         updated = 0
-        async with session_lock:
-            with Session() as session:
-                dota_guilds = crud_dg.get_multi(session)
-                async with ClientSession() as client:
-                    for guild in dota_guilds:
-                        guild_summary = await get_guild_summary(client, guild)
-
-                        if guild_summary is None:
-                            continue
-
-                        if guild_summary.guild_info.guild_name != guild.name:
-                            logger.debug(f"Updating {guild.guild_name}...")
-                            crud_dg.update(
-                                session,
-                                db_obj=guild,
-                                obj_in=UpdateDotaGuild(
-                                    **{"name": guild_summary.guild_info.guild_name}
-                                ),
-                            )
 
-                        if guild.server_uuid:
-                            db_server = crud_server.get(session, guild.server_uuid)
-                        else:
-                            continue
+        # Read everything needed before any network I/O
+        async with Session() as session:
+            dota_guilds = [
+                guild for guild in await crud_dg.get_multi(session)
+                if guild.server_uuid
+            ]
+            servers = {
+                server.uuid: server for server in
+                await crud_server.get_multi_by_uuids(
+                    session, [guild.server_uuid for guild in dota_guilds]
+                )
+            }
+            rows = await crud_member.get_steam_ids_by_server_uuids(
+                session, list(servers)
+            )
 
-                        server: nextcord.Guild | None = self.__bot.get_guild(
-                            int(db_server.discord_id)
-                        )
+        members = {}
+        for server_uuid, discord_id, steam_id in rows:
+            members.setdefault(server_uuid, []).append((discord_id, steam_id))
 
-                        if not server:
-                            continue
+        semaphore = asyncio.Semaphore(settings.DOTA_SYNC_CONCURRENCY)
+        summaries = await asyncio.gather(*[
+            get_guild_summary(http, guild) for guild in dota_guilds
+        ], return_exceptions=True)
 
-                        members: list[Member] = crud_member.get_multi_members(
-                            session, guild.server_uuid
-                        )
+        # Fetch each Steam account once, even if it is on many servers
+        steam_ids = list({steam_id for _, _, steam_id in rows})
+        persona_guild_ids = dict(zip(steam_ids, await asyncio.gather(*[
+            self.__fetch_persona_guild_ids(semaphore, steam_id)
+            for steam_id in steam_ids
+        ])))
 
-                        members = [
-                            member
-                            for member in members
-                            if member.player.steam_id is not None
-                        ]
+        renamed = {}
+        for guild, guild_summary in zip(dota_guilds, summaries):
+            if not isinstance(guild_summary, Dota2GuildSummary):
+                continue
 
-                        # Iterate over members to check if they belong to the given Dota Guild
-                        for member in members:
+            if guild_summary.guild_info.guild_name != guild.name:
+                renamed[guild.uuid] = (guild, guild_summary.guild_info.guild_name)
 
-                            persona_infos = await get_guild_persona_infos(
-                                client, member
-                            )
+            db_server = servers.get(guild.server_uuid)
+            if db_server is None:
+                continue
 
-                            if len(persona_infos) == 0:
-                                continue
+            server: nextcord.Guild | None = self.__bot.get_guild(
+                int(db_server.discord_id)
+            )
 
-                            guild_ids = [x.guild_id for x in persona_infos]
+            if not server:
+                continue
 
-                            d_member: nextcord.Member | None = server.get_member(
-                                int(member.player.discord_id)
-                            )
+            role = server.get_role(int(guild.role_discord_id))
+
+            # Check which members belong to the given Dota Guild
+            for discord_id, steam_id in members.get(guild.server_uuid, []):
+                guild_ids = persona_guild_ids.get(steam_id)
+
+                if not guild_ids:
+                    continue
+
+                d_member: nextcord.Member | None = server.get_member(
+                    int(discord_id)
+                )
+
+                if d_member and role:
+                    if (
+                        guild.guild_id in guild_ids
+                        and d_member.get_role(role.id) is None
+                    ):
+                        logger.debug(f"Update guild role for {d_member.name}")
+                        role_queue.add(d_member, role, reason="Dota guild sync.")
+                        updated += 1
+                    elif (
+                        guild.guild_id not in guild_ids
+                        and d_member.get_role(role.id) is not None
+                    ):
+                        logger.debug(f"Update guild role for {d_member.name}")
+                        role_queue.remove(
+                            d_member, role, reason="Dota guild sync."
+                        )
+                        updated += 1
+                elif d_member:
+                    logger.error(
+                        f"Could not find role with {guild.role_discord_id=}"
+                    )
+
+        if renamed:
+            async with Session() as session, unit_of_work(session):
+                for guild, name in renamed.values():
+                    logger.debug(f"Updating {guild.name}...")
+                    await crud_dg.update(
+                        session,
+                        db_obj=guild,
+                        obj_in=UpdateDotaGuild(**{"name": name}),
+                    )
 
-                            if d_member and server.get_role(guild.role_discord_id):
-                                if (
-                                    guild.guild_id in guild_ids
-                                    and d_member.get_role(guild.role_discord_id) is None
-                                ):
-                                    logger.debug(
-                                        f"Update guild role for {d_member.name}"
-                                    )
-                                    await d_member.add_roles(guild.role_discord_id)
-                                    updated += 1
-                                elif (
-                                    guild.guild_id not in guild_ids
-                                    and d_member.get_role(guild.role_discord_id)
-                                    is not None
-                                ):
-                                    logger.debug(
-                                        f"Update guild role for {d_member.name}"
-                                    )
-                                    await d_member.remove_roles(guild.role_discord_id)
-                                    updated += 1
-                            elif d_member:
-                                logger.error(
-                                    f"Could not find role with {guild.role_discord_id=}"
-                                )
         logger.info(f"Done syncing Dota Guilds. Users updated: {updated}")
 
     @commands.group(no_pm=True)
@@ -330,23 +446,22 @@ class Games(commands.Cog):
         :param app_id: ID of a Steam App (can be found in Steam)
         :return:
         """
-        async with session_lock:
-            with Session() as session:
-                sub = crud_subscription.create(
-                    session,
-                    obj_in=CreateSubscription(
-                        **{"channel_id": str(ctx.message.channel.id), "app_id": app_id}
-                    ),
-                )
-                embed = nextcord.Embed()
-                embed.set_author(
-                    name=self.__bot.user.name,
-                    url=settings.URL,
-                    icon_url=self.__bot.user.avatar.url,
-                )
-                embed.title = f"Channel **{ctx.message.channel}** subscribed to Steam App **{sub.app_id}**!"
-                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                await ctx.send(embed=embed)
+        async with Session() as session:
+            sub = await crud_subscription.create(
+                session,
+                obj_in=CreateSubscription(
+                    **{"channel_id": str(ctx.message.channel.id), "app_id": app_id}
+                ),
+            )
+            embed = nextcord.Embed()
+            embed.set_author(
+                name=self.__bot.user.name,
+                url=settings.URL,
+                icon_url=self.__bot.user.avatar.url,
+            )
+            embed.title = f"Channel **{ctx.message.channel}** subscribed to Steam App **{sub.app_id}**!"
+            embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+            await ctx.send(embed=embed)
 
     @steam_news.command(name="clear", pass_context=True, no_pm=True)
     @commands.has_permissions(administrator=True)
@@ -357,30 +472,29 @@ class Games(commands.Cog):
         :param ctx: Context
         :return:
         """
-        async with session_lock:
-            with Session() as session:
-                apps = []
-                subs = crud_subscription.get_multi_by_channel_id(
-                    session, ctx.message.channel.id
-                )
-                for s in subs:
-                    old_s = crud_subscription.remove(session, uuid=s.uuid)
-                    apps.append(old_s.app_id)
-
-                embed = nextcord.Embed()
-                embed.set_author(
-                    name=self.__bot.user.name,
-                    url=settings.URL,
-                    icon_url=self.__bot.user.avatar.url,
-                )
-                embed.title = f"Cleared subscriptions on **{ctx.message.channel}**."
-                embed.description = "Removed subscriptions for Steam Apps with IDs:"
+        async with Session() as session:
+            apps = []
+            subs = await crud_subscription.get_multi_by_channel_id(
+                session, ctx.message.channel.id
+            )
+            for s in subs:
+                old_s = await crud_subscription.remove(session, uuid=s.uuid)
+                apps.append(old_s.app_id)
 
-                for a in apps:
-                    embed.description += f"\n{a}"
+            embed = nextcord.Embed()
+            embed.set_author(
+                name=self.__bot.user.name,
+                url=settings.URL,
+                icon_url=self.__bot.user.avatar.url,
+            )
+            embed.title = f"Cleared subscriptions on **{ctx.message.channel}**."
+            embed.description = "Removed subscriptions for Steam Apps with IDs:"
 
-                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                await ctx.send(embed=embed)
+            for a in apps:
+                embed.description += f"\n{a}"
+
+            embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+            await ctx.send(embed=embed)
 
     @commands.command(pass_context=True)
     async def dota_random(self, ctx):
@@ -490,73 +604,71 @@ class Games(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                db_server: Server = get_create(
-                    session,
-                    crud_server,
-                    obj_in=CreateServer(
-                        **{
-                            "discord_id": str(ctx.guild.id),
-                            "name": ctx.guild.name,
-                            "server_exp": 0,
-                            "channel": None,
-                        }
-                    ),
-                )
-                guild = crud_dg.get_by_guild_id_server_uuid(
-                    session, guild_id, db_server.uuid
-                )
-                if guild is not None:
-                    embed.title = "Guild already linked to this server!"
-                    embed.colour = Colors.error
-                else:
-                    async with ClientSession() as client:
-                        async with client.get(
-                            f"https://www.dota2.com/webapi/IDOTA2Guild/GetGuildSummary/v0001/"
-                            f"?key={settings.STEAM_API_KEY}&guild_id={guild_id}&format=json"
-                        ) as r:
-
-                            if r.status >= 400:
-                                embed.title = (
-                                    f"Could not find Guild with {guild_id=} {r.status=}"
+        async with Session() as session:
+            db_server: Server = await get_create(
+                session,
+                crud_server,
+                obj_in=CreateServer(
+                    **{
+                        "discord_id": str(ctx.guild.id),
+                        "name": ctx.guild.name,
+                        "server_exp": 0,
+                        "channel": None,
+                    }
+                ),
+            )
+            guild = await crud_dg.get_by_guild_id_server_uuid(
+                session, guild_id, db_server.uuid
+            )
+            if guild is not None:
+                embed.title = "Guild already linked to this server!"
+                embed.colour = Colors.error
+            else:
+                async with http.get(
+                    f"https://www.dota2.com/webapi/IDOTA2Guild/GetGuildSummary/v0001/"
+                    f"?key={settings.STEAM_API_KEY}&guild_id={guild_id}&format=json"
+                ) as r:
+
+                    if r.status >= 400:
+                        embed.title = (
+                            f"Could not find Guild with {guild_id=} {r.status=}"
+                        )
+                        embed.colour = Colors.error
+                    else:
+
+                        data = await r.json()
+
+                        if data["success"] and "summary" in data:
+                            if (
+                                "guild_info" in data["summary"]
+                                and "guild_name"
+                                in data["summary"]["guild_info"]
+                            ):
+
+                                guild = await crud_dg.create(
+                                    session,
+                                    obj_in=CreateDotaGuild(
+                                        **{
+                                            "role_discord_id": str(role.id),
+                                            "name": data["summary"][
+                                                "guild_info"
+                                            ]["guild_name"],
+                                            "server_uuid": db_server.uuid,
+                                            "guild_id": guild_id,
+                                        }
+                                    ),
                                 )
-                                embed.colour = Colors.error
-                            else:
 
-                                data = await r.json()
-
-                                if data["success"] and "summary" in data:
-                                    if (
-                                        "guild_info" in data["summary"]
-                                        and "guild_name"
-                                        in data["summary"]["guild_info"]
-                                    ):
-
-                                        guild = crud_dg.create(
-                                            session,
-                                            obj_in=CreateDotaGuild(
-                                                **{
-                                                    "role_discord_id": str(role.id),
-                                                    "name": data["summary"][
-                                                        "guild_info"
-                                                    ]["guild_name"],
-                                                    "server_uuid": db_server.uuid,
-                                                    "guild_id": guild_id,
-                                                }
-                                            ),
-                                        )
-
-                                        embed.title = f"{guild.name} ({guild.guild_id}) has been linked to this server!"
-                                        embed.colour = Colors.success
-                                    else:
-                                        embed.title = f"Data for {guild_id=} not found!"
-                                        embed.colour = Colors.error
-                                else:
-                                    embed.title = (
-                                        f"Could not find Guild with {guild_id=}"
-                                    )
-                                    embed.colour = Colors.error
+                                embed.title = f"{guild.name} ({guild.guild_id}) has been linked to this server!"
+                                embed.colour = Colors.success
+                            else:
+                                embed.title = f"Data for {guild_id=} not found!"
+                                embed.colour = Colors.error
+                        else:
+                            embed.title = (
+                                f"Could not find Guild with {guild_id=}"
+                            )
+                            embed.colour = Colors.error
 
         embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
         await ctx.send(embed=embed, ephemeral=True)
@@ -576,40 +688,38 @@ class Games(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                db_server: Server = get_create(
-                    session,
-                    crud_server,
-                    obj_in=CreateServer(
-                        **{
-                            "discord_id": str(ctx.guild.id),
-                            "name": ctx.guild.name,
-                            "server_exp": 0,
-                            "channel": None,
-                        }
-                    ),
-                )
-                guilds = crud_dg.get_multi_by_server_uuid(session, db_server.uuid)
-
-                for guild in guilds:
-                    async with ClientSession() as client:
-                        guild_summary = await get_guild_summary(client, guild)
-
-                        if guild_summary:
-                            embed.title = f"[{guild_summary.guild_info.guild_tag}] {guild_summary.guild_info.guild_name}"
-                            embed.description = (
-                                f"{guild_summary.guild_info.guild_description}\n"
-                                f"MOTD: **{guild_summary.guild_info.guild_motd}**\n"
-                                f"Created: **{guild_summary.guild_info.created_timestamp.isoformat()}**"
-                            )
+        async with Session() as session:
+            db_server: Server = await get_create(
+                session,
+                crud_server,
+                obj_in=CreateServer(
+                    **{
+                        "discord_id": str(ctx.guild.id),
+                        "name": ctx.guild.name,
+                        "server_exp": 0,
+                        "channel": None,
+                    }
+                ),
+            )
+            guilds = await crud_dg.get_multi_by_server_uuid(session, db_server.uuid)
 
-                        else:
-                            embed.title = f"Could not find Guild with {guild.guild_id=}"
-                            embed.colour = Colors.error
+            for guild in guilds:
+                guild_summary = await get_guild_summary(http, guild)
+
+                if guild_summary:
+                    embed.title = f"[{guild_summary.guild_info.guild_tag}] {guild_summary.guild_info.guild_name}"
+                    embed.description = (
+                        f"{guild_summary.guild_info.guild_description}\n"
+                        f"MOTD: **{guild_summary.guild_info.guild_motd}**\n"
+                        f"Created: **{guild_summary.guild_info.created_timestamp.isoformat()}**"
+                    )
+
+                else:
+                    embed.title = f"Could not find Guild with {guild.guild_id=}"
+                    embed.colour = Colors.error
 
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                    await ctx.send(embed=embed)
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                await ctx.send(embed=embed)
 
     @commands.command(pass_context=True, hidden=True, no_pm=True)
     async def play_game(
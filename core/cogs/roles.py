@@ -4,10 +4,12 @@ import nextcord.partial_emoji
 from typing import Optional, Union
 from nextcord.ext import commands, tasks, application_checks
 from nextcord import Embed, Forbidden, HTTPException, utils, SlashOption
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # from discord_ui import nextcord, SlashOption, AutocompleteInteraction, SlashPermission
 from core.config import settings, logger
-from core.database import Session, session_lock
+from core.metrics import timed
+from core.database import Session
 from core.database.crud.roles import role as role_crud, role_emoji as emoji_crud
 from core.database.crud import members
 from core.database.crud.servers import server as server_crud
@@ -17,9 +19,16 @@ from core.database.schemas.servers import UpdateServer
 from core.database.schemas.members import CreateMember
 from core.database.schemas.players import CreatePlayer
 from core.database.models import Member, Server, Player, Role
-from core.database.utils import get_create_ctx, add_to_role, remove_from_role
+from core.database.utils import (
+    get_create_ctx,
+    get_member_uuid,
+    add_to_role,
+    remove_from_role,
+)
 from datetime import datetime
 
+from core.reaction_roles import ReactionRole, reaction_roles
+from core.role_queue import role_queue
 from core.utils import Colors
 
 
@@ -38,12 +47,12 @@ def like_role(
 
 
 async def autocomplete_context(
-        session: Session, ctx: nextcord.Interaction
+        session: AsyncSession, ctx: nextcord.Interaction
 ) -> tuple[Optional[Server], Player, Optional[Member]]:
-    server = server_crud.get_by_discord(session, ctx.guild.id)
-    player = players.player.get_by_discord(session, ctx.user.id)
+    server = await server_crud.get_by_discord(session, ctx.guild.id)
+    player = await players.player.get_by_discord(session, ctx.user.id)
     if player is None:
-        player = players.player.create(
+        player = await players.player.create(
             session,
             obj_in=CreatePlayer(
                 discord_id=str(ctx.user.id), name=ctx.user.name, hidden=True
@@ -51,14 +60,15 @@ async def autocomplete_context(
         )
     if server is None:
         return None, player, None
-    member = members.member.get_by_ids(session, player.uuid, server.uuid)
+    member = await members.member.get_by_ids(session, player.uuid, server.uuid)
     if member is None:
-        member = members.member.create(
+        member = await members.member.create(
             session,
             obj_in=CreateMember(
                 exp=0, player_uuid=player.uuid, server_uuid=server.uuid
             ),
         )
+    await session.refresh(member, attribute_names=["roles"])
 
     return server, player, member
 
@@ -75,13 +85,13 @@ async def assignable_roles(
     :return: list of name-role pairs
     """
     logger.debug(f"{cog.qualified_name}")
-    with Session() as session:
+    async with Session() as session:
         server, player, author = await autocomplete_context(session, ctx)
 
         if server is None:
             return []
 
-        roles = role_crud.get_multi_by_query(session, server.uuid, value)
+        roles = await role_crud.get_multi_by_query(session, server.uuid, value)
         return [
             (role.name, role.discord_id)
             async for role in desync(roles)
@@ -102,7 +112,7 @@ async def removable_roles(
     """
 
     logger.debug(f"{cog.qualified_name}")
-    with Session() as session:
+    async with Session() as session:
         server, player, author = await autocomplete_context(session, ctx)
 
         if server is None:
@@ -126,7 +136,7 @@ async def creatable_roles(
     :return: list of name-role pairs
     """
     logger.debug(f"{cog.qualified_name}")
-    with Session() as session:
+    async with Session() as session:
         server, _, _ = await autocomplete_context(session, ctx)
 
         if server is None:
@@ -135,7 +145,7 @@ async def creatable_roles(
         roles = [
             role
             async for role in desync(like_role(ctx.guild.roles, value))
-            if not role_crud.get_by_discord(session, role.id)
+            if not await role_crud.get_by_discord(session, role.id)
         ]
 
         return roles
@@ -153,13 +163,13 @@ async def deletable_roles(
     :return: list of name-role pairs
     """
     logger.debug(f"{cog.qualified_name}")
-    with Session() as session:
+    async with Session() as session:
         server, _, _ = await autocomplete_context(session, ctx)
 
         if server is None:
             return []
 
-        roles = role_crud.get_multi_by_query(session, server.uuid, value)
+        roles = await role_crud.get_multi_by_query(session, server.uuid, value)
 
         return [(role.name, role.discord_id) async for role in desync(roles)]
 
@@ -177,19 +187,15 @@ async def available_emojis(
     """
     logger.debug(f"{cog.qualified_name}")
     logger.debug(value)
-    with Session() as session:
+    async with Session() as session:
         server, _, _ = await autocomplete_context(session, ctx)
 
         if server is None:
             # TODO make sure this returns ALL emojis usable on said Guild
             return [str(emoji) async for emoji in desync(ctx.guild.emojis)]
 
-        roles = role_crud.get_multi_by_server_uuid(session, server.uuid)
-        db_emojis = [
-            emoji_crud.get_by_role(session, role.uuid).identifier
-            for role in roles
-            if emoji_crud.get_by_role(session, role.uuid)
-        ]
+        roles = await role_crud.get_multi_with_emojis(session, server.uuid)
+        db_emojis = [emoji.identifier for _, emoji in roles if emoji]
 
         return [
             str(emoji)
@@ -207,6 +213,30 @@ class Roles(commands.Cog):
         # Start tasks
         self.role_update.start()
 
+    async def shutdown(self):
+        """
+        Apply queued role changes before the bot closes
+        :return:
+        """
+        await role_queue.flush(self.__bot)
+
+    async def __route(self, payload) -> Optional[ReactionRole]:
+        """
+        Find role assigned by a reaction
+        :param payload: Raw reaction event
+        :return: Role or None if the reaction isn't on a role message
+        """
+        if payload.guild_id is None:
+            return None
+
+        if not reaction_roles.loaded:
+            async with Session() as session:
+                await reaction_roles.load(session)
+
+        return reaction_roles.get(
+            payload.guild_id, payload.message_id, payload.emoji.name
+        )
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
 
@@ -214,126 +244,78 @@ class Roles(commands.Cog):
         if payload.member.bot:
             return
 
-        async with session_lock:
-            with Session() as session:
-
-                server = server_crud.get_by_discord(session, payload.guild_id)
-                if server and str(payload.message_id) == server.role_message:
-                    db_player = players.player.get_by_discord(
-                        session, payload.member.id
-                    )
-
-                    # Stop if player not registered
-                    if db_player is None:
-                        logger.error(f"Player not found for {payload.member.id}.")
-                        return
-
-                    db_member = members.member.get_by_ids(
-                        session, db_player.uuid, server.uuid
-                    )
-
-                    # Stop if member not registered
-                    if db_member is None:
-                        logger.error(f"Member not found for {payload.member.id}.")
-                        return
+        route = await self.__route(payload)
+        if route is None:
+            return
 
-                    e = payload.emoji.name
-                    emoji = emoji_crud.get_by_identifier(session, e)
+        async with Session() as session:
+            member_uuid = await get_member_uuid(
+                session, payload.guild_id, payload.member.id
+            )
 
-                    if not emoji:
-                        logger.error(
-                            f"Emoji requested with {e} not " f"found on {server.name}."
-                        )
-                        return
+            # Stop if player or member not registered
+            if member_uuid is None:
+                logger.error(f"Member not found for {payload.member.id}.")
+                return
 
-                    found, d_id = add_to_role(
-                        session, db_member.uuid, role_uuid=emoji.role_uuid
-                    )
+            found, _ = await add_to_role(
+                session, member_uuid, role_uuid=route.role_uuid
+            )
 
-                    # Stop if wasn't found
-                    if not found:
-                        logger.error(
-                            f"Role not found for emoji {emoji.identifier} "
-                            f"on {server.name}."
-                        )
-                        return
+        # Stop if wasn't found
+        if not found:
+            logger.error(
+                f"Role not found for emoji {payload.emoji.name} "
+                f"on {payload.guild_id}."
+            )
+            return
 
-                    try:
-                        role = self.__bot.get_guild(payload.guild_id).get_role(
-                            int(d_id)
-                        )
-                        await payload.member.add_roles(
-                            role, reason="Added through role reaction."
-                        )
-                    except Forbidden:
-                        logger.error(
-                            "Forbidden: Not enough permissions to manage roles."
-                        )
-                    except HTTPException:
-                        logger.error(
-                            "HTTPException: Something went wrong while changing roles"
-                        )
+        role = self.__bot.get_guild(payload.guild_id).get_role(
+            int(route.role_discord_id)
+        )
+        if role is not None:
+            role_queue.add(
+                payload.member, role, reason="Added through role reaction."
+            )
 
     @commands.Cog.listener()
     async def on_raw_reaction_remove(self, payload):
-        async with session_lock:
-            with Session() as session:
-
-                server = server_crud.get_by_discord(session, payload.guild_id)
-                if server and str(payload.message_id) == server.role_message:
-                    db_player = players.player.get_by_discord(session, payload.user_id)
-
-                    # Stop if player not registered
-                    if db_player is None:
-                        logger.error(f"Player not found for {payload.user_id}.")
-                        return
-
-                    db_member = members.member.get_by_ids(
-                        session, db_player.uuid, server.uuid
-                    )
-
-                    # Stop if member not registered
-                    if db_member is None:
-                        logger.error(f"Member not found for {payload.user_id}.")
-                        return
+        route = await self.__route(payload)
+        if route is None:
+            return
 
-                    e = payload.emoji.name
-                    emoji = emoji_crud.get_by_identifier(session, e)
+        async with Session() as session:
+            member_uuid = await get_member_uuid(
+                session, payload.guild_id, payload.user_id
+            )
 
-                    if not emoji:
-                        logger.error(
-                            f"Emoji requested with {e} not " f"found on {server.name}."
-                        )
-                        return
+            # Stop if player or member not registered
+            if member_uuid is None:
+                logger.error(f"Member not found for {payload.user_id}.")
+                return
 
-                    found, d_id = remove_from_role(
-                        session, db_member.uuid, role_uuid=emoji.role_uuid
-                    )
+            found, _ = await remove_from_role(
+                session, member_uuid, role_uuid=route.role_uuid
+            )
 
-                    # Stop if wasn't found
-                    if not found:
-                        logger.error(
-                            f"Role not found for emoji {emoji.identifier} "
-                            f"on {server.name}."
-                        )
-                        return
+        # Stop if wasn't found
+        if not found:
+            logger.error(
+                f"Role not found for emoji {payload.emoji.name} "
+                f"on {payload.guild_id}."
+            )
+            return
 
-                    try:
-                        guild = self.__bot.get_guild(payload.guild_id)
-                        role = guild.get_role(int(d_id))
-                        await guild.get_member(payload.user_id).remove_roles(
-                            role, reason="Removed through role reaction."
-                        )
-                    except Forbidden:
-                        logger.error(
-                            "Forbidden: Not enough permissions to manage roles."
-                        )
-                    except HTTPException:
-                        logger.error(
-                            "HTTPException: Something went wrong while changing roles"
-                        )
+        guild = self.__bot.get_guild(payload.guild_id)
+        role = guild.get_role(int(route.role_discord_id))
+        member = guild.get_member(payload.user_id)
+        if role is not None and member is not None:
+            role_queue.remove(
+                member, role, reason="Removed through role reaction."
+            )
 
     @tasks.loop(minutes=30)
+    @timed("role_update")
     async def role_update(self):
         """
         Update roles stored every 30 minutes
@@ -342,133 +324,135 @@ class Roles(commands.Cog):
         await self.__bot.wait_until_ready()
         logger.info("Updating role messages...")
 
-        async with session_lock:
-            with Session() as session:
+        logger.info(f"{role_queue!r}")
 
-                # Go through all visible guilds
-                for guild in self.__bot.guilds:
+        async with Session() as session:
+            await reaction_roles.load(session)
 
-                    server = server_crud.get_by_discord(session, guild.id)
+            # Go through all visible guilds
+            for guild in self.__bot.guilds:
 
-                    # Skip if server is not found
-                    if server is None:
-                        continue
+                server = await server_crud.get_by_discord(session, guild.id)
 
-                    # Get all roles for server
-                    roles = role_crud.get_multi_by_server_uuid(session, server.uuid)
+                # Skip if server is not found
+                if server is None:
+                    continue
 
-                    temp_roles = {}
+                # Get all roles for server
+                roles = await role_crud.get_multi_by_server_uuid(session, server.uuid)
 
-                    for r in roles:
-                        temp_roles[r.discord_id] = r
+                temp_roles = {}
 
-                    # Go through all roles of a guild
-                    for r in guild.roles:
+                for r in roles:
+                    temp_roles[r.discord_id] = r
 
-                        # Skip roles that are default or premium
-                        if r.is_default or r.is_premium_subscriber:
-                            continue
+                # Go through all roles of a guild
+                for r in guild.roles:
 
-                        # Check that role is registered, otherwise skip
-                        if r.id not in temp_roles:
-                            continue
+                    # Skip roles that are default or premium
+                    if r.is_default or r.is_premium_subscriber:
+                        continue
 
-                        # If the name is the same, then skip
-                        if r.name == temp_roles[r.id].name:
-                            continue
+                    # Check that role is registered, otherwise skip
+                    if r.id not in temp_roles:
+                        continue
 
-                        role_update = UpdateRole(**{"name": r.name})
+                    # If the name is the same, then skip
+                    if r.name == temp_roles[r.id].name:
+                        continue
 
-                        # Update role
-                        role_crud.update(session, temp_roles[r.id], role_update)
+                    role_update = UpdateRole(**{"name": r.name})
 
-                    # Update role message if it exists
-                    if (
-                            server.role_message is not None
-                            and server.role_channel is not None
-                    ):
-                        channel = self.__bot.get_channel(int(server.role_channel))
+                    # Update role
+                    await role_crud.update(
+                        session, db_obj=temp_roles[r.id], obj_in=role_update
+                    )
 
-                        # Continue if channel wasn't found
-                        if channel is None:
-                            logger.info(f"No channel found for {server.name}.")
-                            continue
+                # Update role message if it exists
+                if (
+                        server.role_message is not None
+                        and server.role_channel is not None
+                ):
+                    channel = self.__bot.get_channel(int(server.role_channel))
 
-                        # Channel must not be bloated with messages
-                        message = utils.find(
-                            lambda m: (m.id == int(server.role_message)),
-                            await channel.history(limit=10).flatten(),
-                        )
+                    # Continue if channel wasn't found
+                    if channel is None:
+                        logger.info(f"No channel found for {server.name}.")
+                        continue
 
-                        # Continue if message wasn't found
-                        if message is None:
-                            logger.info(f"No message found for {server.name}.")
-                            continue
+                    # Channel must not be bloated with messages
+                    message = utils.find(
+                        lambda m: (m.id == int(server.role_message)),
+                        await channel.history(limit=10).flatten(),
+                    )
 
-                        # Get context
-                        ctx = await self.__bot.get_context(message)
+                    # Continue if message wasn't found
+                    if message is None:
+                        logger.info(f"No message found for {server.name}.")
+                        continue
 
-                        embed = Embed()
-                        embed.title = (
-                            f"Assignable roles for " f"**{message.guild.name}**"
-                        )
-                        embed.description = (
-                            "Use reactions inorder to get "
-                            "roles assigned to you, or use "
-                            "`!role add roleName`"
-                        )
+                    # Get context
+                    ctx = await self.__bot.get_context(message)
 
-                        converter = commands.EmojiConverter()
-                        pconverter = commands.PartialEmojiConverter()
+                    embed = Embed()
+                    embed.title = (
+                        f"Assignable roles for " f"**{message.guild.name}**"
+                    )
+                    embed.description = (
+                        "Use reactions inorder to get "
+                        "roles assigned to you, or use "
+                        "`!role add roleName`"
+                    )
 
-                        # Get all roles of a server
-                        roles = role_crud.get_multi_by_server_uuid(session, server.uuid)
+                    converter = commands.EmojiConverter()
+                    pconverter = commands.PartialEmojiConverter()
 
-                        # Gather all used emojis for future reactions
-                        emojis = []
+                    # Get all roles of a server
+                    roles = await role_crud.get_multi_with_emojis(session, server.uuid)
 
-                        for ro in roles:
+                    # Gather all used emojis for future reactions
+                    emojis = []
 
-                            emoji = emoji_crud.get_by_role(session, ro.uuid)
+                    for ro, emoji in roles:
 
-                            if emoji is None:
-                                continue
+                        if emoji is None:
+                            continue
 
+                        try:
+                            # Convert into actual emoji
+                            e = await converter.convert(ctx, emoji.identifier)
+                        except commands.EmojiNotFound:
+                            # Try partial emoji instead
                             try:
-                                # Convert into actual emoji
-                                e = await converter.convert(ctx, emoji.identifier)
-                            except commands.EmojiNotFound:
-                                # Try partial emoji instead
-                                try:
-                                    e = await pconverter.convert(ctx, emoji.identifier)
-                                except commands.PartialEmojiConversionFailure:
-                                    # Assume that it is an unicode emoji
-                                    e = emoji.identifier
-
-                            # Add to message
-                            embed.add_field(
-                                name=f"{str(e)}  ==  {ro.name}",
-                                value=ro.description,
-                                inline=False,
-                            )
-
-                            emojis.append(e)
-
-                        await message.edit(embed=embed)
-
-                        # Check old reactions
-                        old_emojis = []
-                        for r in message.reactions:
-                            old_emojis.append(r.emoji)
-
-                        # Add new reactions to message
-                        for e in emojis:
-                            if isinstance(e, nextcord.partial_emoji.PartialEmoji):
-                                logger.error(f"Emoji not cannot be used! Emoji: {e}")
-                            elif e not in old_emojis:
-                                await message.add_reaction(e)
-
-                        logger.info(f"Message updated for {server.name}.")
+                                e = await pconverter.convert(ctx, emoji.identifier)
+                            except commands.PartialEmojiConversionFailure:
+                                # Assume that it is an unicode emoji
+                                e = emoji.identifier
+
+                        # Add to message
+                        embed.add_field(
+                            name=f"{str(e)}  ==  {ro.name}",
+                            value=ro.description,
+                            inline=False,
+                        )
+
+                        emojis.append(e)
+
+                    await message.edit(embed=embed)
+
+                    # Check old reactions
+                    old_emojis = []
+                    for r in message.reactions:
+                        old_emojis.append(r.emoji)
+
+                    # Add new reactions to message
+                    for e in emojis:
+                        if isinstance(e, nextcord.partial_emoji.PartialEmoji):
+                            logger.error(f"Emoji not cannot be used! Emoji: {e}")
+                        elif e not in old_emojis:
+                            await message.add_reaction(e)
+
+                    logger.info(f"Message updated for {server.name}.")
 
     @nextcord.slash_command("role", "Role management")
     async def slash_role(self, ctx: nextcord.Interaction):
@@ -527,42 +511,41 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_member = get_create_ctx(interaction, session, members.member)
+        async with Session() as session:
+            db_member = await get_create_ctx(interaction, session, members.member)
+
+            found, d_id = await add_to_role(
+                session, db_member.uuid, role_discord_id=str(role.id)
+            )
 
-                found, d_id = add_to_role(
-                    session, db_member.uuid, role_discord_id=str(role.id)
+            # If role is not found
+            if not found:
+                embed.title = "This role is not assignable!"
+                embed.colour = Colors.error
+                embed.description = (
+                    "This role doesn't exists or " "it is not assignable."
                 )
+            else:
+                try:
+                    await interaction.user.add_roles(
+                        role, reason="Added through role add command."
+                    )
 
-                # If role is not found
-                if not found:
-                    embed.title = "This role is not assignable!"
-                    embed.colour = Colors.error
+                    embed.title = (
+                        f"*{interaction.user.name}* has been "
+                        f"added to *{role.name}*!"
+                    )
+                    embed.colour = Colors.success
+                except Forbidden:
+                    embed.title = "I don't have a permission to do that :("
+                    embed.colour = Colors.unauthorized
                     embed.description = (
-                        "This role doesn't exists or " "it is not assignable."
+                        "Give me a permission to manage"
+                        " roles or give me a higher role."
                     )
-                else:
-                    try:
-                        await interaction.user.add_roles(
-                            role, reason="Added through role add command."
-                        )
-
-                        embed.title = (
-                            f"*{interaction.user.name}* has been "
-                            f"added to *{role.name}*!"
-                        )
-                        embed.colour = Colors.success
-                    except Forbidden:
-                        embed.title = "I don't have a permission to do that :("
-                        embed.colour = Colors.unauthorized
-                        embed.description = (
-                            "Give me a permission to manage"
-                            " roles or give me a higher role."
-                        )
-                    except HTTPException:
-                        embed.title = "Something happened, didn't succeed :/"
-                        embed.colour = Colors.error
+                except HTTPException:
+                    embed.title = "Something happened, didn't succeed :/"
+                    embed.colour = Colors.error
 
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed, ephemeral=True)
@@ -581,40 +564,39 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_member = get_create_ctx(ctx, session, members.member)
+        async with Session() as session:
+            db_member = await get_create_ctx(ctx, session, members.member)
 
-                found, d_id = add_to_role(session, db_member.uuid, role_name=name)
+            found, d_id = await add_to_role(session, db_member.uuid, role_name=name)
 
-                # If role is not found
-                if not found:
-                    embed.title = "This role is not assignable!"
-                    embed.colour = Colors.error
-                    embed.description = (
-                        "This role doesn't exists or " "it is not assignable."
+            # If role is not found
+            if not found:
+                embed.title = "This role is not assignable!"
+                embed.colour = Colors.error
+                embed.description = (
+                    "This role doesn't exists or " "it is not assignable."
+                )
+            else:
+                try:
+                    role = ctx.guild.get_role(int(d_id))
+                    await ctx.author.add_roles(
+                        role, reason="Added through role add command."
                     )
-                else:
-                    try:
-                        role = ctx.guild.get_role(int(d_id))
-                        await ctx.author.add_roles(
-                            role, reason="Added through role add command."
-                        )
 
-                        embed.title = (
-                            f"*{ctx.author.name}* has been " f"added to *{name}*!"
-                        )
-                        embed.colour = Colors.success
-                    except Forbidden:
-                        embed.title = "I don't have a permission to do that :("
-                        embed.colour = Colors.unauthorized
-                        embed.description = (
-                            "Give me a permission to manage"
-                            " roles or give me a higher role."
-                        )
-                    except HTTPException:
-                        embed.title = "Something happened, didn't succeed :/"
-                        embed.colour = Colors.error
+                    embed.title = (
+                        f"*{ctx.author.name}* has been " f"added to *{name}*!"
+                    )
+                    embed.colour = Colors.success
+                except Forbidden:
+                    embed.title = "I don't have a permission to do that :("
+                    embed.colour = Colors.unauthorized
+                    embed.description = (
+                        "Give me a permission to manage"
+                        " roles or give me a higher role."
+                    )
+                except HTTPException:
+                    embed.title = "Something happened, didn't succeed :/"
+                    embed.colour = Colors.error
 
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
@@ -639,42 +621,41 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_member = get_create_ctx(interaction, session, members.member)
+        async with Session() as session:
+            db_member = await get_create_ctx(interaction, session, members.member)
 
-                success, d_id = remove_from_role(
-                    session, db_member.uuid, role_name=role.name
+            success, d_id = await remove_from_role(
+                session, db_member.uuid, role_name=role.name
+            )
+
+            if not success:
+                embed.title = "This role is not assignable!"
+                embed.colour = Colors.error
+                embed.description = (
+                    "You don't have this role, it doesn't exists or "
+                    "it is not assignable."
                 )
+            else:
+                try:
+                    await interaction.user.remove_roles(
+                        role, reason="Removed through role remove command."
+                    )
 
-                if not success:
-                    embed.title = "This role is not assignable!"
-                    embed.colour = Colors.error
+                    embed.title = (
+                        f"*{interaction.user.name}* has been "
+                        f"removed from *{role.name}*!"
+                    )
+                    embed.colour = Colors.success
+                except Forbidden:
+                    embed.title = "I don't have a permission to do that :("
+                    embed.colour = Colors.unauthorized
                     embed.description = (
-                        "You don't have this role, it doesn't exists or "
-                        "it is not assignable."
+                        "Give me a permission to manage"
+                        " roles or give me a higher role."
                     )
-                else:
-                    try:
-                        await interaction.user.remove_roles(
-                            role, reason="Removed through role remove command."
-                        )
-
-                        embed.title = (
-                            f"*{interaction.user.name}* has been "
-                            f"removed from *{role.name}*!"
-                        )
-                        embed.colour = Colors.success
-                    except Forbidden:
-                        embed.title = "I don't have a permission to do that :("
-                        embed.colour = Colors.unauthorized
-                        embed.description = (
-                            "Give me a permission to manage"
-                            " roles or give me a higher role."
-                        )
-                    except HTTPException:
-                        embed.title = "Something happened, didn't succeed :/"
-                        embed.colour = Colors.error
+                except HTTPException:
+                    embed.title = "Something happened, didn't succeed :/"
+                    embed.colour = Colors.error
 
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed, ephemeral=True)
@@ -693,41 +674,40 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_member = get_create_ctx(ctx, session, members.member)
+        async with Session() as session:
+            db_member = await get_create_ctx(ctx, session, members.member)
+
+            success, d_id = await remove_from_role(
+                session, db_member.uuid, role_name=name
+            )
 
-                success, d_id = remove_from_role(
-                    session, db_member.uuid, role_name=name
+            if not success:
+                embed.title = "This role is not assignable!"
+                embed.colour = Colors.error
+                embed.description = (
+                    "This role doesn't exists or " "it is not assignable."
                 )
+            else:
+                try:
+                    role = ctx.guild.get_role(int(d_id))
+                    await ctx.author.remove_roles(
+                        role, reason="Removed through role remove command."
+                    )
 
-                if not success:
-                    embed.title = "This role is not assignable!"
-                    embed.colour = Colors.error
+                    embed.title = (
+                        f"*{ctx.author.name}* has been " f"removed from *{name}*!"
+                    )
+                    embed.colour = Colors.success
+                except Forbidden:
+                    embed.title = "I don't have a permission to do that :("
+                    embed.colour = Colors.unauthorized
                     embed.description = (
-                        "This role doesn't exists or " "it is not assignable."
+                        "Give me a permission to manage"
+                        " roles or give me a higher role."
                     )
-                else:
-                    try:
-                        role = ctx.guild.get_role(int(d_id))
-                        await ctx.author.remove_roles(
-                            role, reason="Removed through role remove command."
-                        )
-
-                        embed.title = (
-                            f"*{ctx.author.name}* has been " f"removed from *{name}*!"
-                        )
-                        embed.colour = Colors.success
-                    except Forbidden:
-                        embed.title = "I don't have a permission to do that :("
-                        embed.colour = Colors.unauthorized
-                        embed.description = (
-                            "Give me a permission to manage"
-                            " roles or give me a higher role."
-                        )
-                    except HTTPException:
-                        embed.title = "Something happened, didn't succeed :/"
-                        embed.colour = Colors.error
+                except HTTPException:
+                    embed.title = "Something happened, didn't succeed :/"
+                    embed.colour = Colors.error
 
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
@@ -769,63 +749,63 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                d_role = role
-                db_role = role_crud.get_by_discord(session, str(d_role.id))
-
-                if d_role is None:
-                    embed.title = "Role not found."
-                    embed.colour = Colors.error
-                elif db_role is not None:
-                    embed.title = "Role already exists!"
-                    embed.colour = Colors.other
-                else:
-                    role = CreateRole(
-                        **{
-                            "discord_id": str(role.id),
-                            "name": d_role.name,
-                            "description": description,
-                            "server_uuid": get_create_ctx(
-                                interaction, session, server_crud
-                            ).uuid,
-                        }
-                    )
+        async with Session() as session:
+            d_role = role
+            db_role = await role_crud.get_by_discord(session, str(d_role.id))
+
+            if d_role is None:
+                embed.title = "Role not found."
+                embed.colour = Colors.error
+            elif db_role is not None:
+                embed.title = "Role already exists!"
+                embed.colour = Colors.other
+            else:
+                role = CreateRole(
+                    **{
+                        "discord_id": str(role.id),
+                        "name": d_role.name,
+                        "description": description,
+                        "server_uuid": (
+                            await get_create_ctx(interaction, session, server_crud)
+                        ).uuid,
+                    }
+                )
 
-                    db_role = role_crud.create(session, obj_in=role)
+                db_role = await role_crud.create(session, obj_in=role)
 
-                    logger.debug(emoji)
+                logger.debug(emoji)
 
-                    if emoji is not None and not isinstance(
-                            emoji, nextcord.partial_emoji.PartialEmoji
-                    ):
+                if emoji is not None and not isinstance(
+                        emoji, nextcord.partial_emoji.PartialEmoji
+                ):
 
-                        if isinstance(emoji, str):
-                            pattern = re.compile(r"<:(?P<name>\w+):(?P<id>\d+)>")
-                            emoji = pattern.match(emoji).group("name")
-                        elif hasattr(emoji, "name"):
-                            emoji = emoji.name
+                    if isinstance(emoji, str):
+                        pattern = re.compile(r"<:(?P<name>\w+):(?P<id>\d+)>")
+                        emoji = pattern.match(emoji).group("name")
+                    elif hasattr(emoji, "name"):
+                        emoji = emoji.name
 
-                        db_e = CreateRoleEmoji(
-                            **{"identifier": emoji, "role_uuid": db_role.uuid}
-                        )
-                        emoji_crud.create(session, obj_in=db_e)
-                    elif isinstance(emoji, nextcord.partial_emoji.PartialEmoji):
-                        embed.description = (
-                            "**Note**: Role was created"
-                            " without an emoji, because the bot "
-                            "cannot use provided emoji..."
-                        )
-                    else:
-                        embed.description = (
-                            "**Note**: Role was created"
-                            " without an emoji, so it "
-                            "cannot be assigned with "
-                            "reactions!"
-                        )
+                    db_e = CreateRoleEmoji(
+                        **{"identifier": emoji, "role_uuid": db_role.uuid}
+                    )
+                    await emoji_crud.create(session, obj_in=db_e)
+                    await reaction_roles.load(session, interaction.guild.id)
+                elif isinstance(emoji, nextcord.partial_emoji.PartialEmoji):
+                    embed.description = (
+                        "**Note**: Role was created"
+                        " without an emoji, because the bot "
+                        "cannot use provided emoji..."
+                    )
+                else:
+                    embed.description = (
+                        "**Note**: Role was created"
+                        " without an emoji, so it "
+                        "cannot be assigned with "
+                        "reactions!"
+                    )
 
-                    embed.title = f"Role *{db_role.name}* created."
-                    embed.colour = Colors.success
+                embed.title = f"Role *{db_role.name}* created."
+                embed.colour = Colors.success
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed, ephemeral=True)
 
@@ -847,77 +827,77 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                d_role = ctx.guild.get_role(discord_id)
-                db_role = role_crud.get_by_discord(session, discord_id)
-
-                # TODO Add emoji parsing
-
-                if d_role is None:
-                    embed.title = "Role not found."
-                    embed.colour = Colors.error
-                elif db_role is not None:
-                    embed.title = "Role already exists!"
-                    embed.colour = Colors.other
-                else:
-                    role = CreateRole(
-                        **{
-                            "discord_id": discord_id,
-                            "name": d_role.name,
-                            "description": description,
-                            "server_uuid": get_create_ctx(
-                                ctx, session, server_crud
-                            ).uuid,
-                        }
-                    )
+        async with Session() as session:
+            d_role = ctx.guild.get_role(discord_id)
+            db_role = await role_crud.get_by_discord(session, discord_id)
+
+            # TODO Add emoji parsing
+
+            if d_role is None:
+                embed.title = "Role not found."
+                embed.colour = Colors.error
+            elif db_role is not None:
+                embed.title = "Role already exists!"
+                embed.colour = Colors.other
+            else:
+                role = CreateRole(
+                    **{
+                        "discord_id": discord_id,
+                        "name": d_role.name,
+                        "description": description,
+                        "server_uuid": (
+                            await get_create_ctx(ctx, session, server_crud)
+                        ).uuid,
+                    }
+                )
 
-                    db_role = role_crud.create(session, obj_in=role)
+                db_role = await role_crud.create(session, obj_in=role)
 
-                    if emoji is not None:
-                        converter = commands.EmojiConverter()
-                        pconverter = commands.PartialEmojiConverter()
+                if emoji is not None:
+                    converter = commands.EmojiConverter()
+                    pconverter = commands.PartialEmojiConverter()
 
+                    try:
+                        # Convert into actual emoji
+                        e = await converter.convert(ctx, emoji)
+                    except commands.EmojiNotFound:
+                        # Try partial emoji instead
                         try:
-                            # Convert into actual emoji
-                            e = await converter.convert(ctx, emoji)
-                        except commands.EmojiNotFound:
-                            # Try partial emoji instead
-                            try:
-                                e = await pconverter.convert(ctx, emoji)
-                            except commands.PartialEmojiConversionFailure:
-                                # Assume that it is an unicode emoji
-                                e = emoji
-                    else:
-                        e = None
+                            e = await pconverter.convert(ctx, emoji)
+                        except commands.PartialEmojiConversionFailure:
+                            # Assume that it is an unicode emoji
+                            e = emoji
+                else:
+                    e = None
 
-                    if e is not None and not isinstance(
-                            e, nextcord.partial_emoji.PartialEmoji
-                    ):
+                if e is not None and not isinstance(
+                        e, nextcord.partial_emoji.PartialEmoji
+                ):
 
-                        if hasattr(e, "name"):
-                            e = e.name
+                    if hasattr(e, "name"):
+                        e = e.name
 
-                        db_e = CreateRoleEmoji(
-                            **{"identifier": e, "role_uuid": db_role.uuid}
-                        )
-                        emoji_crud.create(session, obj_in=db_e)
-                    elif isinstance(emoji, nextcord.partial_emoji.PartialEmoji):
-                        embed.description = (
-                            "**Note**: Role was created"
-                            " without an emoji, because the bot "
-                            "cannot use provided emoji..."
-                        )
-                    else:
-                        embed.description = (
-                            "**Note**: Role was created"
-                            " without an emoji, so it "
-                            "cannot be assigned with "
-                            "reactions!"
-                        )
+                    db_e = CreateRoleEmoji(
+                        **{"identifier": e, "role_uuid": db_role.uuid}
+                    )
+                    await emoji_crud.create(session, obj_in=db_e)
+                    await reaction_roles.load(session, ctx.guild.id)
+                elif isinstance(emoji, nextcord.partial_emoji.PartialEmoji):
+                    embed.description = (
+                        "**Note**: Role was created"
+                        " without an emoji, because the bot "
+                        "cannot use provided emoji..."
+                    )
+                else:
+                    embed.description = (
+                        "**Note**: Role was created"
+                        " without an emoji, so it "
+                        "cannot be assigned with "
+                        "reactions!"
+                    )
 
-                    embed.title = f"Role *{db_role.name}* created."
-                    embed.colour = Colors.success
+                embed.title = f"Role *{db_role.name}* created."
+                embed.colour = Colors.success
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
 
@@ -953,21 +933,20 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_role = role_crud.get_by_discord(session, str(role))
-                if db_role is None:
-                    embed.title = "Role not found"
-                    embed.colour = Colors.error
-                else:
-                    role_update = UpdateRole(**{"description": description})
-
-                    db_role = role_crud.update(
-                        session, db_obj=db_role, obj_in=role_update
-                    )
+        async with Session() as session:
+            db_role = await role_crud.get_by_discord(session, str(role))
+            if db_role is None:
+                embed.title = "Role not found"
+                embed.colour = Colors.error
+            else:
+                role_update = UpdateRole(**{"description": description})
+
+                db_role = await role_crud.update(
+                    session, db_obj=db_role, obj_in=role_update
+                )
 
-                    embed.title = f"Role *{db_role.name}* updated."
-                    embed.colour = Colors.success
+                embed.title = f"Role *{db_role.name}* updated."
+                embed.colour = Colors.success
 
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed, ephemeral=True)
@@ -989,21 +968,20 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_role = role_crud.get_by_discord(session, discord_id)
-                if db_role is None:
-                    embed.title = "Role not found"
-                    embed.colour = Colors.error
-                else:
-                    role_update = UpdateRole(**{"description": description})
-
-                    db_role = role_crud.update(
-                        session, db_obj=db_role, obj_in=role_update
-                    )
+        async with Session() as session:
+            db_role = await role_crud.get_by_discord(session, discord_id)
+            if db_role is None:
+                embed.title = "Role not found"
+                embed.colour = Colors.error
+            else:
+                role_update = UpdateRole(**{"description": description})
+
+                db_role = await role_crud.update(
+                    session, db_obj=db_role, obj_in=role_update
+                )
 
-                    embed.title = f"Role *{db_role.name}* updated."
-                    embed.colour = Colors.success
+                embed.title = f"Role *{db_role.name}* updated."
+                embed.colour = Colors.success
 
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
@@ -1031,22 +1009,22 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_role = role_crud.get_by_discord(session, str(role.id))
+        async with Session() as session:
+            db_role = await role_crud.get_by_discord(session, str(role.id))
 
-                if db_role is None:
-                    embed.title = "Role not found"
-                    embed.colour = Colors.error
-                else:
-                    db_emoji = emoji_crud.get_by_role(session, db_role.uuid)
+            if db_role is None:
+                embed.title = "Role not found"
+                embed.colour = Colors.error
+            else:
+                db_emoji = await emoji_crud.get_by_role(session, db_role.uuid)
 
-                    if db_emoji is not None:
-                        emoji_crud.remove(session, uuid=db_emoji.uuid)
+                if db_emoji is not None:
+                    await emoji_crud.remove(session, uuid=db_emoji.uuid)
 
-                    db_role = role_crud.remove(session, uuid=db_role.uuid)
-                    embed.title = f"Role *{db_role.name}* removed."
-                    embed.colour = Colors.success
+                db_role = await role_crud.remove(session, uuid=db_role.uuid)
+                await reaction_roles.load(session, interaction.guild.id)
+                embed.title = f"Role *{db_role.name}* removed."
+                embed.colour = Colors.success
 
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed, ephemeral=True)
@@ -1067,22 +1045,22 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                db_role = role_crud.get_by_discord(session, discord_id)
+        async with Session() as session:
+            db_role = await role_crud.get_by_discord(session, discord_id)
 
-                if db_role is None:
-                    embed.title = "Role not found"
-                    embed.colour = Colors.error
-                else:
-                    db_emoji = emoji_crud.get_by_role(session, db_role.uuid)
+            if db_role is None:
+                embed.title = "Role not found"
+                embed.colour = Colors.error
+            else:
+                db_emoji = await emoji_crud.get_by_role(session, db_role.uuid)
 
-                    if db_emoji is not None:
-                        emoji_crud.remove(session, uuid=db_emoji.uuid)
+                if db_emoji is not None:
+                    await emoji_crud.remove(session, uuid=db_emoji.uuid)
 
-                    db_role = role_crud.remove(session, uuid=db_role.uuid)
-                    embed.title = f"Role *{db_role.name}* removed."
-                    embed.colour = Colors.success
+                db_role = await role_crud.remove(session, uuid=db_role.uuid)
+                await reaction_roles.load(session, ctx.guild.id)
+                embed.title = f"Role *{db_role.name}* removed."
+                embed.colour = Colors.success
 
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
@@ -1101,22 +1079,21 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                # Get server interfaces
-                server = get_create_ctx(interaction, session, server_crud)
+        async with Session() as session:
+            # Get server interfaces
+            server = await get_create_ctx(interaction, session, server_crud)
 
-                # Get roles for server
-                roles = role_crud.get_multi_by_server_uuid(session, server.uuid)
+            # Get roles for server
+            roles = await role_crud.get_multi_by_server_uuid(session, server.uuid)
 
-                embed.title = f"Roles for *{interaction.guild.name}*"
-                embed.colour = Colors.success
+            embed.title = f"Roles for *{interaction.guild.name}*"
+            embed.colour = Colors.success
 
-                # List all roles for current server
-                for role in roles:
-                    embed.add_field(
-                        name=role.name, value=role.description, inline=False
-                    )
+            # List all roles for current server
+            for role in roles:
+                embed.add_field(
+                    name=role.name, value=role.description, inline=False
+                )
 
         embed.timestamp = datetime.utcnow()
         await interaction.send(embed=embed)
@@ -1135,22 +1112,21 @@ class Roles(commands.Cog):
             url=settings.URL,
             icon_url=self.__bot.user.avatar.url,
         )
-        async with session_lock:
-            with Session() as session:
-                # Get server interfaces
-                server = get_create_ctx(ctx, session, server_crud)
+        async with Session() as session:
+            # Get server interfaces
+            server = await get_create_ctx(ctx, session, server_crud)
 
-                # Get roles for server
-                roles = role_crud.get_multi_by_server_uuid(session, server.uuid)
+            # Get roles for server
+            roles = await role_crud.get_multi_by_server_uuid(session, server.uuid)
 
-                embed.title = f"Roles for *{ctx.guild.name}*"
-                embed.colour = Colors.success
+            embed.title = f"Roles for *{ctx.guild.name}*"
+            embed.colour = Colors.success
 
-                # List all roles for current server
-                for role in roles:
-                    embed.add_field(
-                        name=role.name, value=role.description, inline=False
-                    )
+            # List all roles for current server
+            for role in roles:
+                embed.add_field(
+                    name=role.name, value=role.description, inline=False
+                )
 
         embed.timestamp = datetime.utcnow()
         await ctx.send(embed=embed)
@@ -1165,76 +1141,74 @@ class Roles(commands.Cog):
         :return:
         """
 
-        async with session_lock:
-            with Session() as session:
-                db_server = get_create_ctx(interaction, session, server_crud)
+        async with Session() as session:
+            db_server = await get_create_ctx(interaction, session, server_crud)
 
-                embed = Embed()
-                embed.title = f"Assignable roles for **{interaction.guild.name}**"
-                embed.description = (
-                    "Use reactions inorder to get "
-                    "roles assigned to you, or use "
-                    "`!role add roleName`"
-                )
+            embed = Embed()
+            embed.title = f"Assignable roles for **{interaction.guild.name}**"
+            embed.description = (
+                "Use reactions inorder to get "
+                "roles assigned to you, or use "
+                "`!role add roleName`"
+            )
 
-                # Send message
-                role_message = await interaction.send(embed=embed)
-                role_message = await role_message.fetch()
+            # Send message
+            role_message = await interaction.send(embed=embed)
+            role_message = await role_message.fetch()
 
-                # Update server object to include role message interfaces
-                server_update = UpdateServer(
-                    **{
-                        "role_message": str(role_message.id),
-                        "role_channel": str(interaction.channel.id),
-                    }
-                )
+            # Update server object to include role message interfaces
+            server_update = UpdateServer(
+                **{
+                    "role_message": str(role_message.id),
+                    "role_channel": str(interaction.channel.id),
+                }
+            )
 
-                server_crud.update(session, db_obj=db_server, obj_in=server_update)
+            await server_crud.update(session, db_obj=db_server, obj_in=server_update)
+            await reaction_roles.load(session, db_server.discord_id)
 
-                ctx = await self.__bot.get_context(role_message)
+            ctx = await self.__bot.get_context(role_message)
 
-                converter = commands.EmojiConverter()
-                pconverter = commands.PartialEmojiConverter()
+            converter = commands.EmojiConverter()
+            pconverter = commands.PartialEmojiConverter()
 
-                # Get all roles on the server
-                roles = role_crud.get_multi_by_server_uuid(
-                    session, get_create_ctx(interaction, session, server_crud).uuid
-                )
+            # Get all roles on the server with their emojis
+            roles = await role_crud.get_multi_with_emojis(
+                session, db_server.uuid
+            )
 
-                # Gather all used emojis for future reactions
-                emojis = []
+            # Gather all used emojis for future reactions
+            emojis = []
 
-                for r in roles:
+            for r, emoji in roles:
 
-                    emoji = emoji_crud.get_by_role(session, r.uuid)
-
-                    if emoji is not None:
+                if emoji is not None:
 
+                    try:
+                        # Convert into actual emoji
+                        e = await converter.convert(ctx, emoji.identifier)
+                    except commands.EmojiNotFound:
+                        # Try partial emoji instead
                         try:
-                            # Convert into actual emoji
-                            e = await converter.convert(ctx, emoji.identifier)
-                        except commands.EmojiNotFound:
-                            # Try partial emoji instead
-                            try:
-                                e = await pconverter.convert(ctx, emoji.identifier)
-                            except commands.PartialEmojiConversionFailure:
-                                # Assume that it is an unicode emoji
-                                e = emoji.identifier
+                            e = await pconverter.convert(ctx, emoji.identifier)
+                        except commands.PartialEmojiConversionFailure:
+                            # Assume that it is an unicode emoji
+                            e = emoji.identifier
 
-                        # Add to message
-                        embed.add_field(
-                            name=f"{str(e)}  ==  {r.name}",
-                            value=r.description,
-                            inline=False,
-                        )
+                    # Add to message
+                    embed.add_field(
+                        name=f"{str(e)}  ==  {r.name}",
+                        value=r.description,
+                        inline=False,
+                    )
 
-                        emojis.append(e)
+                    emojis.append(e)
 
-                await role_message.edit(embed=embed)
+            await role_message.edit(embed=embed)
 
-                # Add reaction to message with all used emojis
-                for e in emojis:
-                    await role_message.add_reaction(e)
+            # Add reaction to message with all used emojis
+            for e in emojis:
+                await role_message.add_reaction(e)
 
     @role.command(pass_context=True, no_pm=True, hidden=True)
     @commands.has_permissions(administrator=True)
@@ -1245,68 +1219,66 @@ class Roles(commands.Cog):
         :param ctx: Context
         :return:
         """
-        async with session_lock:
-            with Session() as session:
-                db_server = get_create_ctx(ctx, session, server_crud)
-
-                embed = Embed()
-                embed.title = f"Assignable roles for **{ctx.guild.name}**"
-                embed.description = (
-                    "Use reactions inorder to get "
-                    "roles assigned to you, or use "
-                    "`!role add roleName`"
-                )
+        async with Session() as session:
+            db_server = await get_create_ctx(ctx, session, server_crud)
 
-                converter = commands.EmojiConverter()
-                pconverter = commands.PartialEmojiConverter()
+            embed = Embed()
+            embed.title = f"Assignable roles for **{ctx.guild.name}**"
+            embed.description = (
+                "Use reactions inorder to get "
+                "roles assigned to you, or use "
+                "`!role add roleName`"
+            )
 
-                # Get all roles on the server
-                roles = role_crud.get_multi_by_server_uuid(
-                    session, get_create_ctx(ctx, session, server_crud).uuid
-                )
+            converter = commands.EmojiConverter()
+            pconverter = commands.PartialEmojiConverter()
 
-                # Gather all used emojis for future reactions
-                emojis = []
+            # Get all roles on the server with their emojis
+            roles = await role_crud.get_multi_with_emojis(
+                session, db_server.uuid
+            )
 
-                for r in roles:
+            # Gather all used emojis for future reactions
+            emojis = []
 
-                    emoji = emoji_crud.get_by_role(session, r.uuid)
+            for r, emoji in roles:
 
-                    if emoji is not None:
+                if emoji is not None:
 
+                    try:
+                        # Convert into actual emoji
+                        e = await converter.convert(ctx, emoji.identifier)
+                    except commands.EmojiNotFound:
+                        # Try partial emoji instead
                         try:
-                            # Convert into actual emoji
-                            e = await converter.convert(ctx, emoji.identifier)
-                        except commands.EmojiNotFound:
-                            # Try partial emoji instead
-                            try:
-                                e = await pconverter.convert(ctx, emoji.identifier)
-                            except commands.PartialEmojiConversionFailure:
-                                # Assume that it is an unicode emoji
-                                e = emoji.identifier
+                            e = await pconverter.convert(ctx, emoji.identifier)
+                        except commands.PartialEmojiConversionFailure:
+                            # Assume that it is an unicode emoji
+                            e = emoji.identifier
 
-                        # Add to message
-                        embed.add_field(
-                            name=f"{str(e)}  ==  {r.name}",
-                            value=r.description,
-                            inline=False,
-                        )
+                    # Add to message
+                    embed.add_field(
+                        name=f"{str(e)}  ==  {r.name}",
+                        value=r.description,
+                        inline=False,
+                    )
 
-                        emojis.append(e)
+                    emojis.append(e)
 
-                # Send message
-                role_message = await ctx.send(embed=embed)
+            # Send message
+            role_message = await ctx.send(embed=embed)
 
-                # Add reaction to message with all used emojis
-                for e in emojis:
-                    await role_message.add_reaction(e)
+            # Add reaction to message with all used emojis
+            for e in emojis:
+                await role_message.add_reaction(e)
 
-                # Update server object to include role message interfaces
-                server_update = UpdateServer(
-                    **{
-                        "role_message": str(role_message.id),
-                        "role_channel": str(ctx.channel.id),
-                    }
-                )
+            # Update server object to include role message interfaces
+            server_update = UpdateServer(
+                **{
+                    "role_message": str(role_message.id),
+                    "role_channel": str(ctx.channel.id),
+                }
+            )
 
-                server_crud.update(session, db_obj=db_server, obj_in=server_update)
+            await server_crud.update(session, db_obj=db_server, obj_in=server_update)
+            await reaction_roles.load(session, db_server.discord_id)
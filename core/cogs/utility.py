@@ -5,8 +5,10 @@ import datetime
 import json
 import asyncio
 import math
-from core.database import Session, session_lock
+from core.database import Session, unit_of_work
+from core.database.changes import publish_member_changes
 from core.config import settings, logger
+from core.metrics import timed
 from core.database.crud.servers import server as crud_server
 from core.database.crud.players import player as crud_player
 from core.database.crud.members import member as crud_member
@@ -17,6 +19,8 @@ from core.database.schemas.members import CreateMember
 from core.database.schemas.levels import CreateLevel
 from core.database.schemas.commands import CreateCommand, UpdateCommand
 from core.database.utils import get_create, get_create_ctx
+from core.experience import ExperienceAccumulator
+from core.leaderboard import leaderboards
 from core.utils import (
     progress_bar,
     level_exp,
@@ -34,242 +38,131 @@ class Utility(commands.Cog):
     def __init__(self, bot, admins):
         self.__bot = bot
         self.__admins = admins
+        self.__experience = ExperienceAccumulator()
 
         # Start
         self.weekly_top5.start()
         self.online_experience.start()
+        self.flush_experience.start()
 
     @commands.Cog.listener()
     async def on_server_join(self, server):
-        async with session_lock:
-            with Session() as session:
-                get_create(
-                    session,
-                    crud_server,
-                    obj_in=CreateServer(
-                        **{
-                            "discord_id": str(server.id),
-                            "name": server.name,
-                            "server_exp": 0,
-                            "channel": None,
-                        }
-                    ),
-                )
+        async with Session() as session:
+            await get_create(
+                session,
+                crud_server,
+                obj_in=CreateServer(
+                    **{
+                        "discord_id": str(server.id),
+                        "name": server.name,
+                        "server_exp": 0,
+                        "channel": None,
+                    }
+                ),
+            )
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
-        async with session_lock:
-            with Session() as session:
-                db_player = get_create(
-                    session,
-                    crud_player,
-                    obj_in=CreatePlayer(
-                        **{"discord_id": member.id, "name": member.name, "hidden": True}
-                    ),
-                )
-                db_server = get_create(
-                    session,
-                    crud_server,
-                    obj_in=CreateServer(
-                        **{
-                            "discord_id": str(member.guild.id),
-                            "name": member.guild.name,
-                            "server_exp": 0,
-                            "channel": None,
-                        }
-                    ),
-                )
-                get_create(
-                    session,
-                    crud_member,
-                    obj_in=CreateMember(
-                        **{
-                            "exp": 0,
-                            "player_uuid": db_player.uuid,
-                            "server_uuid": db_server.uuid,
-                            "level_uuid": None,
-                        }
-                    ),
-                )
+        async with Session() as session:
+            db_player = await get_create(
+                session,
+                crud_player,
+                obj_in=CreatePlayer(
+                    **{"discord_id": member.id, "name": member.name, "hidden": True}
+                ),
+            )
+            db_server = await get_create(
+                session,
+                crud_server,
+                obj_in=CreateServer(
+                    **{
+                        "discord_id": str(member.guild.id),
+                        "name": member.guild.name,
+                        "server_exp": 0,
+                        "channel": None,
+                    }
+                ),
+            )
+            await get_create(
+                session,
+                crud_member,
+                obj_in=CreateMember(
+                    **{
+                        "exp": 0,
+                        "player_uuid": db_player.uuid,
+                        "server_uuid": db_server.uuid,
+                        "level_uuid": None,
+                    }
+                ),
+            )
 
     @commands.Cog.listener()
+    @timed("on_message")
     async def on_message(self, message):
-        if message.author.id != self.__bot.user.id and not message.author.bot:
-            async with session_lock:
-                with Session() as session:
-                    db_server = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(message.guild.id),
-                                "name": message.guild.name,
-                                "server_exp": 0,
-                                "channel": None,
-                            }
-                        ),
-                    )
-                    db_player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(message.author.id),
-                                "name": message.author.name,
-                                "hidden": True,
-                            }
-                        ),
-                    )
+        if (
+            message.author.id != self.__bot.user.id
+            and not message.author.bot
+            and message.guild is not None
+        ):
+            self.__experience.add(message.author, 25, "sending messages")
 
-                    db_member = get_create(
-                        session,
-                        crud_member,
-                        obj_in=CreateMember(
-                            **{
-                                "exp": 0,
-                                "player_uuid": db_player.uuid,
-                                "server_uuid": db_server.uuid,
-                                "level_uuid": None,
-                            }
-                        ),
-                    )
+    @commands.Cog.listener()
+    async def on_reaction_add(self, reaction, user):
+        if not user.bot and reaction.message.guild is not None:
+            self.__experience.add(user, 10, "reacting")
 
-                    if db_member.level is not None:
-                        level_value = db_member.level.value + 1
-                    else:
-                        level_value = 1
+    @tasks.loop(seconds=settings.EXPERIENCE_FLUSH_INTERVAL)
+    async def flush_experience(self):
+        await self.__bot.wait_until_ready()
 
-                    next_level = get_create(
-                        session,
-                        crud_level,
-                        obj_in=CreateLevel(
-                            **{"value": level_value, "exp": level_exp(level_value)}
-                        ),
-                    )
+        try:
+            level_ups = await self.__experience.flush()
+        except Exception as e:
+            # Grants are kept and retried on the next iteration
+            logger.exception(e)
+            return
 
-                    if db_member.exp + 25 < next_level.exp:
-                        crud_member.update(
-                            session,
-                            db_obj=db_member,
-                            obj_in={"exp": db_member.exp + 25},
-                        )
-                    else:
-                        db_member = crud_member.update(
-                            session,
-                            db_obj=db_member,
-                            obj_in={
-                                "exp": (db_member.exp + 25 - next_level.exp),
-                                "level_uuid": next_level.uuid,
-                            },
-                        )
-                        if db_member.server.channel is not None:
-                            embed = nextcord.Embed()
-                            embed.set_author(
-                                name=self.__bot.user.name,
-                                url=settings.URL,
-                                icon_url=self.__bot.user.avatar.url,
-                            )
-                            embed.title = f"**{db_member.player.name}** " f"leveled up!"
-                            embed.description = (
-                                f"**{db_member.player.name}"
-                                f"** leveled up to level "
-                                f"**{db_member.level.value}"
-                                f"** by sending messages!"
-                            )
-                            embed.colour = 9942302
-
-                            await self.__bot.get_channel(
-                                int(db_member.server.channel)
-                            ).send(embed=embed)
+        for level_up in level_ups:
+            if level_up.channel is None:
+                continue
 
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        if not user.bot:
-            async with session_lock:
-                with Session() as session:
-                    db_server = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(user.guild.id),
-                                "name": user.guild.name,
-                                "server_exp": 0,
-                                "channel": None,
-                            }
-                        ),
-                    )
-                    db_player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(user.id),
-                                "name": user.name,
-                                "hidden": True,
-                            }
-                        ),
-                    )
-                    db_member = get_create(
-                        session,
-                        crud_member,
-                        obj_in=CreateMember(
-                            **{
-                                "exp": 0,
-                                "player_uuid": db_player.uuid,
-                                "server_uuid": db_server.uuid,
-                                "level_uuid": None,
-                            }
-                        ),
-                    )
+            embed = nextcord.Embed()
+            embed.set_author(
+                name=self.__bot.user.name,
+                url=settings.URL,
+                icon_url=self.__bot.user.avatar.url,
+            )
+            embed.title = f"**{level_up.name}** leveled up!"
+            embed.description = (
+                f"**{level_up.name}** leveled up to level "
+                f"**{level_up.level}** by {level_up.reason}!"
+            )
+            embed.colour = 9942302
 
-                    if db_member.level is not None:
-                        level_value = db_member.level.value + 1
-                    else:
-                        level_value = 1
+            channel = self.__bot.get_channel(int(level_up.channel))
+            if channel is not None:
+                await channel.send(embed=embed)
 
-                    next_level = get_create(
-                        session,
-                        crud_level,
-                        obj_in=CreateLevel(
-                            **{"value": level_value, "exp": level_exp(level_value)}
-                        ),
-                    )
+    async def shutdown(self):
+        """
+        Write pending experience before the bot closes
+        :return:
+        """
+        # Let a running flush finish; the final flush waits for it
+        self.flush_experience.stop()
+        await self.__experience.flush()
 
-                    if db_member.exp + 10 < next_level.exp:
-                        crud_member.update(
-                            session,
-                            db_obj=db_member,
-                            obj_in={"exp": db_member.exp + 10},
-                        )
-                    else:
-                        db_member = crud_member.update(
-                            session,
-                            db_obj=db_member,
-                            obj_in={
-                                "exp": (db_member.exp + 10 - next_level.exp),
-                                "level_uuid": next_level.uuid,
-                            },
-                        )
-                        if db_member.server.channel is not None:
-                            embed = nextcord.Embed()
-                            embed.set_author(
-                                name=self.__bot.user.name,
-                                url=settings.URL,
-                                icon_url=self.__bot.user.avatar.url,
-                            )
-                            embed.title = f"**{db_member.player.name}** " f"leveled up!"
-                            embed.description = (
-                                f"**{db_member.player.name}"
-                                f"** leveled up to level "
-                                f"**{db_member.level.value}"
-                                f"** by reacting!"
-                            )
-                            embed.colour = 9942302
-
-                            await self.__bot.get_channel(
-                                int(db_member.server.channel)
-                            ).send(embed=embed)
+    @staticmethod
+    async def __leaderboard(session, server_uuid):
+        """
+        Get leaderboard of server, building leaderboards if not done yet
+        :param session: Database session
+        :param server_uuid: uuid of server
+        :return: Leaderboard
+        """
+        if not leaderboards.loaded:
+            await leaderboards.rebuild(session)
+        return leaderboards.get(server_uuid)
 
     @tasks.loop(hours=168)
     async def weekly_top5(self):
@@ -279,191 +172,158 @@ class Utility(commands.Cog):
 
         delta = next_sat - now
         await asyncio.sleep(delta.total_seconds())
-        async with session_lock:
-            with Session() as session:
-                for server in self.__bot.guilds:
-                    server_obj = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(server.id),
-                                "name": server.name,
-                                "server_exp": 0,
-                                "channel": None,
-                            }
-                        ),
-                    )
-
-                    if server_obj.channel is None:
-                        continue
+        async with Session() as session:
+            for server in self.__bot.guilds:
+                server_obj = await get_create(
+                    session,
+                    crud_server,
+                    obj_in=CreateServer(
+                        **{
+                            "discord_id": str(server.id),
+                            "name": server.name,
+                            "server_exp": 0,
+                            "channel": None,
+                        }
+                    ),
+                )
 
-                    top_5 = crud_member.get_top(session, server_obj.uuid, 5)
+                if server_obj.channel is None:
+                    continue
 
-                    embed = nextcord.Embed()
-                    embed.title = f"Weekly TOP 5 on **{server_obj.name}**"
-                    embed.description = (
-                        f"More data can be found "
-                        f"[here]({settings.URL}servers/"
-                        f"{server_obj.uuid})"
-                    )
-                    embed.url = f"{settings.URL}servers/{server_obj.uuid}/top5"
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                    embed.colour = 8161513
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
-                    )
+                top_5 = (await self.__leaderboard(session, server_obj.uuid)).top(5)
 
-                    for member in top_5:
-                        embed.add_field(
-                            name=f"**{member.player.name}**",
-                            value=f"- LVL: **{member.level.value}** "
-                            f"- EXP: **{member.exp}**",
-                            inline=False,
-                        )
+                embed = nextcord.Embed()
+                embed.title = f"Weekly TOP 5 on **{server_obj.name}**"
+                embed.description = (
+                    f"More data can be found "
+                    f"[here]({settings.URL}servers/"
+                    f"{server_obj.uuid})"
+                )
+                embed.url = f"{settings.URL}servers/{server_obj.uuid}/top5"
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                embed.colour = 8161513
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
 
-                    await self.__bot.get_channel(int(server_obj.channel)).send(
-                        embed=embed
+                for entry in top_5:
+                    embed.add_field(
+                        name=f"**{entry.name}**",
+                        value=f"- LVL: **{entry.level}** "
+                        f"- EXP: **{entry.exp}**",
+                        inline=False,
                     )
 
+                await self.__bot.get_channel(int(server_obj.channel)).send(
+                    embed=embed
+                )
+
     @tasks.loop(minutes=1)
+    @timed("online_experience")
     async def online_experience(self):
         await self.__bot.wait_until_ready()
-        async with session_lock:
-            with Session() as session:
-                leveled_up = {}
-                for member in filter(gets_exp, self.__bot.get_all_members()):
-                    player_obj = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(member.id),
-                                "name": member.name,
-                                "hidden": True,
-                            }
-                        ),
-                    )
 
-                    server_obj = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(member.guild.id),
-                                "name": member.guild.name,
-                                "server_exp": 0,
-                                "channel": None,
-                            }
-                        ),
-                    )
+        base_exp = 5
+        special_multi = 1
 
-                    member_obj = get_create(
-                        session,
-                        crud_member,
-                        obj_in=CreateMember(
-                            **{
-                                "exp": 0,
-                                "player_uuid": player_obj.uuid,
-                                "server_uuid": server_obj.uuid,
-                                "level_uuid": None,
-                            }
-                        ),
-                    )
+        now = datetime.datetime.now(datetime.timezone.utc)
 
-                    base_exp = 5
-                    special_multi = 1
+        # Weekend double voice experience
+        # Between Friday 15:00 -> Sunday 23:59 (UTC)
+        if now.weekday() > 4 or (now.weekday() == 4 and now.hour > 15):
+            special_multi = 2
 
-                    now = datetime.datetime.now(datetime.timezone.utc)
+        servers = {}
+        players = {}
+        deltas = []
+        for member in filter(gets_exp, self.__bot.get_all_members()):
+            exp = math.ceil(
+                special_multi * (len(member.voice.channel.members) / 4 * base_exp)
+            )
 
-                    # Weekend double voice experience
-                    # Between Friday 15:00 -> Sunday 23:59 (UTC)
-                    if now.weekday() > 4 or (now.weekday() == 4 and now.hour > 15):
-                        special_multi = 2
+            server_id = str(member.guild.id)
+            player_id = str(member.id)
 
-                    exp = math.ceil(
-                        special_multi
-                        * (len(member.voice.channel.members) / 4 * base_exp)
-                    )
+            _, server_exp = servers.get(server_id, (None, 0))
+            servers[server_id] = (member.guild.name, server_exp + exp)
+            players[player_id] = member.name
+            deltas.append((server_id, player_id, exp))
 
-                    if member_obj.level is not None:
-                        next_level = crud_level.get_by_value(
-                            session, member_obj.level.value + 1
-                        )
-                    else:
-                        next_level = crud_level.get_by_value(session, 1)
+        if not deltas:
+            return
 
-                    if next_level is None and member_obj.level is not None:
-                        member_dict = {
-                            "exp": level_exp(member_obj.level.value + 1),
-                            "value": member_obj.level.value + 1,
-                        }
+        try:
+            async with Session() as session:
+                # Make sure that the next level exists for everyone
+                highest = await crud_member.get_highest_level_value(session)
+                next_value = highest + 1
+                if (
+                    crud_level.table.highest < next_value
+                    and (await crud_level.load_table(session)).highest < next_value
+                ):
+                    await crud_level.generate_many(session, next_value)
 
-                        next_level = crud_level.create(CreateMember(**member_dict))
+                await crud_server.add_exp_many(session, servers)
+                await crud_player.create_many_missing(session, players)
+                await crud_member.create_many_missing(
+                    session,
+                    [(server_id, player_id) for server_id, player_id, _ in deltas],
+                )
+                updated = await crud_member.add_exp_and_level_many(session, deltas)
+                await publish_member_changes(session, [
+                    (server_uuid, uuid, level_value, exp)
+                    for uuid, server_uuid, _, _, level_value, exp, _ in updated
+                ])
+                await session.commit()
+        except Exception as e:
+            # Experience of this minute is lost, the loop keeps running
+            logger.exception(e)
+            return
 
-                    if member_obj.exp + exp < next_level.exp:
-                        crud_member.update(
-                            session,
-                            db_obj=member_obj,
-                            obj_in={"exp": member_obj.exp + exp},
-                        )
-                    else:
-                        member_obj = crud_member.update(
-                            session,
-                            db_obj=member_obj,
-                            obj_in={
-                                "exp": member_obj.exp + exp - next_level.exp,
-                                "level_uuid": next_level.uuid,
-                            },
-                        )
-                        if server_obj.channel is not None:
-                            if server_obj.channel in leveled_up:
-                                leveled_up[server_obj.channel].append(member_obj)
-                            else:
-                                leveled_up[server_obj.channel] = [member_obj]
-                    crud_server.update(
-                        session,
-                        db_obj=server_obj,
-                        obj_in={
-                            "name": member.guild.name,
-                            "server_exp": server_obj.server_exp + exp,
-                        },
-                    )
+        leveled_up = {}
+        for row in updated:
+            uuid, server_uuid, name, channel, level_value, exp, leveled = row
+            leaderboards.update(server_uuid, uuid, name, level_value, exp)
 
-                for channel in leveled_up:
-                    embed = nextcord.Embed()
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
-                    )
-                    if len(leveled_up) > 1:
-                        embed.title = f"{len(leveled_up)} players leveled up!"
-                        embed.description = (
-                            f"{len(leveled_up)} players "
-                            f"leveled up by being active on "
-                            f"a voice channel."
-                        )
-                    else:
-                        embed.title = f"1 player leveled up!"
-                        embed.description = (
-                            f"1 player leveled up by being "
-                            f"active on a voice channel."
-                        )
+            if leveled and channel is not None:
+                leveled_up.setdefault(channel, []).append((name, level_value))
 
-                    embed.colour = 9442302
-                    for member in leveled_up[channel]:
-                        embed.add_field(
-                            name=member.player.name,
-                            value=f"Leveled up to " f"**Level {member.level.value}**",
-                            inline=False,
-                        )
+        for channel in leveled_up:
+            count = len(leveled_up[channel])
 
-                    await self.__bot.get_channel(int(channel)).send(embed=embed)
+            embed = nextcord.Embed()
+            embed.set_author(
+                name=self.__bot.user.name,
+                url=settings.URL,
+                icon_url=self.__bot.user.avatar.url,
+            )
+            if count > 1:
+                embed.title = f"{count} players leveled up!"
+                embed.description = (
+                    f"{count} players "
+                    f"leveled up by being active on "
+                    f"a voice channel."
+                )
+            else:
+                embed.title = f"1 player leveled up!"
+                embed.description = (
+                    f"1 player leveled up by being "
+                    f"active on a voice channel."
+                )
 
-                logger.debug("Experience calculated.")
+            embed.colour = 9442302
+            for name, level_value in leveled_up[channel]:
+                embed.add_field(
+                    name=name,
+                    value=f"Leveled up to " f"**Level {level_value}**",
+                    inline=False,
+                )
+
+            await self.__bot.get_channel(int(channel)).send(embed=embed)
+
+        logger.debug("Experience calculated.")
 
     @commands.command(pass_context=True, hidden=True, no_pm=True)
     @commands.has_permissions(administrator=True)
@@ -475,9 +335,8 @@ class Utility(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                levels = crud_level.generate_many(session, up_to)
+        async with Session() as session:
+            levels = await crud_level.generate_many(session, up_to)
 
         embed.title = "Levels generated."
         embed.description = f"Levels generated up to {len(levels)}!"
@@ -515,120 +374,119 @@ class Utility(commands.Cog):
             return
 
         for member in data:
-            async with session_lock:
-                with Session() as session:
-                    player_discord_id = member["player"]["discord_id"]
-                    server_discord_id = member["server"]["discord_id"]
-                    exp = int(member["exp"])
-                    player = self.__bot.get_user(player_discord_id)
-                    server = self.__bot.get_guild(server_discord_id)
-
-                    db_player = crud_player.get_by_discord(session, player_discord_id)
-
-                    if db_player is None:
-                        if player is None and "name" in member["player"]:
-                            name = member["player"]["name"]
-                        elif player is None and "name" not in member["player"]:
-                            name = "UNKNOWN"
-                        else:
-                            name = player.name
-                        db_player = crud_player.create(
-                            session,
-                            obj_in=CreatePlayer(
-                                **{
-                                    "discord_id": str(player_discord_id),
-                                    "name": name,
-                                    "hidden": "hidden" in member["player"]
-                                    and member["player"]["hidden"] == 1,
-                                }
-                            ),
-                        )
-                    else:
-                        hidden = (
-                            "hidden" in member["player"]
-                            and member["player"]["hidden"] == 1
-                        )
-                        if hidden != db_player.hidden:
-                            db_player = crud_player.update(
-                                session, db_obj=db_player, obj_in={"hidden": hidden}
-                            )
-
-                    db_server = crud_server.get_by_discord(session, server_discord_id)
-                    if db_server is None:
-                        if server is None and "name" in member["server"]:
-                            name = member["server"]["name"]
-                        elif server is None and "name" not in member["server"]:
-                            name = "UNKNOWN"
-                        else:
-                            name = server.name
-
-                        db_server = crud_server.create(
-                            session,
-                            obj_in=CreateServer(
-                                **{
-                                    "discord_id": str(server_discord_id),
-                                    "name": name,
-                                    "server_exp": 0,
-                                    "channel": member["server"].get("channel"),
-                                }
-                            ),
-                        )
+            async with Session() as session:
+                player_discord_id = member["player"]["discord_id"]
+                server_discord_id = member["server"]["discord_id"]
+                exp = int(member["exp"])
+                player = self.__bot.get_user(player_discord_id)
+                server = self.__bot.get_guild(server_discord_id)
+
+                db_player = await crud_player.get_by_discord(session, player_discord_id)
+
+                if db_player is None:
+                    if player is None and "name" in member["player"]:
+                        name = member["player"]["name"]
+                    elif player is None and "name" not in member["player"]:
+                        name = "UNKNOWN"
                     else:
-                        if db_server.channel != member["server"].get("channel"):
-                            db_server = crud_server.update(
-                                session,
-                                db_obj=db_server,
-                                obj_in={"channel": member["server"].get("channel")},
-                            )
-
-                    db_member = crud_member.get_by_ids(
-                        session, db_player.uuid, db_server.uuid
+                        name = player.name
+                    db_player = await crud_player.create(
+                        session,
+                        obj_in=CreatePlayer(
+                            **{
+                                "discord_id": str(player_discord_id),
+                                "name": name,
+                                "hidden": "hidden" in member["player"]
+                                and member["player"]["hidden"] == 1,
+                            }
+                        ),
+                    )
+                else:
+                    hidden = (
+                        "hidden" in member["player"]
+                        and member["player"]["hidden"] == 1
                     )
+                    if hidden != db_player.hidden:
+                        db_player = await crud_player.update(
+                            session, db_obj=db_player, obj_in={"hidden": hidden}
+                        )
 
-                    if "level_id" in member:
-                        logger.debug(member["level_id"])
-                    if "level_id" in member and member["level_id"] != "NULL":
-                        current_level = int(member["level_id"])
+                db_server = await crud_server.get_by_discord(session, server_discord_id)
+                if db_server is None:
+                    if server is None and "name" in member["server"]:
+                        name = member["server"]["name"]
+                    elif server is None and "name" not in member["server"]:
+                        name = "UNKNOWN"
                     else:
-                        current_level = 0
+                        name = server.name
 
-                    current_level, exp = process_exp(current_level, exp)
-                    if current_level > 0:
-                        db_level = get_create(
+                    db_server = await crud_server.create(
+                        session,
+                        obj_in=CreateServer(
+                            **{
+                                "discord_id": str(server_discord_id),
+                                "name": name,
+                                "server_exp": 0,
+                                "channel": member["server"].get("channel"),
+                            }
+                        ),
+                    )
+                else:
+                    if db_server.channel != member["server"].get("channel"):
+                        db_server = await crud_server.update(
                             session,
-                            crud_level,
-                            obj_in=CreateLevel(
-                                **{
-                                    "value": current_level,
-                                    "exp": level_exp(current_level),
-                                    "title": None,
-                                }
-                            ),
+                            db_obj=db_server,
+                            obj_in={"channel": member["server"].get("channel")},
                         )
-                        level_uuid = db_level.uuid
-                    else:
-                        level_uuid = None
 
-                    if db_member is None:
-                        db_member = crud_member.create(
-                            session,
-                            obj_in=CreateMember(
-                                **{
-                                    "exp": exp,
-                                    "player_uuid": db_player.uuid,
-                                    "server_uuid": db_server.uuid,
-                                    "level_uuid": level_uuid,
-                                }
-                            ),
-                        )
-                    else:
-                        db_member = crud_member.update(
-                            session,
-                            db_obj=db_member,
-                            obj_in={"level_uuid": level_uuid, "exp": exp},
-                        )
+                db_member = await crud_member.get_by_ids(
+                    session, db_player.uuid, db_server.uuid
+                )
+
+                if "level_id" in member:
+                    logger.debug(member["level_id"])
+                if "level_id" in member and member["level_id"] != "NULL":
+                    current_level = int(member["level_id"])
+                else:
+                    current_level = 0
 
-                    updated.append(db_member)
+                current_level, exp = process_exp(current_level, exp)
+                if current_level > 0:
+                    db_level = await get_create(
+                        session,
+                        crud_level,
+                        obj_in=CreateLevel(
+                            **{
+                                "value": current_level,
+                                "exp": level_exp(current_level),
+                                "title": None,
+                            }
+                        ),
+                    )
+                    level_uuid = db_level.uuid
+                else:
+                    level_uuid = None
+
+                if db_member is None:
+                    db_member = await crud_member.create(
+                        session,
+                        obj_in=CreateMember(
+                            **{
+                                "exp": exp,
+                                "player_uuid": db_player.uuid,
+                                "server_uuid": db_server.uuid,
+                                "level_uuid": level_uuid,
+                            }
+                        ),
+                    )
+                else:
+                    db_member = await crud_member.update(
+                        session,
+                        db_obj=db_member,
+                        obj_in={"level_uuid": level_uuid, "exp": exp},
+                    )
+
+                updated.append(db_member)
         embed.colour = Colors.other
         embed.title = "Members loaded from dump file."
         embed.description = f"Members updated: {len(updated)}"
@@ -645,69 +503,68 @@ class Utility(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                if (
-                    channel_id is not None
-                    and self.__bot.get_channel(int(channel_id)) is not None
-                ):
+        async with Session() as session:
+            if (
+                channel_id is not None
+                and self.__bot.get_channel(int(channel_id)) is not None
+            ):
 
-                    server = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(ctx.guild.id),
-                                "name": ctx.guild.name,
-                                "server_exp": 0,
-                                "channel": channel_id,
-                            }
-                        ),
+                server = await get_create(
+                    session,
+                    crud_server,
+                    obj_in=CreateServer(
+                        **{
+                            "discord_id": str(ctx.guild.id),
+                            "name": ctx.guild.name,
+                            "server_exp": 0,
+                            "channel": channel_id,
+                        }
+                    ),
+                )
+                if server.channel != channel_id:
+                    await crud_server.update(
+                        session, db_obj=server, obj_in={"channel": channel_id}
                     )
-                    if server.channel != channel_id:
-                        crud_server.update(
-                            session, db_obj=server, obj_in={"channel": channel_id}
-                        )
-                    embed.title = "Success"
-                    embed.colour = Colors.success
-                    embed.description = "Channel successfully registered."
-                elif (
-                    channel_id is not None
-                    and self.__bot.get_channel(int(channel_id)) is None
-                ):
-                    embed.colour = Colors.error
-                    embed.title = "Error"
-                    embed.description = "Channel not found."
+                embed.title = "Success"
+                embed.colour = Colors.success
+                embed.description = "Channel successfully registered."
+            elif (
+                channel_id is not None
+                and self.__bot.get_channel(int(channel_id)) is None
+            ):
+                embed.colour = Colors.error
+                embed.title = "Error"
+                embed.description = "Channel not found."
+            else:
+                server = await get_create(
+                    session,
+                    crud_server,
+                    obj_in=CreateServer(
+                        **{
+                            "discord_id": str(ctx.guild.id),
+                            "name": ctx.guild.name,
+                            "server_exp": 0,
+                            "channel": None,
+                        }
+                    ),
+                )
+
+                embed.title = f"Levels channel for **{server.name}**"
+                if server.channel is not None:
+                    embed.colour = Colors.other
+                    channel = self.__bot.get_channel(int(server.channel))
+                    embed.add_field(name="Levels channel:", value=channel.name)
+                    embed.add_field(name="Creation date:", value=channel.created_at)
                 else:
-                    server = get_create(
-                        session,
-                        crud_server,
-                        obj_in=CreateServer(
-                            **{
-                                "discord_id": str(ctx.guild.id),
-                                "name": ctx.guild.name,
-                                "server_exp": 0,
-                                "channel": None,
-                            }
-                        ),
+                    embed.colour = Colors.unauthorized
+                    embed.add_field(
+                        name="Levels channel:", value="No channel for levels."
+                    )
+                    embed.add_field(
+                        name="Setup",
+                        value="Create a new text channel and run this "
+                        "command with the channel_id as an argument.",
                     )
-
-                    embed.title = f"Levels channel for **{server.name}**"
-                    if server.channel is not None:
-                        embed.colour = Colors.other
-                        channel = self.__bot.get_channel(int(server.channel))
-                        embed.add_field(name="Levels channel:", value=channel.name)
-                        embed.add_field(name="Creation date:", value=channel.created_at)
-                    else:
-                        embed.colour = Colors.unauthorized
-                        embed.add_field(
-                            name="Levels channel:", value="No channel for levels."
-                        )
-                        embed.add_field(
-                            name="Setup",
-                            value="Create a new text channel and run this "
-                            "command with the channel_id as an argument.",
-                        )
 
         embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
         await ctx.send(embed=embed)
@@ -730,36 +587,91 @@ class Utility(commands.Cog):
                 user = nextcord.utils.get(
                     self.__bot.get_all_members(), id=ctx.message.author.id
                 )
-            else:
-                user = nextcord.utils.get(self.__bot.get_all_members(), id=user_id)
+            else:
+                user = nextcord.utils.get(self.__bot.get_all_members(), id=user_id)
+
+            embed.colour = Colors.other
+            embed.title = "User information"
+            embed.description = "User information from Discord API."
+            embed.add_field(name="Name", value="**{0.name}**".format(user))
+            embed.add_field(
+                name="Discriminator", value="**{0.discriminator}**".format(user)
+            )
+            embed.add_field(name="Bot", value="**{0.bot}**".format(user))
+
+        embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+        await ctx.send(embed=embed)
+
+    @nextcord.slash_command(
+        "top", "Check top N (5) most active users on this server", dm_permission=False
+    )
+    async def top(self, ctx, value: int = 5):
+        """
+        Get Top N users with the most experience on this server.
+        :param ctx:
+        :param value: N
+        :return:
+        """
+        async with ctx.channel.typing():
+            async with Session() as session:
+
+                server = await get_create(
+                    session,
+                    crud_server,
+                    obj_in=CreateServer(
+                        **{
+                            "discord_id": str(ctx.guild.id),
+                            "name": ctx.guild.name,
+                            "server_exp": 0,
+                            "channel": None,
+                        }
+                    ),
+                )
+                top_5 = (await self.__leaderboard(session, server.uuid)).top(value)
 
-            embed.colour = Colors.other
-            embed.title = "User information"
-            embed.description = "User information from Discord API."
-            embed.add_field(name="Name", value="**{0.name}**".format(user))
-            embed.add_field(
-                name="Discriminator", value="**{0.discriminator}**".format(user)
-            )
-            embed.add_field(name="Bot", value="**{0.bot}**".format(user))
+                embed = nextcord.Embed()
+                embed.title = f"**TOP {value}** on **{server.name}**"
+                embed.description = (
+                    f"More data can be found [here]"
+                    f"({settings.URL}servers/{server.uuid})."
+                )
+                embed.url = f"{settings.URL}servers/{server.uuid}/top5"
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                embed.colour = Colors.other
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
 
-        embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-        await ctx.send(embed=embed)
+                for entry in top_5:
+                    embed.add_field(
+                        name=f"**{entry.name}**",
+                        value=f"- LVL: **{entry.level}** "
+                        f"- EXP: **{entry.exp}**",
+                        inline=False,
+                    )
+
+            await ctx.send(embed=embed)
 
     @nextcord.slash_command(
-        "top", "Check top N (5) most active users on this server", dm_permission=False
+        "rank", "See your rank on current server.", dm_permission=False
     )
-    async def top(self, ctx, value: int = 5):
+    async def rank(self, ctx: nextcord.Interaction):
         """
-        Get Top N users with the most experience on this server.
+        Get your current experience status on this server.
         :param ctx:
-        :param value: N
         :return:
         """
         async with ctx.channel.typing():
-            async with session_lock:
-                with Session() as session:
+            message = ""
+            if ctx.guild is None:
+                message = "Please use this command on a server."
+                embed = None
+            else:
+                async with Session() as session, unit_of_work(session):
 
-                    server = get_create(
+                    db_server = await get_create(
                         session,
                         crud_server,
                         obj_in=CreateServer(
@@ -771,150 +683,84 @@ class Utility(commands.Cog):
                             }
                         ),
                     )
-                    top_5 = crud_member.get_top(session, server.uuid, value)
+
+                    db_player = await get_create(
+                        session,
+                        crud_player,
+                        obj_in=CreatePlayer(
+                            **{
+                                "discord_id": str(ctx.user.id),
+                                "name": ctx.user.name,
+                                "hidden": True,
+                            }
+                        ),
+                    )
+
+                    member = await get_create(
+                        session,
+                        crud_member,
+                        obj_in=CreateMember(
+                            **{
+                                "exp": 0,
+                                "player_uuid": db_player.uuid,
+                                "server_uuid": db_server.uuid,
+                                "level_uuid": None,
+                            }
+                        ),
+                    )
+
+                    if member.level is not None:
+                        next_value = member.level.value + 1
+                    else:
+                        next_value = 1
+                    needed_exp = crud_level.table.exp(next_value)
+
+                    leaderboard = await self.__leaderboard(session, db_server.uuid)
+                    position = leaderboard.position(member.uuid)
 
                     embed = nextcord.Embed()
-                    embed.title = f"**TOP {value}** on **{server.name}**"
+                    embed.title = (
+                        f"**{member.player.name}** on " f"**{member.server.name}**"
+                    )
                     embed.description = (
                         f"More data can be found [here]"
-                        f"({settings.URL}servers/{server.uuid})."
+                        f"({settings.URL}players/"
+                        f"{member.player.uuid})."
+                    )
+                    embed.url = (
+                        f"{settings.URL}players/"
+                        f"{member.player.uuid}/server/"
+                        f"{member.server.uuid}"
                     )
-                    embed.url = f"{settings.URL}servers/{server.uuid}/top5"
                     embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                    embed.colour = Colors.other
+                    embed.colour = Colors.success
                     embed.set_author(
                         name=self.__bot.user.name,
                         url=settings.URL,
                         icon_url=self.__bot.user.avatar.url,
                     )
-
-                    for member in top_5:
-                        if member.level is not None:
-                            level_value = member.level.value
-                        else:
-                            level_value = 0
-
+                    if position is not None:
                         embed.add_field(
-                            name=f"**{member.player.name}**",
-                            value=f"- LVL: **{level_value}** "
-                            f"- EXP: **{member.exp}**",
-                            inline=False,
-                        )
-
-            await ctx.send(embed=embed)
-
-    @nextcord.slash_command(
-        "rank", "See your rank on current server.", dm_permission=False
-    )
-    async def rank(self, ctx: nextcord.Interaction):
-        """
-        Get your current experience status on this server.
-        :param ctx:
-        :return:
-        """
-        async with ctx.channel.typing():
-            message = ""
-            if ctx.guild is None:
-                message = "Please use this command on a server."
-                embed = None
-            else:
-                async with session_lock:
-                    with Session() as session:
-
-                        db_server = get_create(
-                            session,
-                            crud_server,
-                            obj_in=CreateServer(
-                                **{
-                                    "discord_id": str(ctx.guild.id),
-                                    "name": ctx.guild.name,
-                                    "server_exp": 0,
-                                    "channel": None,
-                                }
-                            ),
-                        )
-
-                        db_player = get_create(
-                            session,
-                            crud_player,
-                            obj_in=CreatePlayer(
-                                **{
-                                    "discord_id": str(ctx.user.id),
-                                    "name": ctx.user.name,
-                                    "hidden": True,
-                                }
-                            ),
-                        )
-
-                        member = get_create(
-                            session,
-                            crud_member,
-                            obj_in=CreateMember(
-                                **{
-                                    "exp": 0,
-                                    "player_uuid": db_player.uuid,
-                                    "server_uuid": db_server.uuid,
-                                    "level_uuid": None,
-                                }
-                            ),
-                        )
-
-                        if member.level is not None:
-                            next_level = get_create(
-                                session,
-                                crud_level,
-                                obj_in=CreateLevel(
-                                    **{
-                                        "value": member.level.value + 1,
-                                        "exp": level_exp(member.level.value + 1),
-                                    }
-                                ),
-                            )
-                        else:
-                            next_level = get_create(
-                                session,
-                                crud_level,
-                                obj_in=CreateLevel(**{"value": 1, "exp": level_exp(1)}),
-                            )
-
-                        embed = nextcord.Embed()
-                        embed.title = (
-                            f"**{member.player.name}** on " f"**{member.server.name}**"
-                        )
-                        embed.description = (
-                            f"More data can be found [here]"
-                            f"({settings.URL}players/"
-                            f"{member.player.uuid})."
-                        )
-                        embed.url = (
-                            f"{settings.URL}players/"
-                            f"{member.player.uuid}/server/"
-                            f"{member.server.uuid}"
-                        )
-                        embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                        embed.colour = Colors.success
-                        embed.set_author(
-                            name=self.__bot.user.name,
-                            url=settings.URL,
-                            icon_url=self.__bot.user.avatar.url,
-                        )
-                        # embed.add_field(
-                        #     name=f"**Level {next_level.value - 1}**",
-                        #     value=f"Experience: **{member.exp}/{next_level.exp}**",
-                        #     inline=False)
-
-                        # embed.add_field(
-                        #     name=f"Progress: "
-                        #          f"**{member.exp / next_level.exp * 100:.2f}%**",
-                        #     value=f"`{progress_bar(member.exp, next_level.exp)}`")
-
-                        embed.set_image(
-                            url=f"{settings.URL}api/level-image"
-                            f"?name={ctx.user.name}"
-                            f"&level={next_level.value - 1}"
-                            f"&current_exp={member.exp}"
-                            f"&needed_exp={next_level.exp}"
+                            name="Rank",
+                            value=f"**#{position}** of {len(leaderboard)}",
                         )
+                    # embed.add_field(
+                    #     name=f"**Level {next_value - 1}**",
+                    #     value=f"Experience: **{member.exp}/{needed_exp}**",
+                    #     inline=False)
+
+                    # embed.add_field(
+                    #     name=f"Progress: "
+                    #          f"**{member.exp / needed_exp * 100:.2f}%**",
+                    #     value=f"`{progress_bar(member.exp, needed_exp)}`")
+
+                    embed.set_image(
+                        url=f"{settings.URL}api/level-image"
+                        f"?name={ctx.user.name}"
+                        f"&level={next_value - 1}"
+                        f"&current_exp={member.exp}"
+                        f"&needed_exp={needed_exp}"
+                    )
 
             if message != "" and embed is None:
                 await ctx.send(message)
@@ -931,41 +777,40 @@ class Utility(commands.Cog):
         :return:
         """
         async with ctx.channel.typing():
-            async with session_lock:
-                with Session() as session:
-                    player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(ctx.user.id),
-                                "name": ctx.user.name,
-                                "hidden": False,
-                            }
-                        ),
-                    )
-
-                    if player.hidden:
-                        crud_player.update(
-                            session, db_obj=player, obj_in={"hidden": False}
-                        )
+            async with Session() as session, unit_of_work(session):
+                player = await get_create(
+                    session,
+                    crud_player,
+                    obj_in=CreatePlayer(
+                        **{
+                            "discord_id": str(ctx.user.id),
+                            "name": ctx.user.name,
+                            "hidden": False,
+                        }
+                    ),
+                )
 
-                    embed = nextcord.Embed()
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
+                if player.hidden:
+                    await crud_player.update(
+                        session, db_obj=player, obj_in={"hidden": False}
                     )
 
-                    embed.title = "Success!"
-                    embed.description = (
-                        f"You have successfully registered "
-                        f"yourself. You are now shown on "
-                        f"[{settings.URL}]({settings.URL})"
-                    )
-                    embed.colour = Colors.success
+                embed = nextcord.Embed()
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
+
+                embed.title = "Success!"
+                embed.description = (
+                    f"You have successfully registered "
+                    f"yourself. You are now shown on "
+                    f"[{settings.URL}]({settings.URL})"
+                )
+                embed.colour = Colors.success
 
-                    await ctx.send(embed=embed)
+                await ctx.send(embed=embed)
 
     @register.subcommand("steamid", "Register SteamID")
     async def register_steamid(
@@ -978,35 +823,34 @@ class Utility(commands.Cog):
         ),
     ):
         async with ctx.channel.typing():
-            async with session_lock:
-                with Session() as session:
-                    player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(ctx.user.id),
-                                "name": ctx.user.name,
-                                "hidden": False,
-                            }
-                        ),
-                    )
+            async with Session() as session:
+                player = await get_create(
+                    session,
+                    crud_player,
+                    obj_in=CreatePlayer(
+                        **{
+                            "discord_id": str(ctx.user.id),
+                            "name": ctx.user.name,
+                            "hidden": False,
+                        }
+                    ),
+                )
 
-                    crud_player.update(
-                        session, db_obj=player, obj_in={"steam_id": steamid}
-                    )
+                await crud_player.update(
+                    session, db_obj=player, obj_in={"steam_id": steamid}
+                )
 
-                    embed = nextcord.Embed()
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
-                    )
-                    embed.title = "Success!"
-                    embed.description = "Your SteamID has been updated!"
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                    embed.colour = Colors.success
-                    await ctx.send(embed=embed, ephemeral=True)
+                embed = nextcord.Embed()
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
+                embed.title = "Success!"
+                embed.description = "Your SteamID has been updated!"
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                embed.colour = Colors.success
+                await ctx.send(embed=embed, ephemeral=True)
 
     @nextcord.slash_command("unregister", "Hides you from bot.hellshade.fi.")
     async def unregister(self, ctx: nextcord.Interaction):
@@ -1016,73 +860,71 @@ class Utility(commands.Cog):
         :return:
         """
         async with ctx.channel.typing():
-            async with session_lock:
-                with Session() as session:
-                    player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(ctx.user.id),
-                                "name": ctx.user.name,
-                                "hidden": False,
-                            }
-                        ),
-                    )
-
-                    if not player.hidden:
-                        crud_player.update(
-                            session, db_obj=player, obj_in={"hidden": True}
-                        )
+            async with Session() as session:
+                player = await get_create(
+                    session,
+                    crud_player,
+                    obj_in=CreatePlayer(
+                        **{
+                            "discord_id": str(ctx.user.id),
+                            "name": ctx.user.name,
+                            "hidden": False,
+                        }
+                    ),
+                )
 
-                    embed = nextcord.Embed()
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
+                if not player.hidden:
+                    await crud_player.update(
+                        session, db_obj=player, obj_in={"hidden": True}
                     )
 
-                    embed.title = "Success!"
-                    embed.description = (
-                        f"yourself. You are now hidden from "
-                        f"[{settings.URL}]({settings.URL})"
-                    )
-                    embed.colour = Colors.success
+                embed = nextcord.Embed()
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
+
+                embed.title = "Success!"
+                embed.description = (
+                    f"yourself. You are now hidden from "
+                    f"[{settings.URL}]({settings.URL})"
+                )
+                embed.colour = Colors.success
 
-                    await ctx.send(embed=embed)
+                await ctx.send(embed=embed)
 
     @unregister.subcommand("steamid", "Remove SteamID")
     async def unregister_steamid(self, ctx: nextcord.Interaction):
         async with ctx.channel.typing():
-            async with session_lock:
-                with Session() as session:
-                    player = get_create(
-                        session,
-                        crud_player,
-                        obj_in=CreatePlayer(
-                            **{
-                                "discord_id": str(ctx.user.id),
-                                "name": ctx.user.name,
-                                "hidden": False,
-                            }
-                        ),
-                    )
+            async with Session() as session:
+                player = await get_create(
+                    session,
+                    crud_player,
+                    obj_in=CreatePlayer(
+                        **{
+                            "discord_id": str(ctx.user.id),
+                            "name": ctx.user.name,
+                            "hidden": False,
+                        }
+                    ),
+                )
 
-                    crud_player.update(
-                        session, db_obj=player, obj_in={"steam_id": None}
-                    )
+                await crud_player.update(
+                    session, db_obj=player, obj_in={"steam_id": None}
+                )
 
-                    embed = nextcord.Embed()
-                    embed.set_author(
-                        name=self.__bot.user.name,
-                        url=settings.URL,
-                        icon_url=self.__bot.user.avatar.url,
-                    )
-                    embed.title = "Success!"
-                    embed.description = "Your SteamID has been removed!"
-                    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
-                    embed.colour = Colors.success
-                    await ctx.send(embed=embed, ephemeral=True)
+                embed = nextcord.Embed()
+                embed.set_author(
+                    name=self.__bot.user.name,
+                    url=settings.URL,
+                    icon_url=self.__bot.user.avatar.url,
+                )
+                embed.title = "Success!"
+                embed.description = "Your SteamID has been removed!"
+                embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+                embed.colour = Colors.success
+                await ctx.send(embed=embed, ephemeral=True)
 
     @commands.group(pass_context=True, no_pm=True, hidden=True)
     @commands.has_permissions(administrator=True)
@@ -1108,34 +950,33 @@ class Utility(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                db_server = get_create_ctx(ctx, session, crud_server)
-                db_command = core.database.crud.commands.command.get_by_server_and_name(
-                    session, db_server.uuid, command
+        async with Session() as session:
+            db_server = await get_create_ctx(ctx, session, crud_server)
+            db_command = await core.database.crud.commands.command.get_by_server_and_name(
+                session, db_server.uuid, command
+            )
+            if db_command is None:
+                db_command = await core.database.crud.commands.command.create(
+                    session,
+                    obj_in=CreateCommand(
+                        **{
+                            "name": command,
+                            "server_uuid": db_server.uuid,
+                            "status": True,
+                        }
+                    ),
                 )
-                if db_command is None:
-                    db_command = core.database.crud.commands.command.create(
-                        session,
-                        obj_in=CreateCommand(
-                            **{
-                                "name": command,
-                                "server_uuid": db_server.uuid,
-                                "status": True,
-                            }
-                        ),
-                    )
-                else:
-                    db_command = core.database.crud.commands.command.update(
-                        session,
-                        db_obj=db_command,
-                        obj_in=UpdateCommand(**{"status": True}),
-                    )
-
-                embed.description = (
-                    f"Command `{db_command.name}` enabled for `{db_server.name}`!"
+            else:
+                db_command = await core.database.crud.commands.command.update(
+                    session,
+                    db_obj=db_command,
+                    obj_in=UpdateCommand(**{"status": True}),
                 )
-                embed.colour = nextcord.Colour.green()
+
+            embed.description = (
+                f"Command `{db_command.name}` enabled for `{db_server.name}`!"
+            )
+            embed.colour = nextcord.Colour.green()
 
         embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
         await ctx.send(embed=embed)
@@ -1150,34 +991,33 @@ class Utility(commands.Cog):
             icon_url=self.__bot.user.avatar.url,
         )
 
-        async with session_lock:
-            with Session() as session:
-                db_server = get_create_ctx(ctx, session, crud_server)
-                db_command = core.database.crud.commands.command.get_by_server_and_name(
-                    session, db_server.uuid, command
+        async with Session() as session:
+            db_server = await get_create_ctx(ctx, session, crud_server)
+            db_command = await core.database.crud.commands.command.get_by_server_and_name(
+                session, db_server.uuid, command
+            )
+            if command is None:
+                db_command = await core.database.crud.commands.command.create(
+                    session,
+                    obj_in=CreateCommand(
+                        **{
+                            "name": command,
+                            "server_uuid": db_server.uuid,
+                            "status": False,
+                        }
+                    ),
                 )
-                if command is None:
-                    db_command = core.database.crud.commands.command.create(
-                        session,
-                        obj_in=CreateCommand(
-                            **{
-                                "name": command,
-                                "server_uuid": db_server.uuid,
-                                "status": False,
-                            }
-                        ),
-                    )
-                else:
-                    db_command = core.database.crud.commands.command.update(
-                        session,
-                        db_obj=db_command,
-                        obj_in=UpdateCommand(**{"status": False}),
-                    )
-
-                embed.description = (
-                    f"Command `{db_command.name}` disabled for `{db_server.name}`!"
+            else:
+                db_command = await core.database.crud.commands.command.update(
+                    session,
+                    db_obj=db_command,
+                    obj_in=UpdateCommand(**{"status": False}),
                 )
-                embed.colour = nextcord.Colour.green()
+
+            embed.description = (
+                f"Command `{db_command.name}` disabled for `{db_server.name}`!"
+            )
+            embed.colour = nextcord.Colour.green()
 
         embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
         await ctx.send(embed=embed)
@@ -13,9 +13,35 @@ class Settings(BaseSettings):
     DATABASE_USER: str = os.environ.get("DB_USER")
     DATABASE_PASSWORD: str = os.environ.get("DB_PASS")
     DATABASE_NAME: str = os.environ.get("DB_NAME")
+    DATABASE_POOL_SIZE: int = os.environ.get("DB_POOL_SIZE", 10)
+    DATABASE_MAX_OVERFLOW: int = os.environ.get("DB_MAX_OVERFLOW", 5)
     ADMINS: list[int] = os.environ.get('ADMINS').split(",")
     URL: AnyHttpUrl = os.environ.get('SITE_URL', 'https://bot.hellshade.fi')
     STEAM_API_KEY: str = os.environ.get('STEAM_API_KEY', "")
+    STEAM_API_URL: str = os.environ.get(
+        'STEAM_API_URL', "https://api.steampowered.com"
+    )
+    STEAM_NEWS_COUNT: int = os.environ.get('STEAM_NEWS_COUNT', 20)
+    STEAM_NEWS_CONCURRENCY: int = os.environ.get('STEAM_NEWS_CONCURRENCY', 4)
+    DOTA_SYNC_CONCURRENCY: int = os.environ.get('DOTA_SYNC_CONCURRENCY', 8)
+    DOTA_PERSONA_TTL: float = os.environ.get('DOTA_PERSONA_TTL', 3600)
+    DOTA_PERSONA_CACHE_SIZE: int = os.environ.get(
+        'DOTA_PERSONA_CACHE_SIZE', 2000
+    )
+    HTTP_TIMEOUT: float = os.environ.get('HTTP_TIMEOUT', 30)
+    HTTP_POOL_SIZE: int = os.environ.get('HTTP_POOL_SIZE', 100)
+    HTTP_POOL_SIZE_PER_HOST: int = os.environ.get('HTTP_POOL_SIZE_PER_HOST', 8)
+    HTTP_RETRIES: int = os.environ.get('HTTP_RETRIES', 3)
+    HTTP_BACKOFF: float = os.environ.get('HTTP_BACKOFF', 0.5)
+    CACHE_DIR: str = os.environ.get('CACHE_DIR', "/files/cache")
+    IDENTITY_CACHE_SIZE: int = os.environ.get('IDENTITY_CACHE_SIZE', 50000)
+    IDENTITY_CACHE_TTL: float = os.environ.get('IDENTITY_CACHE_TTL', 3600)
+    LEVEL_TABLE_SIZE: int = os.environ.get('LEVEL_TABLE_SIZE', 500)
+    EXPERIENCE_FLUSH_INTERVAL: float = os.environ.get('EXP_FLUSH_INTERVAL', 5)
+    ROLE_QUEUE_DELAY: float = os.environ.get('ROLE_QUEUE_DELAY', 1)
+    METRICS_PORT: int | None = os.environ.get('METRICS_PORT')
+    METRICS_LAG_INTERVAL: float = os.environ.get('METRICS_LAG_INTERVAL', 1)
+    LIVE_CHANNEL: str = os.environ.get('LIVE_CHANNEL', "member_changes")
 
     class Config:
         case_sensitive = True
@@ -1,18 +1,66 @@
-import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
 
 from core.config import settings
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, \
+    AsyncSession
+from sqlalchemy.orm import declarative_base
 
 
-DATABASE_URL = f"postgresql://{settings.DATABASE_USER}:" \
+DATABASE_URL = f"postgresql+asyncpg://{settings.DATABASE_USER}:" \
                f"{settings.DATABASE_PASSWORD}@{settings.DATABASE_SERVER}/" \
                f"{settings.DATABASE_NAME}"
 
-engine = create_engine(DATABASE_URL)
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_pre_ping=True
+)
 
-Session = sessionmaker(autoflush=False, bind=engine)
+# Objects must stay usable after commit, since attribute refresh cannot
+# happen implicitly on an async session.
+Session = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
 
 Base = declarative_base()
 
-session_lock = asyncio.Lock()
+# Session of the unit of work that is currently open, if any
+_unit_of_work: ContextVar[Optional[AsyncSession]] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+@asynccontextmanager
+async def unit_of_work(db: AsyncSession) -> AsyncIterator[AsyncSession]:
+    """
+    Stage all writes made with the session and commit them once on exit,
+    or roll them back on error
+    :param db: Database Session
+    :return: Database Session
+    """
+    token = _unit_of_work.set(db)
+    try:
+        yield db
+        await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+    finally:
+        _unit_of_work.reset(token)
+
+
+async def save(db: AsyncSession, commit: bool = True):
+    """
+    Commit the session, or only flush it when inside a unit of work or
+    when commit is not wanted
+    :param db: Database Session
+    :param commit: Commit if not inside a unit of work
+    :return:
+    """
+    if commit and _unit_of_work.get() is not db:
+        await db.commit()
+    else:
+        await db.flush()
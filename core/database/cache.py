@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Hashable, Optional
+
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class IdentityCache(Generic[KeyType, ValueType]):
+    """Bounded LRU cache with a time-to-live for identity mappings"""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.__data: OrderedDict[KeyType, tuple[float, ValueType]] = \
+            OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    def __repr__(self) -> str:
+        return f"IdentityCache({self.name=}, size={len(self)}, " \
+               f"{self.hits=}, {self.misses=})"
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        """
+        Get a cached value
+        :param key: Key of the value
+        :return: Value or None if missing or expired
+        """
+        item = self.__data.get(key)
+
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires, value = item
+        if expires < time.monotonic():
+            del self.__data[key]
+            self.misses += 1
+            return None
+
+        self.__data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: KeyType, value: ValueType):
+        """
+        Cache a value, evicting the least recently used one if full
+        :param key: Key of the value
+        :param value: Value
+        :return:
+        """
+        self.__data[key] = (time.monotonic() + self.ttl, value)
+        self.__data.move_to_end(key)
+
+        while len(self.__data) > self.maxsize:
+            self.__data.popitem(last=False)
+
+    def invalidate(self, key: KeyType):
+        """
+        Remove a value from the cache
+        :param key: Key of the value
+        :return:
+        """
+        self.__data.pop(key, None)
+
+    def clear(self):
+        self.__data.clear()
@@ -0,0 +1,49 @@
+import json
+from uuid import UUID
+
+from sqlalchemy import Text, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+
+# NOTIFY payloads must stay below 8000 bytes
+MEMBERS_PER_NOTIFICATION = 50
+
+
+async def publish_member_changes(
+        db: AsyncSession, changes: list[tuple[UUID, UUID, int, int]]
+):
+    """
+    Publish experience and level changes of members to the change feed,
+    with a single statement. Notifications are delivered when the
+    transaction commits.
+    :param db: Database session
+    :param changes: Tuples of (server uuid, member uuid, level, exp)
+    :return:
+    """
+    by_server = {}
+    for server_uuid, uuid, level, exp in changes:
+        by_server.setdefault(str(server_uuid), []).append(
+            {"uuid": str(uuid), "level": level, "exp": exp}
+        )
+
+    payloads = [
+        json.dumps({
+            "server": server_uuid,
+            "members": members[i:i + MEMBERS_PER_NOTIFICATION]
+        })
+        for server_uuid, members in by_server.items()
+        for i in range(0, len(members), MEMBERS_PER_NOTIFICATION)
+    ]
+    if not payloads:
+        return
+
+    # SELECT pg_notify(channel, payload) FROM unnest(payloads) AS payload
+    rows = func.unnest(
+        bindparam("payloads", payloads, type_=ARRAY(Text))
+    ).table_valued("payload")
+    await db.execute(
+        select(func.pg_notify(settings.LIVE_CHANNEL, rows.c.payload)).
+        select_from(rows)
+    )
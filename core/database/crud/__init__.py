@@ -1,10 +1,14 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from pydantic import BaseModel
 from sqlalchemy.future import select
 from sqlalchemy import delete, update, func
-from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import save
 from core.database.models import Base
-from typing import Generic, TypeVar, Type, Any, Optional, List, Union, Dict
+from core.database.cache import IdentityCache
+from typing import Generic, TypeVar, Type, Any, Optional, List, Union, Dict, \
+    Hashable
 
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -15,11 +19,40 @@ UpdateType = TypeVar("UpdateType", bound=BaseModel)
 class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
     """CRUD Base for models and schemas"""
 
-    def __init__(self, model: Type[ModelType]):
+    # Unique columns used by get_create, and columns it refreshes on conflict
+    unique_fields: tuple[str, ...] = ()
+    upsert_fields: tuple[str, ...] = ()
+
+    def __init__(
+            self, model: Type[ModelType],
+            identities: Optional[IdentityCache[Hashable, UUID]] = None
+    ):
         self.model = model
+        self.identities = identities
+
+    def identity_key(self, obj: ModelType) -> Optional[Hashable]:
+        """
+        Key that identifies the object in the identity cache
+        :param obj: Object
+        :return: Key or None
+        """
+        return getattr(obj, "discord_id", None)
 
-    def get_count(
-            self, db: Session
+    def remember(self, obj: Optional[ModelType]):
+        """
+        Store uuid of the object in the identity cache if there is one
+        :param obj: Object
+        :return:
+        """
+        if self.identities is None or obj is None:
+            return
+
+        key = self.identity_key(obj)
+        if key is not None:
+            self.identities.set(key, obj.uuid)
+
+    async def get_count(
+            self, db: AsyncSession
     ) -> int:
         """
         Get number of objects
@@ -27,11 +60,11 @@ class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
         :return:
         """
         query = select(func.count(self.model.uuid))
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().one()
 
-    def get(
-            self, db: Session, uuid: UUID
+    async def get(
+            self, db: AsyncSession, uuid: UUID
     ) -> Optional[ModelType]:
         """
         Get an object by uuid
@@ -41,11 +74,27 @@ class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
         """
         query = select(self.model).where(self.model.uuid == uuid)
 
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def get_by_discord(
-            self, db: Session, discord_id: Union[int, str]
+    async def get_multi_by_uuids(
+            self, db: AsyncSession, uuids: List[UUID]
+    ) -> List[ModelType]:
+        """
+        Get many objects by uuid with a single query
+        :param db: Database Session
+        :param uuids: uuids of the objects
+        :return: List of found objects, in no particular order
+        """
+        if not uuids:
+            return []
+
+        query = select(self.model).where(self.model.uuid.in_(set(uuids)))
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    async def get_by_discord(
+            self, db: AsyncSession, discord_id: Union[int, str]
     ) -> Optional[ModelType]:
         """
         Get an object by discord_id
@@ -57,11 +106,40 @@ class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
             discord_id = str(discord_id)
 
         query = select(self.model).where(self.model.discord_id == discord_id)
-        result = db.execute(query)
-        return result.scalars().first()
+        result = await db.execute(query)
+        obj = result.scalars().first()
+        self.remember(obj)
+        return obj
+
+    async def get_uuid_by_discord(
+            self, db: AsyncSession, discord_id: Union[int, str]
+    ) -> Optional[UUID]:
+        """
+        Get uuid of an object by discord_id, from the identity cache if
+        possible
+        :param db: Database Session
+        :param discord_id: Discord ID
+        :return: uuid or None
+        """
+        discord_id = str(discord_id)
+
+        if self.identities is not None:
+            uuid = self.identities.get(discord_id)
+            if uuid is not None:
+                return uuid
 
-    def get_multi(
-            self, db: Session, *, skip: int = 0, limit: int = 100
+        query = select(self.model.uuid).\
+            where(self.model.discord_id == discord_id)
+        result = await db.execute(query)
+        uuid = result.scalars().first()
+
+        if uuid is not None and self.identities is not None:
+            self.identities.set(discord_id, uuid)
+
+        return uuid
+
+    async def get_multi(
+            self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         """
         Get multiple objects
@@ -71,35 +149,101 @@ class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
         :return: List of objects
         """
         query = select(self.model).offset(skip).limit(limit)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
-    def create(
-            self, db: Session, *, obj_in: CreateType
+    async def create(
+            self, db: AsyncSession, *, obj_in: CreateType,
+            commit: bool = True
     ) -> ModelType:
         """
         Create a new object
         :param db: Database Session
         :param obj_in: Pydantic type of the object to create
+        :param commit: Commit if not inside a unit of work
         :return: Object
         """
         db_obj = self.model(**obj_in.dict())
 
+        # Every default is set by the client, so the flush fills in the
+        # object and no refresh is needed
         db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        await save(db, commit)
+        self.remember(db_obj)
 
         return db_obj
 
-    def update(
-            self, db: Session, *, db_obj: ModelType,
-            obj_in: Union[UpdateType, Dict[str, Any]]
+    async def get_create(
+            self, db: AsyncSession, *, obj_in: CreateType,
+            commit: bool = True
+    ) -> ModelType:
+        """
+        Get an object by its unique fields or create it, with a single
+        statement
+        :param db: Database Session
+        :param obj_in: Pydantic type of the object to create
+        :param commit: Commit if not inside a unit of work
+        :return: Object
+        """
+        return (await self.get_create_many(
+            db, objs_in=[obj_in], commit=commit
+        ))[0]
+
+    async def get_create_many(
+            self, db: AsyncSession, *, objs_in: List[CreateType],
+            commit: bool = True
+    ) -> List[ModelType]:
+        """
+        Get many objects by their unique fields or create them, with a single
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING
+        :param db: Database Session
+        :param objs_in: Pydantic types of the objects to create
+        :param commit: Commit if not inside a unit of work
+        :return: List of objects, in no particular order
+        """
+        if not self.unique_fields:
+            raise NotImplementedError(
+                f"{self.model.__name__} has no unique fields to upsert on"
+            )
+
+        # A statement can't insert and update the same row twice
+        rows = {}
+        for obj_in in objs_in:
+            row = {"uuid": uuid4(), **obj_in.dict()}
+            rows[tuple(row[field] for field in self.unique_fields)] = row
+
+        if not rows:
+            return []
+
+        query = insert(self.model).values(list(rows.values()))
+        query = query.on_conflict_do_update(
+            index_elements=self.unique_fields,
+            set_={
+                field: query.excluded[field]
+                for field in self.upsert_fields or self.unique_fields
+            }
+        ).returning(self.model).execution_options(populate_existing=True)
+
+        result = await db.scalars(query)
+        objs = result.all()
+        await save(db, commit)
+
+        for obj in objs:
+            self.remember(obj)
+
+        return objs
+
+    async def update(
+            self, db: AsyncSession, *, db_obj: ModelType,
+            obj_in: Union[UpdateType, Dict[str, Any]],
+            commit: bool = True
     ) -> ModelType:
         """
         Update interfaces of an object
         :param db: Database Session
         :param db_obj: Object to be updated
         :param obj_in: Update interfaces
+        :param commit: Commit if not inside a unit of work
         :return: Object
         """
 
@@ -108,32 +252,39 @@ class CRUDBase(Generic[ModelType, CreateType, UpdateType]):
         else:
             update_data = obj_in.dict(exclude_unset=True)
 
+        # RETURNING refreshes the object without another SELECT
         query = update(self.model).where(self.model.uuid == db_obj.uuid). \
-            values(**update_data)
-
-        db.execute(query)
-        db.commit()
+            values(**update_data).returning(self.model). \
+            execution_options(
+                synchronize_session=False, populate_existing=True
+            )
 
-        db.refresh(db_obj)
+        result = await db.scalars(query)
+        db_obj = result.one()
+        await save(db, commit)
 
         return db_obj
 
-    def remove(
-            self, db: Session, *, uuid: UUID
+    async def remove(
+            self, db: AsyncSession, *, uuid: UUID, commit: bool = True
     ) -> ModelType:
         """
         Delete object
         :param db: Database Session
         :param uuid: uuid of object
+        :param commit: Commit if not inside a unit of work
         :return: Object
         """
-        query = select(self.model).where(self.model.uuid == uuid)
-        result = db.execute(query)
-        obj = result.scalars().first()
+        query = delete(self.model).where(self.model.uuid == uuid). \
+            returning(self.model). \
+            execution_options(synchronize_session=False)
+        result = await db.scalars(query)
+        obj = result.first()
 
         if obj is not None:
-            del_query = delete(self.model).where(self.model.uuid == uuid)
-            db.execute(del_query)
-            db.commit()
+            await save(db, commit)
+
+            if self.identities is not None:
+                self.identities.invalidate(self.identity_key(obj))
 
         return obj
@@ -2,14 +2,14 @@ from core.database.models.commands import Command
 from core.database.schemas import commands as schemas
 from core.database.crud import CRUDBase, ModelType
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import Optional
 from uuid import UUID
 
 
 class CRUDCommand(CRUDBase[Command, schemas.CreateCommand, schemas.UpdateCommand]):
-    def get_by_server_and_name(self, db: Session, server_uuid: UUID, name: str) -> Optional[ModelType]:
+    async def get_by_server_and_name(self, db: AsyncSession, server_uuid: UUID, name: str) -> Optional[ModelType]:
         """
         Get command by server uuid and command name
         :param db: Database Session
@@ -19,10 +19,10 @@ class CRUDCommand(CRUDBase[Command, schemas.CreateCommand, schemas.UpdateCommand
         """
 
         query = select(self.model).where(self.model.name == name).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def get_enabled_by_name(self, db: Session, name: str) -> list[ModelType]:
+    async def get_enabled_by_name(self, db: AsyncSession, name: str) -> list[ModelType]:
         """
         Get enabled commands by command name
         :param db: Database Session
@@ -31,7 +31,7 @@ class CRUDCommand(CRUDBase[Command, schemas.CreateCommand, schemas.UpdateCommand
         """
 
         query = select(self.model).where(self.model.name == name).where(self.model.status is True)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
 
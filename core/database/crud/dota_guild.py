@@ -1,7 +1,7 @@
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database.models.dota_guild import DotaGuild
 from core.database.schemas import dota_guild as schemas
@@ -9,8 +9,8 @@ from core.database.crud import CRUDBase, ModelType
 
 
 class CRUDDotaGuild(CRUDBase[DotaGuild, schemas.CreateDotaGuild, schemas.UpdateDotaGuild]):
-    def get_multi_by_server_uuid(
-            self, db: Session, server_uuid: UUID
+    async def get_multi_by_server_uuid(
+            self, db: AsyncSession, server_uuid: UUID
     ) -> list[ModelType]:
         """
         Get Dota Guilds by server_uuid
@@ -20,12 +20,12 @@ class CRUDDotaGuild(CRUDBase[DotaGuild, schemas.CreateDotaGuild, schemas.UpdateD
         """
 
         query = select(self.model).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
-    def get_by_guild_id_server_uuid(self, db: Session, guild_id: int, server_uuid: UUID) -> ModelType | None:
+    async def get_by_guild_id_server_uuid(self, db: AsyncSession, guild_id: int, server_uuid: UUID) -> ModelType | None:
         query = select(self.model).where(self.model.guild_id == guild_id).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
 
@@ -1,16 +1,41 @@
 from core.database.models.levels import Level
 from core.database.schemas import levels as schemas
+from core.database import save
 from core.database.crud import CRUDBase, ModelType
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import desc
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.future import select
 from typing import Optional, List
-from core.utils import level_exp
+from uuid import uuid4
+from core.utils import level_table, LevelTable
 
 
 class CRUDLevel(CRUDBase[Level, schemas.CreateLevel, schemas.UpdateLevel]):
-    def get_by_value(
-            self, db: Session, value: int
+    def __init__(self, model, table: LevelTable):
+        super().__init__(model)
+        self.table = table
+
+    async def load_table(self, db: AsyncSession) -> LevelTable:
+        """
+        Load uuids of all levels to the level table
+        :param db: Database Session
+        :return: Level table
+        """
+        result = await db.execute(select(self.model.value, self.model.uuid))
+        self.table = self.table.with_uuids(dict(result.all()))
+        return self.table
+
+    async def create(
+            self, db: AsyncSession, *, obj_in: schemas.CreateLevel,
+            commit: bool = True
+    ) -> ModelType:
+        obj = await super().create(db, obj_in=obj_in, commit=commit)
+        self.table = self.table.with_uuids({obj.value: obj.uuid})
+        return obj
+
+    async def get_by_value(
+            self, db: AsyncSession, value: int
     ) -> Optional[ModelType]:
         """
         Get level by value
@@ -19,11 +44,11 @@ class CRUDLevel(CRUDBase[Level, schemas.CreateLevel, schemas.UpdateLevel]):
         :return: Object or None
         """
         query = select(self.model).where(self.model.value == value)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def get_highest(
-            self, db: Session
+    async def get_highest(
+            self, db: AsyncSession
     ) -> Optional[ModelType]:
         """
         Get highest level
@@ -31,40 +56,43 @@ class CRUDLevel(CRUDBase[Level, schemas.CreateLevel, schemas.UpdateLevel]):
         :return: Object or None
         """
         query = select(self.model).order_by(desc(self.model.value))
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def generate_many(
-            self, db: Session, to: int
+    async def generate_many(
+            self, db: AsyncSession, to: int, commit: bool = True
     ) -> List[ModelType]:
         """
-        Generate many levels
+        Generate missing levels up to a value. Levels created at the same
+        time elsewhere are skipped.
         :param db: Database Session
         :param to: Level value to generate
-        :return: List of generated objects
+        :param commit: Commit if not inside a unit of work
+        :return: List of objects created by this call
         """
-        highest = self.get_highest(db)
+        highest = await self.get_highest(db)
+        start_value = 0 if highest is None else highest.value
 
-        if highest is None:
-            start_value = 0
-        else:
-            start_value = highest.value
         levels = []
+        if start_value < to:
+            query = insert(self.model).values([
+                {
+                    "uuid": uuid4(),
+                    "value": i,
+                    "exp": self.table.exp(i),
+                    "title": None
+                }
+                for i in range(start_value + 1, to + 1)
+            ]).on_conflict_do_nothing(index_elements=["value"]).\
+                returning(self.model)
+            levels = (await db.scalars(query)).all()
 
-        for i in range(start_value + 1, to + 1):
-            levels.append(Level(**{
-                "value": i,
-                "exp": level_exp(i),
-                "title": None
-            }))
-        db.add_all(levels)
-        db.flush()
-        db.commit()
+        await save(db, commit)
 
-        for lvl in levels:
-            db.refresh(lvl)
+        # Some of the levels may have been created by someone else
+        await self.load_table(db)
 
         return levels
 
 
-level = CRUDLevel(Level)
+level = CRUDLevel(Level, level_table)
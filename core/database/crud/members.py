@@ -1,36 +1,50 @@
 from core.database.models.members import Member
 from core.database.models.levels import Level
+from core.database.models.players import Player
+from core.database.models.servers import Server
+from core.database.types import GUID
 from core.database.schemas import members as schemas
+from core.config import settings
+from core.database.cache import IdentityCache
 from core.database.crud import CRUDBase, ModelType
 
-from uuid import UUID
-from sqlalchemy.orm import Session
+from uuid import UUID, uuid4
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import update, values, column, tuple_, \
+    Integer, String, Row, and_, case, exists, func, literal
+from typing import Optional, Hashable, Sequence
 
 
 class CRUDMember(CRUDBase[Member, schemas.CreateMember, schemas.UpdateMember]):
-    def get_top(
-            self, db: Session, server_uuid: UUID, value: int
-    ) -> List[ModelType]:
-        """
-        Get top N on server
-        :param db: Database Session
-        :param server_uuid: uuid of server
-        :param value: number of players to fetch
-        :return: List of objects
-        """
+    unique_fields = ("player_uuid", "server_uuid")
 
-        query = select(self.model).join(self.model.level).\
-            where(self.model.server_uuid == server_uuid).\
-            order_by(desc(Level.value), desc(self.model.exp)).\
-            limit(value)
-        result = db.execute(query)
-        return result.scalars().all()
+    def identity_key(self, obj: ModelType) -> Optional[Hashable]:
+        return obj.player_uuid, obj.server_uuid
+
+    async def get_create(
+            self, db: AsyncSession, *, obj_in: schemas.CreateMember,
+            commit: bool = True
+    ) -> ModelType:
+        obj = await super().get_create(db, obj_in=obj_in, commit=commit)
+
+        # RETURNING doesn't load the relationships
+        query = select(self.model).\
+            where(self.model.uuid == obj.uuid).\
+            options(
+                joinedload(self.model.player),
+                joinedload(self.model.server),
+                joinedload(self.model.level)
+            ).\
+            execution_options(populate_existing=True)
+        result = await db.execute(query)
+        return result.scalar_one()
 
-    def get_by_ids(
-            self, db: Session, player_uuid: UUID, server_uuid
+    async def get_by_ids(
+            self, db: AsyncSession, player_uuid: UUID, server_uuid
     ) -> Optional[ModelType]:
         """
         Get member by player_uuid and server_uuid
@@ -42,13 +56,283 @@ class CRUDMember(CRUDBase[Member, schemas.CreateMember, schemas.UpdateMember]):
         query = select(self.model).\
             where(self.model.player_uuid == player_uuid).\
             where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
-        return result.scalars().first()
+        result = await db.execute(query)
+        obj = result.scalars().first()
+        self.remember(obj)
+        return obj
 
-    def get_multi_by_server_uuid(self, db: Session, server_uuid: UUID) -> list[ModelType]:
-        query = select(self.model).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+    async def get_uuid_by_ids(
+            self, db: AsyncSession, player_uuid: UUID, server_uuid: UUID
+    ) -> Optional[UUID]:
+        """
+        Get member uuid by player_uuid and server_uuid, from the identity
+        cache if possible
+        :param db: Database Session
+        :param player_uuid: uuid of player
+        :param server_uuid: uuid of server
+        :return: uuid or None
+        """
+        uuid = self.identities.get((player_uuid, server_uuid))
+        if uuid is not None:
+            return uuid
+
+        query = select(self.model.uuid).\
+            where(self.model.player_uuid == player_uuid).\
+            where(self.model.server_uuid == server_uuid)
+        result = await db.execute(query)
+        uuid = result.scalars().first()
+
+        if uuid is not None:
+            self.identities.set((player_uuid, server_uuid), uuid)
+
+        return uuid
+
+    async def get_multi_by_server_uuid(
+            self, db: AsyncSession, server_uuid: UUID,
+            options: Sequence[ExecutableOption] = ()
+    ) -> list[ModelType]:
+        """
+        Get members of server
+        :param db: Database Session
+        :param server_uuid: uuid of server
+        :param options: Loader options for the relationships used by caller
+        :return: List of objects
+        """
+        query = select(self.model).\
+            where(self.model.server_uuid == server_uuid).\
+            options(*options)
+        result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_steam_ids_by_server_uuids(
+            self, db: AsyncSession, server_uuids: list[UUID]
+    ) -> list[Row]:
+        """
+        Get Steam IDs of members on many servers
+        :param db: Database Session
+        :param server_uuids: uuids of servers
+        :return: Rows of (server uuid, player discord_id, player steam_id)
+                 for members that have a Steam ID
+        """
+        query = select(
+            self.model.server_uuid, Player.discord_id, Player.steam_id
+        ).join(Player, Player.uuid == self.model.player_uuid).\
+            where(self.model.server_uuid.in_(server_uuids)).\
+            where(Player.steam_id.is_not(None))
+        result = await db.execute(query)
+        return result.all()
+
+    async def get_multi_by_discord_ids(
+            self, db: AsyncSession, ids: list[tuple[str, str]]
+    ) -> list[Row]:
+        """
+        Get member uuids by (server discord_id, player discord_id) pairs
+        :param db: Database Session
+        :param ids: Pairs of server and player Discord IDs
+        :return: Rows of (uuid, server uuid, player uuid, server discord_id,
+                 player discord_id)
+        """
+        query = select(
+            self.model.uuid, Server.uuid, Player.uuid, Server.discord_id,
+            Player.discord_id
+        ).join(Server, self.model.server_uuid == Server.uuid).\
+            join(Player, self.model.player_uuid == Player.uuid).\
+            where(tuple_(Server.discord_id, Player.discord_id).in_(ids))
+        result = await db.execute(query)
+        return result.all()
+
+    async def add_exp_many(
+            self, db: AsyncSession, deltas: dict[UUID, int]
+    ) -> list[Row]:
+        """
+        Add experience to many members with a single UPDATE, does not commit
+        :param db: Database Session
+        :param deltas: Experience to add by member uuid
+        :return: Rows of (uuid, server uuid, exp, level value,
+                 server channel) after the update
+        """
+        # Rows are sorted so that concurrent updates lock them in the same
+        # order and can't deadlock
+        data = values(
+            column("uuid", GUID()), column("exp", Integer), name="deltas"
+        ).data(sorted(deltas.items()))
+
+        level_value = select(Level.value).\
+            where(Level.uuid == self.model.level_uuid).scalar_subquery()
+        channel = select(Server.channel).\
+            where(Server.uuid == self.model.server_uuid).scalar_subquery()
+
+        query = update(self.model).\
+            where(self.model.uuid == data.c.uuid).\
+            values(exp=self.model.exp + data.c.exp).\
+            returning(
+                self.model.uuid, self.model.server_uuid, self.model.exp,
+                level_value, channel
+            ).\
+            execution_options(synchronize_session=False)
+        result = await db.execute(query)
+        return result.all()
+
+    async def level_up_many(
+            self, db: AsyncSession, level_ups: list[tuple[UUID, int, UUID]]
+    ) -> None:
+        """
+        Move many members to a new level with a single UPDATE, does not commit
+        :param db: Database Session
+        :param level_ups: Tuples of (member uuid, experience consumed by the
+                          gained levels, new level uuid)
+        :return:
+        """
+        data = values(
+            column("uuid", GUID()), column("exp", Integer),
+            column("level_uuid", GUID()), name="level_ups"
+        ).data(sorted(level_ups))
+
+        query = update(self.model).\
+            where(self.model.uuid == data.c.uuid).\
+            values(
+                exp=self.model.exp - data.c.exp,
+                level_uuid=data.c.level_uuid
+            ).execution_options(synchronize_session=False)
+        await db.execute(query)
+
+    async def create_many_missing(
+            self, db: AsyncSession, ids: list[tuple[str, str]]
+    ) -> None:
+        """
+        Create members for (server discord_id, player discord_id) pairs that
+        have none, server and player must exist, does not commit
+        :param db: Database Session
+        :param ids: Pairs of server and player Discord IDs
+        :return:
+        """
+        data = values(
+            column("uuid", GUID()), column("server_id", String),
+            column("player_id", String), name="new_members"
+        ).data([(uuid4(), server_id, player_id) for server_id, player_id in ids])
+
+        members = self.model.__table__
+        source = select(
+            data.c.uuid, literal(0), Player.uuid, Server.uuid
+        ).select_from(data).\
+            join(Server, Server.discord_id == data.c.server_id).\
+            join(Player, Player.discord_id == data.c.player_id).\
+            where(~exists().where(
+                members.c.player_uuid == Player.uuid,
+                members.c.server_uuid == Server.uuid
+            ))
+
+        query = insert(members).from_select(
+            ["uuid", "exp", "player_uuid", "server_uuid"], source
+        ).on_conflict_do_nothing(
+            index_elements=[members.c.player_uuid, members.c.server_uuid]
+        )
+        await db.execute(query)
+
+    async def get_highest_level_value(self, db: AsyncSession) -> int:
+        """
+        Get the highest level any member has reached
+        :param db: Database Session
+        :return: Level value, 0 if no member has a level
+        """
+        query = select(func.max(Level.value)).\
+            join(self.model, self.model.level_uuid == Level.uuid)
+        result = await db.execute(query)
+        return result.scalar() or 0
+
+    async def add_exp_and_level_many(
+            self, db: AsyncSession, deltas: list[tuple[str, str, int]]
+    ) -> list[Row]:
+        """
+        Add experience to many members and move them to the next level when
+        it is reached, with a single statement, does not commit
+        :param db: Database Session
+        :param deltas: Tuples of (server discord_id, player discord_id,
+                       experience to add)
+        :return: Rows of (member uuid, server uuid, player name, server
+                 channel, level value, exp, leveled up) for all updated
+                 members
+        """
+        data = values(
+            column("server_id", String), column("player_id", String),
+            column("exp", Integer), name="deltas"
+        ).data(sorted(deltas))
+
+        current = aliased(Level)
+        following = aliased(Level)
+        members = self.model.__table__
+
+        source = select(
+            members.c.uuid.label("member_uuid"),
+            data.c.exp,
+            following.uuid.label("next_uuid"),
+            following.exp.label("next_exp")
+        ).select_from(members).\
+            join(Server, Server.uuid == members.c.server_uuid).\
+            join(Player, Player.uuid == members.c.player_uuid).\
+            join(data, and_(
+                data.c.server_id == Server.discord_id,
+                data.c.player_id == Player.discord_id
+            )).\
+            outerjoin(current, current.uuid == members.c.level_uuid).\
+            outerjoin(
+                following,
+                following.value == func.coalesce(current.value, 0) + 1
+            ).\
+            order_by(members.c.uuid).\
+            with_for_update(of=members).subquery("source")
+        # Members are locked in uuid order so that concurrent updates can't
+        # deadlock
+
+        total = members.c.exp + source.c.exp
+        reached = and_(
+            source.c.next_exp.is_not(None), total >= source.c.next_exp
+        )
+
+        updated = update(members).\
+            where(members.c.uuid == source.c.member_uuid).\
+            values(
+                exp=case((reached, total - source.c.next_exp), else_=total),
+                level_uuid=case(
+                    (reached, source.c.next_uuid), else_=members.c.level_uuid
+                )
+            ).\
+            returning(
+                members.c.uuid, members.c.player_uuid, members.c.server_uuid,
+                members.c.level_uuid, members.c.exp, source.c.next_uuid
+            ).cte("updated")
+
+        query = select(
+            updated.c.uuid, updated.c.server_uuid, Player.name,
+            Server.channel, func.coalesce(Level.value, 0), updated.c.exp,
+            updated.c.level_uuid == updated.c.next_uuid
+        ).\
+            select_from(updated).\
+            join(Player, Player.uuid == updated.c.player_uuid).\
+            join(Server, Server.uuid == updated.c.server_uuid).\
+            outerjoin(Level, Level.uuid == updated.c.level_uuid)
+        result = await db.execute(query)
+        return result.all()
+
+    async def get_leaderboard_rows(self, db: AsyncSession) -> list[Row]:
+        """
+        Get standings of all members on all servers
+        :param db: Database Session
+        :return: Rows of (member uuid, server uuid, player name, level value,
+                 exp)
+        """
+        query = select(
+            self.model.uuid, self.model.server_uuid, Player.name,
+            func.coalesce(Level.value, 0), self.model.exp
+        ).\
+            join(Player, Player.uuid == self.model.player_uuid).\
+            outerjoin(Level, Level.uuid == self.model.level_uuid)
+        result = await db.execute(query)
+        return result.all()
+
 
-member = CRUDMember(Member)
+member = CRUDMember(
+    Member, identities=IdentityCache(
+        "members", settings.IDENTITY_CACHE_SIZE, settings.IDENTITY_CACHE_TTL
+    )
+)
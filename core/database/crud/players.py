@@ -1,10 +1,42 @@
+from uuid import uuid4
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from core.database.models.players import Player
 from core.database.schemas import players as schemas
+from core.config import settings
+from core.database.cache import IdentityCache
 from core.database.crud import CRUDBase
 
 
 class CRUDPlayer(CRUDBase[Player, schemas.CreatePlayer, schemas.UpdatePlayer]):
-    pass
+    unique_fields = ("discord_id",)
+    upsert_fields = ("name",)
+
+    async def create_many_missing(
+            self, db: AsyncSession, players: dict[str, str]
+    ) -> None:
+        """
+        Create hidden players for discord_ids that have none, does not commit
+        :param db: Database Session
+        :param players: Player names by discord_id
+        :return:
+        """
+        query = insert(self.model).values([
+            {
+                "uuid": uuid4(),
+                "discord_id": discord_id,
+                "name": name,
+                "hidden": True
+            }
+            for discord_id, name in players.items()
+        ]).on_conflict_do_nothing(index_elements=[self.model.discord_id])
+        await db.execute(query)
 
 
-player: CRUDPlayer = CRUDPlayer(Player)
+player: CRUDPlayer = CRUDPlayer(
+    Player, identities=IdentityCache(
+        "players", settings.IDENTITY_CACHE_SIZE, settings.IDENTITY_CACHE_TTL
+    )
+)
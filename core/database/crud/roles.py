@@ -1,15 +1,17 @@
 from core.database.models.roles import Role, RoleEmoji
+from core.database.models.servers import Server
 from core.database.schemas import roles as schemas
 from core.database.crud import CRUDBase, ModelType
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Optional, List
+from sqlalchemy.engine import Row
+from typing import Optional, List, Tuple
 from uuid import UUID
 
 
 class CRUDRole(CRUDBase[Role, schemas.CreateRole, schemas.UpdateRole]):
-    def get_by_name(self, db: Session, name: str) -> Optional[ModelType]:
+    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[ModelType]:
         """
         Get role by name
         :param db: Database Session
@@ -18,11 +20,11 @@ class CRUDRole(CRUDBase[Role, schemas.CreateRole, schemas.UpdateRole]):
         """
 
         query = select(self.model).where(self.model.name == name)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def get_multi_by_server_uuid(
-            self, db: Session, server_uuid: UUID
+    async def get_multi_by_server_uuid(
+            self, db: AsyncSession, server_uuid: UUID
     ) -> List[ModelType]:
         """
         Get roles by server_uuid
@@ -32,11 +34,11 @@ class CRUDRole(CRUDBase[Role, schemas.CreateRole, schemas.UpdateRole]):
         """
 
         query = select(self.model).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
-    def get_multi_by_query(
-            self, db: Session, server_uuid: UUID, q: str = None
+    async def get_multi_by_query(
+            self, db: AsyncSession, server_uuid: UUID, q: str = None
     ) -> List[ModelType]:
         """
         Get roles by server_uuid
@@ -51,15 +53,55 @@ class CRUDRole(CRUDBase[Role, schemas.CreateRole, schemas.UpdateRole]):
                 .where(self.model.name.ilike(f'%{q}%'))
         else:
             query = select(self.model).where(self.model.server_uuid == server_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_multi_with_emojis(
+            self, db: AsyncSession, server_uuid: UUID
+    ) -> List[Tuple[ModelType, Optional[RoleEmoji]]]:
+        """
+        Get roles of server with their emojis in a single query
+        :param db: Database Session
+        :param server_uuid: uuid of server
+        :return: List of (role, emoji or None) pairs
+        """
+
+        query = select(self.model, RoleEmoji).\
+            outerjoin(RoleEmoji, RoleEmoji.role_uuid == self.model.uuid).\
+            where(self.model.server_uuid == server_uuid)
+        result = await db.execute(query)
+        return result.tuples().all()
+
+    async def get_reaction_rows(
+            self, db: AsyncSession, server_discord_id: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Get roles that can be assigned with reactions on role messages
+        :param db: Database Session
+        :param server_discord_id: Only for this server, all if None
+        :return: Rows of (server discord_id, role message id, emoji
+                 identifier, role uuid, role discord_id)
+        """
+
+        query = select(
+            Server.discord_id, Server.role_message, RoleEmoji.identifier,
+            self.model.uuid, self.model.discord_id
+        ).join(Server, Server.uuid == self.model.server_uuid).\
+            join(RoleEmoji, RoleEmoji.role_uuid == self.model.uuid).\
+            where(Server.role_message.is_not(None))
+
+        if server_discord_id is not None:
+            query = query.where(Server.discord_id == str(server_discord_id))
+
+        result = await db.execute(query)
+        return result.all()
+
 
 class CRUDRoleEmoji(
     CRUDBase[RoleEmoji, schemas.CreateRoleEmoji, schemas.UpdateRoleEmoji]
 ):
-    def get_by_role(
-            self, db: Session, role_uuid: UUID
+    async def get_by_role(
+            self, db: AsyncSession, role_uuid: UUID
     ) -> Optional[ModelType]:
         """
         Get role emoji based on role and server
@@ -70,11 +112,11 @@ class CRUDRoleEmoji(
         """
 
         query = select(self.model).where(self.model.role_uuid == role_uuid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
-    def get_by_identifier(
-            self, db: Session, identifier: str
+    async def get_by_identifier(
+            self, db: AsyncSession, identifier: str
     ) -> Optional[ModelType]:
         """
         Get role emoji based on identifier
@@ -85,7 +127,7 @@ class CRUDRoleEmoji(
         """
 
         query = select(self.model).where(self.model.identifier == identifier)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
 
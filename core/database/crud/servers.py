@@ -1,10 +1,52 @@
+from uuid import uuid4
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from core.database.models.servers import Server
 from core.database.schemas import servers as schemas
+from core.config import settings
+from core.database.cache import IdentityCache
 from core.database.crud import CRUDBase
 
 
 class CRUDServer(CRUDBase[Server, schemas.CreateServer, schemas.UpdateServer]):
-    pass
+    unique_fields = ("discord_id",)
+    upsert_fields = ("name",)
+
+    async def add_exp_many(
+            self, db: AsyncSession, servers: dict[str, tuple[str, int]]
+    ) -> None:
+        """
+        Add experience to many servers and refresh their names, creating
+        missing servers, does not commit
+        :param db: Database Session
+        :param servers: Name and experience to add by server discord_id
+        :return:
+        """
+        query = insert(self.model).values([
+            {
+                "uuid": uuid4(),
+                "discord_id": discord_id,
+                "name": name,
+                "server_exp": exp
+            }
+            for discord_id, (name, exp) in sorted(servers.items())
+        ])
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.discord_id],
+            set_={
+                "name": query.excluded.name,
+                "server_exp": func.coalesce(self.model.server_exp, 0) +
+                query.excluded.server_exp
+            }
+        )
+        await db.execute(query)
 
 
-server = CRUDServer(Server)
+server = CRUDServer(
+    Server, identities=IdentityCache(
+        "servers", settings.IDENTITY_CACHE_SIZE, settings.IDENTITY_CACHE_TTL
+    )
+)
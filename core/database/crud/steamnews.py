@@ -1,13 +1,15 @@
 from core.database.models.steamnews import Subscription, Post
 from core.database.schemas import steamnews as schemas
 from core.database.crud import CRUDBase, ModelType
-from sqlalchemy.orm import Session
+from uuid import uuid4
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from typing import Optional, Union, List
 
 
 class CRUDPost(CRUDBase[Post, schemas.CreatePost, schemas.UpdatePost]):
-    def get_by_gid(self, db: Session, gid: str) -> Optional[ModelType]:
+    async def get_by_gid(self, db: AsyncSession, gid: str) -> Optional[ModelType]:
         """
         Get Post by Steam News GID.
         :param db: Database Session
@@ -15,13 +17,48 @@ class CRUDPost(CRUDBase[Post, schemas.CreatePost, schemas.UpdatePost]):
         :return: Object or None
         """
         query = select(self.model).where(self.model.steam_gid == gid)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().first()
 
+    async def get_existing_gids(
+            self, db: AsyncSession, gids: List[str]
+    ) -> set[str]:
+        """
+        Get which of the Steam News GIDs are already stored
+        :param db: Database Session
+        :param gids: Steam News GIDs
+        :return: Set of stored GIDs
+        """
+        query = select(self.model.steam_gid).\
+            where(self.model.steam_gid.in_(gids))
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
+    async def create_many_missing(
+            self, db: AsyncSession, posts: List[schemas.CreatePost]
+    ) -> set[str]:
+        """
+        Store many posts with a single INSERT, skipping ones already stored,
+        does not commit
+        :param db: Database Session
+        :param posts: Posts to store
+        :return: Set of GIDs that were stored now
+        """
+        if not posts:
+            return set()
+
+        query = insert(self.model).values([
+            {"uuid": uuid4(), **p.dict()} for p in posts
+        ]).on_conflict_do_nothing(
+            index_elements=[self.model.steam_gid]
+        ).returning(self.model.steam_gid)
+        result = await db.execute(query)
+        return set(result.scalars().all())
+
 
 class CRUDSubscription(CRUDBase[Subscription, schemas.CreateSubscription, schemas.UpdateSubscription]):
-    def get_multi_by_channel_id(
-            self, db: Session, channel_id: Union[str, int]
+    async def get_multi_by_channel_id(
+            self, db: AsyncSession, channel_id: Union[str, int]
     ) -> List[ModelType]:
         """
         Get Subscriptions by channel id
@@ -32,7 +69,7 @@ class CRUDSubscription(CRUDBase[Subscription, schemas.CreateSubscription, schema
         if isinstance(channel_id, int):
             channel_id = str(channel_id)
         query = select(self.model).where(self.model.channel_id == channel_id)
-        result = db.execute(query)
+        result = await db.execute(query)
         return result.scalars().all()
 
 
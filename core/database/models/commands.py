@@ -1,12 +1,15 @@
 import uuid
 from core.database.models import Base
 from core.database.types import GUID
-from sqlalchemy import Column, String, ForeignKey, Boolean
+from sqlalchemy import Column, String, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 
 
 class Command(Base):
     __tablename__ = "commands"
+    __table_args__ = (
+        Index('ix_commands_name_server_uuid', 'name', 'server_uuid'),
+    )
     uuid = Column(GUID(), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     server_uuid = Column(GUID(), ForeignKey('servers.uuid'))
@@ -10,7 +10,7 @@ class DotaGuild(Base):
     uuid = Column(GUID(), primary_key=True, default=uuid.uuid4)
     role_discord_id = Column(String, nullable=False)
     name = Column(String, nullable=False)
-    server_uuid = Column(GUID(), ForeignKey('servers.uuid'))
+    server_uuid = Column(GUID(), ForeignKey('servers.uuid'), index=True)
     guild_id = Column(Integer, nullable=False)
     server = relationship(
         'Server', uselist=False
@@ -1,19 +1,26 @@
 import uuid
 from core.database.models import Base
 from core.database.types import GUID
-from sqlalchemy import Column, Integer, ForeignKey, Table
+from sqlalchemy import Column, Integer, ForeignKey, Table, Index, \
+    UniqueConstraint
 from sqlalchemy.orm import relationship
 
 
 member_role_association = Table(
     'member_role_association', Base.metadata,
     Column('role_uuid', GUID(), ForeignKey('roles.uuid')),
-    Column('member_uuid', GUID(), ForeignKey('members.uuid'))
+    Column('member_uuid', GUID(), ForeignKey('members.uuid'), index=True)
 )
 
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        UniqueConstraint(
+            'player_uuid', 'server_uuid',
+            name='uq_members_player_uuid_server_uuid'
+        ),
+    )
     uuid = Column(GUID(), primary_key=True, default=uuid.uuid4)
     exp = Column(Integer, nullable=False, default=0)
     player_uuid = Column(GUID(), ForeignKey('players.uuid'))
@@ -29,3 +36,7 @@ class Member(Base):
         back_populates="members"
     )
 
+
+Index(
+    'ix_members_server_uuid_exp', Member.server_uuid, Member.exp.desc()
+)
@@ -13,7 +13,7 @@ class Role(Base):
     discord_id = Column(String, nullable=False, unique=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    server_uuid = Column(GUID(), ForeignKey('servers.uuid'))
+    server_uuid = Column(GUID(), ForeignKey('servers.uuid'), index=True)
     server = relationship(
         'Server', uselist=False
     )
@@ -26,7 +26,7 @@ class Role(Base):
 class RoleEmoji(Base):
     __tablename__ = "roleemojis"
     uuid = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    identifier = Column(String, nullable=False)
+    identifier = Column(String, nullable=False, index=True)
     role_uuid = Column(GUID(), ForeignKey('roles.uuid'), unique=True)
     role = relationship(
         'Role', uselist=False
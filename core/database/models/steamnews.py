@@ -7,7 +7,7 @@ from sqlalchemy import Column, Text, String, Integer
 class Subscription(Base):
     __tablename__ = "steamposts_subscriptions"
     uuid = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    channel_id = Column(String, nullable=False)
+    channel_id = Column(String, nullable=False, index=True)
     app_id = Column(Integer, nullable=False)
 
 
@@ -1,8 +1,9 @@
 from uuid import UUID
 from nextcord import Interaction
 from nextcord.ext.commands import Context
-from core.database import Session
-from typing import Optional, Union, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import Session, save
+from typing import Optional, Union, Tuple, List
 
 from core.database.crud.servers import CRUDServer
 from core.database.crud.servers import server as crud_server
@@ -22,8 +23,8 @@ from core.database.schemas.levels import CreateLevel
 from core.utils import level_exp
 
 
-def get_create(
-        db: Session, crud, *, obj_in=Union[
+async def get_create(
+        db: AsyncSession, crud, *, obj_in: Union[
             CreateServer, CreatePlayer, CreateMember, CreateLevel
         ]
 ):
@@ -38,50 +39,50 @@ def get_create(
     # Get/Create Level
     if isinstance(crud, CRUDLevel) and isinstance(obj_in, CreateLevel):
 
-        obj = crud.get_by_value(db, obj_in.value)
+        obj = await crud.get_by_value(db, obj_in.value)
 
         if obj is None:
-            obj = crud_level.generate_many(db, obj_in.value)[-1]
+            await crud_level.generate_many(db, obj_in.value)
+            obj = await crud.get_by_value(db, obj_in.value)
 
-    # Get/Create Server
-    elif isinstance(crud, CRUDServer) and isinstance(obj_in, CreateServer):
-        obj = crud.get_by_discord(
-            db, obj_in.discord_id
-        )
+    # Get/Create Server, Player or Member with an upsert
+    elif isinstance(crud, (CRUDServer, CRUDPlayer, CRUDMember)):
+        obj = await crud.get_create(db, obj_in=obj_in)
 
-        if obj is None:
-            obj = crud_server.create(
-                db, obj_in=obj_in
-            )
-
-    # Get/Create Player
-    elif isinstance(crud, CRUDPlayer) and isinstance(obj_in, CreatePlayer):
-        obj = crud.get_by_discord(
-            db, obj_in.discord_id
-        )
-
-        if obj is None:
-            obj = crud_player.create(
-                db, obj_in=obj_in
-            )
-
-    # Get/Create Member
-    elif isinstance(crud, CRUDMember) and isinstance(obj_in, CreateMember):
-        obj = crud_member.get_by_ids(
-            db, obj_in.player_uuid, obj_in.server_uuid
-        )
-        if obj is None:
-            obj = crud_member.create(
-                db, obj_in=obj_in
-            )
     else:
-        raise NotImplemented
+        raise NotImplementedError
 
     return obj
 
 
-def get_create_ctx(
-        ctx: Union[Context, Interaction], db: Session, crud, overrides=None
+async def get_create_many(
+        db: AsyncSession, crud, *, objs_in: List[Union[
+            CreateServer, CreatePlayer, CreateMember
+        ]]
+) -> list:
+    """
+    Create objects that don't exist, with a single statement
+    :param db: Database session
+    :param crud: Crud-object to be used
+    :param objs_in: creation objects
+    :return: List of objects, in no particular order
+    """
+    if not isinstance(crud, (CRUDServer, CRUDPlayer, CRUDMember)):
+        raise NotImplementedError
+
+    return await crud.get_create_many(db, objs_in=objs_in)
+
+
+def _ctx_user(ctx: Union[Context, Interaction]):
+    if hasattr(ctx, 'message') and ctx.message:
+        return ctx.message.author
+    elif isinstance(ctx, Interaction):
+        return ctx.user
+    return ctx.author
+
+
+async def get_create_ctx(
+        ctx: Union[Context, Interaction], db: AsyncSession, crud, overrides=None
 ):
     """
     Create object if it doesn't exist with context
@@ -101,14 +102,14 @@ def get_create_ctx(
         if overrides.get('level', 1) < 1:
             raise ValueError('Level must be 1 or greater!')
 
-        obj = crud.get_by_value(db, overrides.get('level', 1))
+        obj = await crud.get_by_value(db, overrides.get('level', 1))
 
         previous = None
 
         if overrides.get('level', 1) > 1:
             prev_overrides = overrides
             prev_overrides['levels'] -= 1
-            previous = get_create_ctx(ctx, db, crud, prev_overrides)
+            previous = await get_create_ctx(ctx, db, crud, prev_overrides)
 
         if obj is None and \
                 (previous is not None or overrides.get('level', 1) == 1):
@@ -117,101 +118,106 @@ def get_create_ctx(
                 'exp': level_exp(overrides.get('level', 1)),
                 'value': overrides.get('level', 1)
             }
-            obj = crud_level.create(db, obj_in=CreateLevel(**level_dict))
+            obj = await crud_level.create(db, obj_in=CreateLevel(**level_dict))
 
     elif isinstance(crud, CRUDServer):
-        obj = crud.get_by_discord(
-            db, ctx.guild.id
+        server_dict = {
+            "discord_id": str(ctx.guild.id),
+            "name": ctx.guild.name,
+            "server_exp": overrides.get('exp', 0),
+            "channel": overrides.get('channel_id')
+        }
+        obj = await crud_server.get_create(
+            db, obj_in=CreateServer(**server_dict)
         )
 
-        if obj is None:
-            server_dict = {
-                "discord_id": ctx.guild.id,
-                "name": ctx.guild.name,
-                "server_exp": overrides.get('exp', 0),
-                "channel": overrides.get('channel_id')
-            }
-            obj = crud_server.create(
-                db, obj_in=CreateServer(**server_dict)
-            )
+    elif isinstance(crud, CRUDPlayer):
+        user = _ctx_user(ctx)
+        player_dict = {
+            "discord_id": str(user.id),
+            "name": user.name,
+            "hidden": overrides.get('hidden', False)
+        }
+        obj = await crud_player.get_create(
+            db, obj_in=CreatePlayer(**player_dict)
+        )
 
-        server_uuid = obj.uuid
+    elif isinstance(crud, CRUDMember):
+        player = await get_create_ctx(ctx, db, crud_player)
+        server = await get_create_ctx(ctx, db, crud_server)
+
+        member_dict = {
+            "exp": overrides.get('exp', 0),
+            "player_uuid": player.uuid,
+            "server_uuid": server.uuid,
+            "level_uuid": None,
+        }
+        obj = await crud_member.get_create(
+            db, obj_in=CreateMember(**member_dict)
+        )
 
-    elif isinstance(crud, CRUDPlayer):
-        if hasattr(ctx, 'message') and ctx.message:
-            obj = crud.get_by_discord(
-                db, ctx.message.author.id
-            )
-        elif isinstance(ctx, Interaction):
-            obj = crud.get_by_discord(
-                db, ctx.user.id
-            )
-        else:
-            obj = crud.get_by_discord(
-                db, ctx.author.id
-            )
+    return obj
 
-        if obj is None:
-            if hasattr(ctx, 'message') and ctx.message:
-                player_dict = {
-                    "discord_id": ctx.message.author.id,
-                    "name": ctx.message.author.name,
-                    "hidden": overrides.get('hidden', False)
-                }
-            elif isinstance(ctx, Interaction):
-                player_dict = {
-                    "discord_id": ctx.user.id,
-                    "name": ctx.user.name,
-                    "hidden": overrides.get('hidden', False)
-                }
-            else:
-                player_dict = {
-                    "discord_id": ctx.author.id,
-                    "name": ctx.author.name,
-                    "hidden": overrides.get('hidden', False)
-                }
-            obj = crud_player.create(
-                db, obj_in=CreatePlayer(**player_dict)
-            )
 
-    elif isinstance(crud, CRUDMember):
-        player = get_create_ctx(ctx, db, crud_player)
-        server = get_create_ctx(ctx, db, crud_server)
+def get_cached_member_uuid(
+        server_discord_id: str, player_discord_id: str
+) -> Optional[UUID]:
+    """
+    Resolve member uuid from Discord IDs using only the identity caches
+    :param server_discord_id: Discord ID of server
+    :param player_discord_id: Discord ID of player
+    :return: uuid or None if any of the identities is not cached
+    """
+    server_uuid = crud_server.identities.get(str(server_discord_id))
+    if server_uuid is None:
+        return None
 
-        obj = crud_member.get_by_ids(
-            db, player.uuid, server.uuid
-        )
-        if obj is None:
-            member_dict = {
-                "exp": overrides.get('exp', 0),
-                "player_uuid": player.uuid,
-                "server_uuid": server.uuid,
-                "level_uuid": None,
+    player_uuid = crud_player.identities.get(str(player_discord_id))
+    if player_uuid is None:
+        return None
 
-            }
-            obj = crud_member.create(
-                db, obj_in=CreateMember(**member_dict)
-            )
+    return crud_member.identities.get((player_uuid, server_uuid))
 
-    return obj
 
+async def get_member_uuid(
+        db: AsyncSession, server_discord_id: str, player_discord_id: str
+) -> Optional[UUID]:
+    """
+    Resolve member uuid from Discord IDs, querying only identities that
+    are not cached
+    :param db: Database session
+    :param server_discord_id: Discord ID of server
+    :param player_discord_id: Discord ID of player
+    :return: uuid or None if server, player or member doesn't exist
+    """
+    server_uuid = await crud_server.get_uuid_by_discord(db, server_discord_id)
+    if server_uuid is None:
+        return None
 
-def add_to_role(
-        db: Session,
+    player_uuid = await crud_player.get_uuid_by_discord(db, player_discord_id)
+    if player_uuid is None:
+        return None
+
+    return await crud_member.get_uuid_by_ids(db, player_uuid, server_uuid)
+
+
+async def add_to_role(
+        db: AsyncSession,
         member_uuid: UUID,
         *,
         role_uuid: UUID = None,
         role_discord_id: str = None,
-        role_name: str = None
+        role_name: str = None,
+        commit: bool = True
 ) -> Tuple[bool, str]:
-    db_member = crud_member.get(db, uuid=member_uuid)
+    db_member = await crud_member.get(db, uuid=member_uuid)
 
     if role_uuid:
-        db_role = crud_role.get(db, uuid=role_uuid)
+        db_role = await crud_role.get(db, uuid=role_uuid)
     elif role_discord_id:
-        db_role = crud_role.get_by_discord(db, discord_id=role_discord_id)
+        db_role = await crud_role.get_by_discord(db, discord_id=role_discord_id)
     elif role_name:
-        db_role = crud_role.get_by_name(db, name=role_name)
+        db_role = await crud_role.get_by_name(db, name=role_name)
     else:
         raise ValueError(
             "Must have either role_uuid, role_discord_id or role_name!"
@@ -219,28 +225,30 @@ def add_to_role(
     if db_role is None or db_member is None:
         return False, ""
 
+    await db.refresh(db_member, attribute_names=["roles"])
     db_member.roles.append(db_role)
-    db.commit()
+    await save(db, commit)
 
     return True, db_role.discord_id
 
 
-def remove_from_role(
-        db: Session,
+async def remove_from_role(
+        db: AsyncSession,
         member_uuid: UUID,
         *,
         role_uuid: UUID = None,
         role_discord_id: str = None,
-        role_name: str = None
+        role_name: str = None,
+        commit: bool = True
 ) -> Tuple[bool, str]:
-    db_member = crud_member.get(db, uuid=member_uuid)
+    db_member = await crud_member.get(db, uuid=member_uuid)
 
     if role_uuid:
-        db_role = crud_role.get(db, uuid=role_uuid)
+        db_role = await crud_role.get(db, uuid=role_uuid)
     elif role_discord_id:
-        db_role = crud_role.get_by_discord(db, discord_id=role_discord_id)
+        db_role = await crud_role.get_by_discord(db, discord_id=role_discord_id)
     elif role_name:
-        db_role = crud_role.get_by_name(db, name=role_name)
+        db_role = await crud_role.get_by_name(db, name=role_name)
     else:
         raise ValueError(
             "Must have either role_uuid, role_discord_id or role_name!"
@@ -248,17 +256,20 @@ def remove_from_role(
     if db_role is None or db_member is None:
         return False, ""
 
+    await db.refresh(db_member, attribute_names=["roles"])
     if db_role not in db_member.roles:
         return False, ""
 
     db_member.roles.remove(db_role)
-    db.commit()
+    await save(db, commit)
 
     return True, db_role.discord_id
 
 
-def get_guild_ids(command: str):
-    with Session() as session:
-        db_commands = crud_command.get_enabled_by_name(session, command)
-        for c in db_commands:
-            yield int(crud_server.get(session, c.uuid).discord_id)
+async def get_guild_ids(command: str) -> list[int]:
+    async with Session() as session:
+        db_commands = await crud_command.get_enabled_by_name(session, command)
+        return [
+            int((await crud_server.get(session, c.uuid)).discord_id)
+            for c in db_commands
+        ]
@@ -0,0 +1,232 @@
+import asyncio
+import nextcord
+
+from uuid import UUID
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import logger
+from core.database import Session
+from core.database.changes import publish_member_changes
+from core.database.crud.servers import server as crud_server
+from core.database.crud.players import player as crud_player
+from core.database.crud.members import member as crud_member
+from core.database.crud.levels import level as crud_level
+from core.database.schemas.servers import CreateServer
+from core.database.schemas.players import CreatePlayer
+from core.database.schemas.members import CreateMember
+from core.database.utils import get_create_many, get_cached_member_uuid
+from core.leaderboard import leaderboards
+from core.utils import process_exp
+
+
+class ExperienceGrant(BaseModel):
+    guild_id: str
+    guild_name: str
+    user_id: str
+    user_name: str
+    exp: int = 0
+    reason: str = ""
+
+
+class LevelUp(BaseModel):
+    member_uuid: UUID
+    name: str
+    level: int
+    channel: str | None
+    reason: str
+
+
+class ExperienceAccumulator:
+    """
+    Collects experience grants in memory and writes them to the database
+    in bulk, so that a single Discord event never waits for the database.
+    """
+
+    def __init__(self):
+        self.__pending: dict[tuple[str, str], ExperienceGrant] = {}
+        self.__flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__pending)
+
+    def add(self, member: nextcord.Member, exp: int, reason: str):
+        """
+        Grant experience to a guild member, applied on the next flush
+        :param member: Discord Member
+        :param exp: Amount of experience
+        :param reason: What the experience was granted for
+        :return:
+        """
+        key = (str(member.guild.id), str(member.id))
+
+        grant = self.__pending.get(key)
+        if grant is None:
+            grant = self.__pending[key] = ExperienceGrant(
+                guild_id=key[0],
+                guild_name=member.guild.name,
+                user_id=key[1],
+                user_name=member.name
+            )
+
+        grant.exp += exp
+        grant.reason = reason
+
+    def __restore(self, grants: dict[tuple[str, str], ExperienceGrant]):
+        for key, grant in grants.items():
+            pending = self.__pending.get(key)
+            if pending is None:
+                self.__pending[key] = grant
+            else:
+                pending.exp += grant.exp
+
+    async def flush(self) -> list[LevelUp]:
+        """
+        Write all pending experience to the database
+        :return: Members that leveled up
+        """
+        async with self.__flush_lock:
+            if not self.__pending:
+                return []
+
+            grants, self.__pending = self.__pending, {}
+            committed = False
+
+            try:
+                async with Session() as session:
+                    level_ups, standings = await self.__apply(
+                        session, grants
+                    )
+                    await session.commit()
+                    committed = True
+            except BaseException:
+                # Keep the experience for the next flush, also when the
+                # flush is cancelled, unless it was already written
+                if not committed:
+                    self.__restore(grants)
+                raise
+
+            for standing in standings:
+                leaderboards.update(*standing)
+
+            logger.debug(
+                f"Experience flushed for {len(grants)} members, "
+                f"{len(level_ups)} leveled up."
+            )
+
+            return level_ups
+
+    async def __apply(
+            self, session: AsyncSession,
+            grants: dict[tuple[str, str], ExperienceGrant]
+    ) -> tuple[list[LevelUp], list[tuple]]:
+        members = {}
+        for key in grants:
+            uuid = get_cached_member_uuid(*key)
+            if uuid is not None:
+                members[key] = uuid
+
+        missing = [key for key in grants if key not in members]
+        if missing:
+            rows = await crud_member.get_multi_by_discord_ids(session, missing)
+            for uuid, server_uuid, player_uuid, server_id, player_id in rows:
+                crud_server.identities.set(server_id, server_uuid)
+                crud_player.identities.set(player_id, player_uuid)
+                crud_member.identities.set((player_uuid, server_uuid), uuid)
+                members[(server_id, player_id)] = uuid
+
+        # Create missing members, with one statement for each table
+        created = grants.keys() - members.keys()
+        if created:
+            db_servers = await get_create_many(
+                session, crud_server, objs_in=[
+                    CreateServer(**{
+                        "discord_id": grants[key].guild_id,
+                        "name": grants[key].guild_name,
+                        "server_exp": 0,
+                        "channel": None
+                    }) for key in created
+                ]
+            )
+            db_players = await get_create_many(
+                session, crud_player, objs_in=[
+                    CreatePlayer(**{
+                        "discord_id": grants[key].user_id,
+                        "name": grants[key].user_name,
+                        "hidden": True
+                    }) for key in created
+                ]
+            )
+            server_uuids = {obj.discord_id: obj.uuid for obj in db_servers}
+            player_uuids = {obj.discord_id: obj.uuid for obj in db_players}
+
+            db_members = await get_create_many(
+                session, crud_member, objs_in=[
+                    CreateMember(**{
+                        "exp": 0,
+                        "player_uuid": player_uuids[player_id],
+                        "server_uuid": server_uuids[server_id],
+                        "level_uuid": None
+                    }) for server_id, player_id in created
+                ]
+            )
+            server_ids = {uuid: key for key, uuid in server_uuids.items()}
+            player_ids = {uuid: key for key, uuid in player_uuids.items()}
+            for obj in db_members:
+                members[(
+                    server_ids[obj.server_uuid], player_ids[obj.player_uuid]
+                )] = obj.uuid
+
+        by_uuid = {members[key]: key for key in grants}
+        updated = await crud_member.add_exp_many(
+            session, {uuid: grants[key].exp for uuid, key in by_uuid.items()}
+        )
+
+        gained = []
+        channels = {}
+        standings = []
+        for uuid, server_uuid, exp, level_value, channel in updated:
+            current_level = level_value or 0
+            new_level, remaining = process_exp(current_level, exp)
+
+            if new_level != current_level:
+                gained.append((uuid, exp - remaining, new_level))
+                channels[uuid] = channel
+
+            standings.append((
+                server_uuid, uuid, grants[by_uuid[uuid]].user_name,
+                new_level, remaining
+            ))
+
+        # Missing levels are created in their own transaction, so that the
+        # experience update stays atomic
+        highest = max((new_level for _, _, new_level in gained), default=0)
+        if crud_level.table.highest < highest:
+            async with Session() as level_session:
+                table = await crud_level.load_table(level_session)
+                if table.highest < highest:
+                    await crud_level.generate_many(level_session, highest)
+
+        level_ups = []
+        changes = []
+        for uuid, consumed, new_level in gained:
+            changes.append((uuid, consumed, crud_level.table.uuid(new_level)))
+
+            key = by_uuid[uuid]
+            level_ups.append(LevelUp(
+                member_uuid=uuid,
+                name=grants[key].user_name,
+                level=new_level,
+                channel=channels[uuid],
+                reason=grants[key].reason
+            ))
+
+        if changes:
+            await crud_member.level_up_many(session, changes)
+
+        await publish_member_changes(session, [
+            (server_uuid, uuid, level, exp)
+            for server_uuid, uuid, _, level, exp in standings
+        ])
+
+        return level_ups, standings
@@ -0,0 +1,66 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from core.config import settings, logger
+
+
+class DiskCacheEntry(BaseModel):
+    etag: str | None = None
+    last_modified: str | None = None
+    data: Any = None
+
+
+class DiskCache:
+    """
+    Small JSON file cache for API responses, kept with the validators
+    needed to revalidate them.
+    """
+
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def __path(self, name: str) -> Path:
+        return self.directory / f"{name}.json"
+
+    def load(self, name: str) -> DiskCacheEntry | None:
+        """
+        Load a cached entry
+        :param name: Name of the entry
+        :return: Entry or None if missing or unreadable
+        """
+        path = self.__path(name)
+
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r") as f:
+                return DiskCacheEntry.parse_obj(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read cache {path}! {e}")
+            return None
+
+    def store(self, name: str, entry: DiskCacheEntry):
+        """
+        Store an entry, replacing the previous one atomically
+        :param name: Name of the entry
+        :param entry: Entry to store
+        :return:
+        """
+        path = self.__path(name)
+        tmp = path.with_suffix(".tmp")
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(entry.dict(), f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not write cache {path}! {e}")
+
+
+disk_cache = DiskCache(settings.CACHE_DIR)
@@ -1,9 +1,9 @@
 from datetime import datetime
 from pydantic import BaseModel, AnyHttpUrl
-from aiohttp import ClientSession
+from core.interfaces.http import HTTPClient, conditional_headers
 
 from core.config import settings, logger
-from core.database.models import DotaGuild, Member
+from core.database.models import DotaGuild
 
 
 class Dota2GuildInfo(BaseModel):
@@ -54,10 +54,30 @@ class Dota2Hero(BaseModel):
     complexity: int
 
 
-async def get_guild_summary(client: ClientSession, guild: DotaGuild) -> Dota2GuildSummary | None:
+class Dota2Patch(BaseModel):
+    patch_number: str = ""
+    patch_name: str
+    patch_timestamp: int = 0
+
+
+class Dota2HeroList(BaseModel):
+    modified: bool = True
+    etag: str | None = None
+    last_modified: str | None = None
+    heroes: list[Dota2Hero] = []
+
+
+class Dota2PatchList(BaseModel):
+    modified: bool = True
+    etag: str | None = None
+    last_modified: str | None = None
+    patches: list[Dota2Patch] = []
+
+
+async def get_guild_summary(client: HTTPClient, guild: DotaGuild) -> Dota2GuildSummary | None:
     """
     Retrieves the guild summary from Dota 2 API
-    :param client: Aiohttp Client
+    :param client: HTTP Client
     :param guild: Dota Guild
     :return: Dota2GuildSummary
     """
@@ -80,52 +100,113 @@ async def get_guild_summary(client: ClientSession, guild: DotaGuild) -> Dota2Gui
         return Dota2GuildSummary.parse_obj(data["summary"])
 
 
-async def get_guild_persona_infos(client: ClientSession, member: Member) -> list[Dota2GuildPersonaInfo]:
+async def get_guild_persona_infos(client: HTTPClient, steam_id: str) -> list[Dota2GuildPersonaInfo] | None:
     """
-    Gets information about guild personas of given member
-    :param client: Aiohttp Client
-    :param member: Member
-    :return: List of Dota 2 Guild Personas
+    Gets information about guild personas of given Steam account
+    :param client: HTTP Client
+    :param steam_id: Steam account ID
+    :return: List of Dota 2 Guild Personas or None if fetching failed
     """
-    if member.player.steam_id is None:
-        return []
-
     async with client.get(
             f"https://www.dota2.com/webapi/IDOTA2Guild/GetGuildPersonaInfo/v0001/"
-            f"?key={settings.STEAM_API_KEY}&account_id={member.player.steam_id}&format=json") as r:
+            f"?key={settings.STEAM_API_KEY}&account_id={steam_id}&format=json") as r:
         if r.status >= 400:
             text = await r.text()
             logger.warning(
-                f"Could not find Dota Guild Persona {member.player.name}! {r.status=} {text=}"
+                f"Could not find Dota Guild Persona {steam_id}! {r.status=} {text=}"
             )
-            return []
+            return None
 
         data = await r.json()
 
         if not data["success"] or "account_guilds_persona_info" not in data or \
                 "guild_persona_infos" not in data["account_guilds_persona_info"]:
-            logger.warning(f"Could not find Dota Guild Persona {member.player.name}! {data=}")
-            return []
+            logger.warning(f"Could not find Dota Guild Persona {steam_id}! {data=}")
+            return None
 
-        return [Dota2GuildPersonaInfo.parse_obj(x) for x in data["account_guilds_persona_infos"]["guild_persona_infos"]]
+        return [Dota2GuildPersonaInfo.parse_obj(x) for x in data["account_guilds_persona_info"]["guild_persona_infos"]]
 
 
-async def get_heroes(client: ClientSession) -> list[Dota2Hero]:
-    async with client.get("https://www.dota2.com/datafeed/herolist?language=english") as r:
+async def get_heroes(
+        client: HTTPClient, etag: str | None = None,
+        last_modified: str | None = None
+) -> Dota2HeroList | None:
+    """
+    Gets list of Dota 2 heroes, revalidating with the validators of the
+    previous response
+    :param client: HTTP Client
+    :param etag: ETag of the previous response
+    :param last_modified: Last-Modified of the previous response
+    :return: Hero list, unmodified if the previous response is still valid
+    """
+    async with client.get(
+            "https://www.dota2.com/datafeed/herolist?language=english",
+            headers=conditional_headers(etag, last_modified)) as r:
+        if r.status == 304:
+            return Dota2HeroList(
+                modified=False, etag=etag, last_modified=last_modified
+            )
+
         if r.status >= 400:
             text = await r.text()
             logger.warning(
                 f"Could not find Dota Heroes! {r.status=} {text=}"
             )
-            return []
+            return None
 
         data = await r.json()
 
         if 'result' not in data or 'data' not in data["result"] or "heroes" not in data["result"]["data"]:
             logger.warning(f"Could not fetch heroes :/ {data=}")
-            return []
+            return None
+
+        return Dota2HeroList(
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            heroes=[
+                Dota2Hero.parse_obj(x) for x in data["result"]["data"]["heroes"]
+            ]
+        )
+
+
+async def get_patches(
+        client: HTTPClient, etag: str | None = None,
+        last_modified: str | None = None
+) -> Dota2PatchList | None:
+    """
+    Gets list of Dota 2 patches, oldest first, revalidating with the
+    validators of the previous response
+    :param client: HTTP Client
+    :param etag: ETag of the previous response
+    :param last_modified: Last-Modified of the previous response
+    :return: Patch list, unmodified if the previous response is still valid
+    """
+    async with client.get(
+            "https://www.dota2.com/datafeed/patchnoteslist?language=english",
+            headers=conditional_headers(etag, last_modified)) as r:
+        if r.status == 304:
+            return Dota2PatchList(
+                modified=False, etag=etag, last_modified=last_modified
+            )
+
+        if r.status >= 400:
+            text = await r.text()
+            logger.warning(
+                f"Could not fetch patch notes! {r.status=} {text=}"
+            )
+            return None
+
+        data = await r.json()
+
+        if "patches" not in data:
+            logger.warning("Could not fetch patch notes :/")
+            return None
 
-        return [Dota2Hero.parse_obj(x) for x in data["result"]["data"]["heroes"]]
+        return Dota2PatchList(
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            patches=[Dota2Patch.parse_obj(x) for x in data["patches"]]
+        )
 
 
 def get_guild_icon(icon_id: str) -> AnyHttpUrl:
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, \
+    ClientResponse, ClientError
+from yarl import URL
+
+from core.config import settings, logger
+
+
+# Responses worth another try
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def conditional_headers(
+        etag: str | None, last_modified: str | None
+) -> dict[str, str]:
+    """
+    Headers that revalidate a previous response
+    :param etag: ETag of the previous response
+    :param last_modified: Last-Modified of the previous response
+    :return: If-None-Match and If-Modified-Since for the given validators
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def __repr__(self) -> str:
+        average = self.latency_total / self.requests if self.requests else 0.0
+        return f"{self.requests=}, {self.failures=}, " \
+               f"latency_avg={average:.3f}, {self.latency_max=:.3f}"
+
+
+class HTTPClient:
+    """
+    Bot-wide HTTP client, so that all outbound requests share one pool of
+    keep-alive connections and a DNS cache
+    """
+
+    def __init__(
+            self, timeout: float, limit: int, limit_per_host: int,
+            retries: int, backoff: float
+    ):
+        self.timeout = timeout
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.stats: dict[str, HostStats] = {}
+        self.__session: ClientSession | None = None
+
+    def __repr__(self) -> str:
+        return "HTTPClient(" + ", ".join(
+            f"{host}: {stats!r}" for host, stats in self.stats.items()
+        ) + ")"
+
+    @property
+    def session(self) -> ClientSession:
+        """
+        Shared aiohttp session, created on first use
+        :return: ClientSession
+        """
+        if self.__session is None or self.__session.closed:
+            self.__session = ClientSession(
+                connector=TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    ttl_dns_cache=300
+                ),
+                timeout=ClientTimeout(total=self.timeout)
+            )
+        return self.__session
+
+    def __record(self, host: str, start: float, failed: bool = False):
+        stats = self.stats.get(host)
+        if stats is None:
+            stats = self.stats[host] = HostStats()
+
+        latency = time.monotonic() - start
+        stats.requests += 1
+        stats.failures += failed
+        stats.latency_total += latency
+        stats.latency_max = max(stats.latency_max, latency)
+
+    @asynccontextmanager
+    async def get(self, url: str, **kwargs) -> AsyncIterator[ClientResponse]:
+        """
+        GET request, retried with exponential backoff on connection errors,
+        timeouts and temporary failures
+        :param url: URL
+        :param kwargs: Arguments for ClientSession.get
+        :return: Response
+        """
+        host = URL(url).host
+        attempt = 0
+
+        while True:
+            start = time.monotonic()
+            try:
+                response = await self.session.get(url, **kwargs)
+            except (ClientError, asyncio.TimeoutError) as e:
+                self.__record(host, start, failed=True)
+                if attempt >= self.retries:
+                    raise
+                logger.debug(f"Retrying {host} after {e!r}")
+            else:
+                failed = response.status in RETRY_STATUSES
+                self.__record(host, start, failed=failed)
+                if not failed or attempt >= self.retries:
+                    break
+
+                logger.debug(f"Retrying {host} after {response.status=}")
+                response.release()
+
+            await asyncio.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    async def close(self):
+        """
+        Close all connections
+        :return:
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+
+http = HTTPClient(
+    timeout=settings.HTTP_TIMEOUT,
+    limit=settings.HTTP_POOL_SIZE,
+    limit_per_host=settings.HTTP_POOL_SIZE_PER_HOST,
+    retries=settings.HTTP_RETRIES,
+    backoff=settings.HTTP_BACKOFF
+)
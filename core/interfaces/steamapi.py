@@ -0,0 +1,70 @@
+from pydantic import BaseModel
+from core.interfaces.http import HTTPClient, conditional_headers
+
+from core.config import settings, logger
+
+
+class SteamNewsItem(BaseModel):
+    gid: str
+    title: str
+    url: str
+    author: str = ""
+    contents: str = ""
+    feed_type: int = 0
+
+
+class SteamAppNews(BaseModel):
+    app_id: int
+    modified: bool = True
+    etag: str | None = None
+    last_modified: str | None = None
+    items: list[SteamNewsItem] = []
+
+
+async def get_app_news(
+        client: HTTPClient, app_id: int, count: int,
+        etag: str | None = None, last_modified: str | None = None
+) -> SteamAppNews | None:
+    """
+    Retrieves news of an app from Steam API, revalidating with the
+    validators of the previous response
+    :param client: HTTP Client
+    :param app_id: Steam App ID
+    :param count: Number of news items to fetch
+    :param etag: ETag of the previous response
+    :param last_modified: Last-Modified of the previous response
+    :return: SteamAppNews, unmodified if the previous response is still valid
+    """
+    async with client.get(
+            f"{settings.STEAM_API_URL}/ISteamNews/GetNewsForApp/v0002/",
+            params={
+                "appid": app_id,
+                "count": count,
+                "maxlength": 1500,
+                "format": "json"
+            },
+            headers=conditional_headers(etag, last_modified)) as r:
+        if r.status == 304:
+            return SteamAppNews(
+                app_id=app_id, modified=False, etag=etag,
+                last_modified=last_modified
+            )
+
+        if r.status >= 400:
+            logger.warning(f"Could not find news for app {app_id}! {r.status=}")
+            return None
+
+        data = await r.json()
+
+        if "appnews" not in data or "newsitems" not in data["appnews"]:
+            logger.warning(f"Could not find news for app {app_id}!")
+            return None
+
+        return SteamAppNews(
+            app_id=app_id,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+            items=[
+                SteamNewsItem.parse_obj(x) for x in data["appnews"]["newsitems"]
+            ]
+        )
@@ -0,0 +1,148 @@
+from bisect import bisect_left, insort
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import logger
+from core.database.crud.members import member as crud_member
+
+
+class LeaderboardEntry(BaseModel):
+    member_uuid: UUID
+    name: str
+    level: int = 0
+    exp: int = 0
+
+    @property
+    def key(self) -> tuple[int, int, UUID]:
+        return -self.level, -self.exp, self.member_uuid
+
+
+class Leaderboard:
+    """
+    Members of a server sorted by level and experience
+    """
+
+    def __init__(self, entries: Optional[list[LeaderboardEntry]] = None):
+        self.__entries: dict[UUID, LeaderboardEntry] = {
+            entry.member_uuid: entry for entry in entries or []
+        }
+        self.__keys: list[tuple[int, int, UUID]] = sorted(
+            entry.key for entry in self.__entries.values()
+        )
+
+    def __len__(self) -> int:
+        return len(self.__keys)
+
+    def update(self, member_uuid: UUID, name: str, level: int, exp: int):
+        """
+        Add member or move it to its new position
+        :param member_uuid: uuid of member
+        :param name: Name of player
+        :param level: Level value
+        :param exp: Experience on current level
+        :return:
+        """
+        self.remove(member_uuid)
+
+        entry = LeaderboardEntry(
+            member_uuid=member_uuid, name=name, level=level, exp=exp
+        )
+        self.__entries[member_uuid] = entry
+        insort(self.__keys, entry.key)
+
+    def remove(self, member_uuid: UUID):
+        """
+        Remove member
+        :param member_uuid: uuid of member
+        :return:
+        """
+        entry = self.__entries.pop(member_uuid, None)
+        if entry is not None:
+            del self.__keys[bisect_left(self.__keys, entry.key)]
+
+    def top(self, value: int) -> list[LeaderboardEntry]:
+        """
+        Get top N members
+        :param value: Number of members
+        :return: List of entries
+        """
+        return [self.__entries[key[2]] for key in self.__keys[:value]]
+
+    def position(self, member_uuid: UUID) -> Optional[int]:
+        """
+        Get position of member, starting from 1
+        :param member_uuid: uuid of member
+        :return: Position or None if member is not on the leaderboard
+        """
+        entry = self.__entries.get(member_uuid)
+        if entry is None:
+            return None
+        return bisect_left(self.__keys, entry.key) + 1
+
+
+class Leaderboards:
+    """
+    Leaderboards of all servers, rebuilt from the database and kept up to date
+    as experience is granted
+    """
+
+    def __init__(self):
+        self.__boards: dict[UUID, Leaderboard] = {}
+        self.loaded = False
+
+    def get(self, server_uuid: UUID) -> Leaderboard:
+        """
+        Get leaderboard of a server
+        :param server_uuid: uuid of server
+        :return: Leaderboard
+        """
+        board = self.__boards.get(server_uuid)
+        if board is None:
+            board = self.__boards[server_uuid] = Leaderboard()
+        return board
+
+    def update(
+            self, server_uuid: UUID, member_uuid: UUID, name: str,
+            level: int, exp: int
+    ):
+        """
+        Update standing of a member
+        :param server_uuid: uuid of server
+        :param member_uuid: uuid of member
+        :param name: Name of player
+        :param level: Level value
+        :param exp: Experience on current level
+        :return:
+        """
+        self.get(server_uuid).update(member_uuid, name, level, exp)
+
+    async def rebuild(self, db: AsyncSession):
+        """
+        Rebuild all leaderboards from the database
+        :param db: Database Session
+        :return:
+        """
+        entries = {}
+        rows = await crud_member.get_leaderboard_rows(db)
+        for member_uuid, server_uuid, name, level, exp in rows:
+            entries.setdefault(server_uuid, []).append(LeaderboardEntry(
+                member_uuid=member_uuid, name=name, level=level, exp=exp
+            ))
+
+        boards = {
+            server_uuid: Leaderboard(server_entries)
+            for server_uuid, server_entries in entries.items()
+        }
+        self.__boards = boards
+        self.loaded = True
+
+        logger.info(
+            f"Leaderboards rebuilt for {len(boards)} servers "
+            f"and {len(rows)} members."
+        )
+
+
+leaderboards = Leaderboards()
@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import time
+
+from nextcord.ext import commands, tasks
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+from sqlalchemy import event
+
+from core.config import settings, logger
+from core.database import engine
+
+
+LOOP_LAG = Histogram(
+    "bot_event_loop_lag_seconds",
+    "How long ready callbacks wait for the event loop",
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5)
+)
+HANDLER_DURATION = Histogram(
+    "bot_handler_duration_seconds",
+    "Duration of event listeners and background tasks",
+    ["handler"]
+)
+HANDLER_ERRORS = Counter(
+    "bot_handler_errors_total",
+    "Exceptions raised by event listeners and background tasks",
+    ["handler"]
+)
+DB_STATEMENTS = Histogram(
+    "bot_db_statement_duration_seconds",
+    "Duration of database statements",
+    ["statement"]
+)
+DB_CONNECTION_HOLD = Histogram(
+    "bot_db_connection_hold_seconds",
+    "How long database connections are checked out of the pool",
+    buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+)
+DB_CONNECTIONS = Gauge(
+    "bot_db_connections_checked_out",
+    "Database connections currently checked out of the pool"
+)
+DISCORD_REQUESTS = Histogram(
+    "bot_discord_request_duration_seconds",
+    "Duration of Discord API requests",
+    ["method", "route"]
+)
+GATEWAY_LATENCY = Gauge(
+    "bot_gateway_latency_seconds",
+    "Latency between a gateway heartbeat and its acknowledgement"
+)
+ROLE_QUEUE_DEPTH = Gauge(
+    "bot_role_queue_depth",
+    "Members with role changes waiting to be applied"
+)
+ROLE_QUEUE_LATENCY = Histogram(
+    "bot_role_queue_latency_seconds",
+    "Time from queueing a role change to applying it",
+    buckets=(.5, 1, 2, 3, 5, 10, 30, 60, 120, 300)
+)
+ROLE_QUEUE_COALESCED = Counter(
+    "bot_role_queue_coalesced_total",
+    "Role changes replaced by a later change before being applied"
+)
+
+
+def timed(handler: str):
+    """
+    Record duration and errors of a coroutine function
+    :param handler: Name of the listener or task
+    :return: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                HANDLER_ERRORS.labels(handler).inc()
+                raise
+            finally:
+                HANDLER_DURATION.labels(handler).observe(
+                    time.perf_counter() - start
+                )
+        return wrapper
+    return decorator
+
+
+def _statement_name(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else ""
+
+
+def _before_execute(conn, cursor, statement, parameters, context, many):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, many):
+    start = conn.info["query_start"].pop()
+    DB_STATEMENTS.labels(_statement_name(statement)).observe(
+        time.perf_counter() - start
+    )
+
+
+def _handle_error(context):
+    # Failed statements never reach after_cursor_execute
+    if context.connection is not None and context.cursor is not None:
+        starts = context.connection.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def _checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checkout"] = time.perf_counter()
+    DB_CONNECTIONS.inc()
+
+
+def _checkin(dbapi_connection, connection_record):
+    start = connection_record.info.pop("checkout", None)
+    if start is not None:
+        DB_CONNECTION_HOLD.observe(time.perf_counter() - start)
+        DB_CONNECTIONS.dec()
+
+
+@tasks.loop(seconds=settings.METRICS_LAG_INTERVAL)
+async def measure_loop_lag():
+    # Everything that is ready to run goes before the sleep returns
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await asyncio.sleep(0)
+    LOOP_LAG.observe(loop.time() - start)
+
+
+def instrument(bot: commands.Bot):
+    """
+    Start the metrics listener and instrument the bot, if METRICS_PORT is
+    configured
+    :param bot: Discord Bot
+    :return:
+    """
+    if not settings.METRICS_PORT:
+        return
+
+    start_http_server(int(settings.METRICS_PORT))
+    logger.info(f"Serving metrics on port {settings.METRICS_PORT}")
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+    event.listen(engine.sync_engine.pool, "checkout", _checkout)
+    event.listen(engine.sync_engine.pool, "checkin", _checkin)
+
+    GATEWAY_LATENCY.set_function(lambda: bot.latency)
+
+    request = bot.http.request
+
+    async def timed_request(route, **kwargs):
+        with DISCORD_REQUESTS.labels(route.method, route.path).time():
+            return await request(route, **kwargs)
+
+    # Replace with a request that records its latency
+    bot.http.request = timed_request
+
+    measure_loop_lag.start()
@@ -0,0 +1,77 @@
+from typing import Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import logger
+from core.database.crud.roles import role as crud_role
+
+
+class ReactionRole(BaseModel):
+    role_uuid: UUID
+    role_discord_id: str
+
+
+class RoleMessage(BaseModel):
+    message_id: str
+    roles: dict[str, ReactionRole] = {}
+
+
+class ReactionRoles:
+    """
+    Routing table from role message reactions to roles, so that reactions
+    elsewhere are dropped without touching the database
+    """
+
+    def __init__(self):
+        self.__messages: dict[str, RoleMessage] = {}
+        self.loaded = False
+
+    def get(
+            self, guild_id: Union[int, str], message_id: Union[int, str],
+            identifier: str
+    ) -> Optional[ReactionRole]:
+        """
+        Get role assigned by a reaction
+        :param guild_id: Discord ID of guild
+        :param message_id: Discord ID of reacted message
+        :param identifier: Emoji identifier
+        :return: Role or None if the reaction doesn't assign a role
+        """
+        message = self.__messages.get(str(guild_id))
+        if message is None or message.message_id != str(message_id):
+            return None
+        return message.roles.get(identifier)
+
+    async def load(
+            self, db: AsyncSession, guild_id: Union[int, str, None] = None
+    ):
+        """
+        Load routes from the database
+        :param db: Database Session
+        :param guild_id: Reload only this guild, all if None
+        :return:
+        """
+        messages = {}
+        rows = await crud_role.get_reaction_rows(db, guild_id)
+        for server_id, message_id, identifier, role_uuid, role_id in rows:
+            message = messages.get(server_id)
+            if message is None:
+                message = messages[server_id] = RoleMessage(
+                    message_id=message_id
+                )
+            message.roles[identifier] = ReactionRole(
+                role_uuid=role_uuid, role_discord_id=role_id
+            )
+
+        if guild_id is None:
+            self.__messages = messages
+            self.loaded = True
+            logger.info(f"Reaction roles loaded for {len(messages)} servers.")
+        else:
+            self.__messages.pop(str(guild_id), None)
+            self.__messages.update(messages)
+
+
+reaction_roles = ReactionRoles()
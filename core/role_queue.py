@@ -0,0 +1,170 @@
+import asyncio
+import time
+
+import nextcord
+from nextcord import Forbidden, HTTPException, NotFound
+
+from core.config import settings, logger
+from core.metrics import ROLE_QUEUE_COALESCED, ROLE_QUEUE_DEPTH, \
+    ROLE_QUEUE_LATENCY
+
+
+class RoleQueue:
+    """
+    Queues role changes per member and applies them after a short delay,
+    so that a burst of changes for one member is applied once and changes
+    undone in the meantime are never sent
+    """
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.__pending: dict[tuple[int, int], dict[int, bool]] = {}
+        self.__reasons: dict[tuple[int, int], str] = {}
+        self.__enqueued: dict[tuple[int, int], float] = {}
+        self.__tasks: dict[tuple[int, int], asyncio.Task] = {}
+        self.__guild_locks: dict[int, asyncio.Lock] = {}
+
+        self.edits = 0
+        self.coalesced = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def __len__(self) -> int:
+        return len(self.__pending)
+
+    def __repr__(self) -> str:
+        average = self.latency_total / self.edits if self.edits else 0.0
+        return f"RoleQueue(depth={len(self)}, {self.edits=}, " \
+               f"{self.coalesced=}, latency_avg={average:.3f}, " \
+               f"{self.latency_max=:.3f})"
+
+    def add(self, member: nextcord.Member, role: nextcord.Role, reason: str):
+        """
+        Queue adding a role to a member
+        :param member: Discord Member
+        :param role: Discord Role
+        :param reason: Reason shown in the audit log
+        :return:
+        """
+        self.__enqueue(member, role, True, reason)
+
+    def remove(
+            self, member: nextcord.Member, role: nextcord.Role, reason: str
+    ):
+        """
+        Queue removing a role from a member
+        :param member: Discord Member
+        :param role: Discord Role
+        :param reason: Reason shown in the audit log
+        :return:
+        """
+        self.__enqueue(member, role, False, reason)
+
+    def __enqueue(
+            self, member: nextcord.Member, role: nextcord.Role, add: bool,
+            reason: str
+    ):
+        key = (member.guild.id, member.id)
+
+        changes = self.__pending.setdefault(key, {})
+        if role.id in changes:
+            self.coalesced += 1
+            ROLE_QUEUE_COALESCED.inc()
+        changes[role.id] = add
+        ROLE_QUEUE_DEPTH.set(len(self.__pending))
+
+        self.__reasons[key] = reason
+        self.__enqueued.setdefault(key, time.monotonic())
+
+        if key not in self.__tasks:
+            self.__tasks[key] = asyncio.create_task(
+                self.__apply_later(member.guild, key)
+            )
+
+    async def __apply_later(self, guild: nextcord.Guild, key: tuple[int, int]):
+        await asyncio.sleep(self.delay)
+
+        # Changes queued from now on get a new task
+        self.__tasks.pop(key, None)
+        await self.__apply(guild, key)
+
+    async def __apply(self, guild: nextcord.Guild, key: tuple[int, int]):
+        changes = self.__pending.pop(key, None)
+        reason = self.__reasons.pop(key, None)
+        enqueued = self.__enqueued.pop(key, time.monotonic())
+        ROLE_QUEUE_DEPTH.set(len(self.__pending))
+
+        if not changes:
+            return
+
+        # Member edits share a rate limit bucket per guild
+        lock = self.__guild_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            member = guild.get_member(key[1])
+            if member is None:
+                try:
+                    member = await guild.fetch_member(key[1])
+                except NotFound:
+                    return
+                except HTTPException:
+                    logger.error(
+                        "HTTPException: Something went wrong while fetching "
+                        "member"
+                    )
+                    return
+
+            # Roles are added and removed one by one rather than replacing
+            # all roles, so a cache that is behind can't undo other changes
+            current = {role.id for role in member.roles}
+            added, removed = [], []
+            for role_id, add in changes.items():
+                role = guild.get_role(role_id)
+                if role is None or add == (role_id in current):
+                    continue
+                (added if add else removed).append(role)
+
+            if not added and not removed:
+                return
+
+            try:
+                if added:
+                    await member.add_roles(*added, reason=reason)
+                if removed:
+                    await member.remove_roles(*removed, reason=reason)
+            except Forbidden:
+                logger.error(
+                    "Forbidden: Not enough permissions to manage roles."
+                )
+                return
+            except HTTPException:
+                logger.error(
+                    "HTTPException: Something went wrong while changing roles"
+                )
+                return
+
+        latency = time.monotonic() - enqueued
+        ROLE_QUEUE_LATENCY.observe(latency)
+        self.edits += 1
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+    async def flush(self, bot: nextcord.Client):
+        """
+        Apply all queued changes immediately
+        :param bot: Discord Bot
+        :return:
+        """
+        tasks, self.__tasks = self.__tasks, {}
+        for task in tasks.values():
+            task.cancel()
+
+        for key in list(self.__pending):
+            guild = bot.get_guild(key[0])
+            if guild is None:
+                self.__pending.pop(key, None)
+                ROLE_QUEUE_DEPTH.set(len(self.__pending))
+                continue
+            await self.__apply(guild, key)
+
+
+role_queue = RoleQueue(settings.ROLE_QUEUE_DELAY)
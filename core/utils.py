@@ -2,8 +2,12 @@ import math
 import datetime
 import nextcord
 
-from typing import Tuple
-from core.config import logger
+from bisect import bisect_right
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Tuple, Mapping, Optional
+from uuid import UUID
+from core.config import settings, logger
 
 from enum import Enum
 
@@ -85,18 +89,110 @@ def next_weekday(d: datetime.datetime, weekday: int) -> datetime.datetime:
     return d + datetime.timedelta(days_ahead)
 
 
+class LevelTable:
+    """
+    Immutable table of the level curve, indexed by level value. Holds the
+    experience needed for each level, the cumulative experience needed to
+    reach it and the uuids of the levels that exist in the database.
+    Changes create a new table.
+    """
+
+    def __init__(self, size: int, uuids: Optional[Mapping[int, UUID]] = None):
+        if uuids:
+            size = max(size, max(uuids))
+
+        self.__exp = (0,) + tuple(level_exp(i) for i in range(1, size + 1))
+        self.__cumulative = tuple(accumulate(self.__exp))
+        self.__uuids = MappingProxyType(dict(uuids or {}))
+
+    def __len__(self) -> int:
+        return len(self.__exp) - 1
+
+    @property
+    def highest(self) -> int:
+        """
+        Highest level value that exists in the database
+        :return: Level value or 0 if there are no levels
+        """
+        return max(self.__uuids, default=0)
+
+    def exp(self, value: int) -> int:
+        """
+        Experience needed to reach level from the previous one
+        :param value: Level value
+        :return: Experience
+        """
+        if 0 < value <= len(self):
+            return self.__exp[value]
+        return level_exp(value)
+
+    def uuid(self, value: int) -> Optional[UUID]:
+        """
+        Get uuid of level
+        :param value: Level value
+        :return: uuid or None if the level doesn't exist in the database
+        """
+        return self.__uuids.get(value)
+
+    def total_exp(self, value: int) -> int:
+        """
+        Total experience needed to reach level from zero
+        :param value: Level value
+        :return: Experience
+        """
+        if value <= len(self):
+            return self.__cumulative[value]
+        return self.__cumulative[-1] + sum(
+            level_exp(i) for i in range(len(self) + 1, value + 1)
+        )
+
+    def level_for_total_exp(self, total: int) -> Tuple[int, int]:
+        """
+        Find the level reached with total experience
+        :param total: Total experience gained from zero
+        :return: level value, experience left over on that level
+        """
+        value = bisect_right(self.__cumulative, total) - 1
+        exp = total - self.__cumulative[value]
+
+        # Past the end of the table
+        if value == len(self):
+            next_level_exp = level_exp(value + 1)
+            while next_level_exp <= exp:
+                exp -= next_level_exp
+                value += 1
+                next_level_exp = level_exp(value + 1)
+
+        return value, exp
+
+    def with_uuids(self, uuids: Mapping[int, UUID]) -> "LevelTable":
+        """
+        Create a new table with level uuids added
+        :param uuids: Level uuids by value
+        :return: New table
+        """
+        return LevelTable(len(self), {**self.__uuids, **uuids})
+
+
+level_table = LevelTable(settings.LEVEL_TABLE_SIZE)
+
+
+def level_for_total_exp(total: int) -> Tuple[int, int]:
+    """
+    Find the level reached with total experience
+    :param total: Total experience gained from zero
+    :return: level value, experience left over on that level
+    """
+    return level_table.level_for_total_exp(total)
+
+
 def process_exp(current_level: int, exp: int) -> Tuple[int, int]:
     """
-    Recursively process experience
+    Process experience gained on current level
     :param current_level: Current value of level
     :param exp: Current experience
     :return: new current level, new current experience
     """
-    next_level_exp = level_exp(current_level + 1)
-
-    while next_level_exp <= exp:
-        exp -= next_level_exp
-        current_level += 1
-        next_level_exp = level_exp(current_level + 1)
-
-    return current_level, exp
+    return level_table.level_for_total_exp(
+        level_table.total_exp(current_level) + exp
+    )
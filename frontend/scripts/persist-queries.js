@@ -0,0 +1,27 @@
+/*
+Writes the manifest of persisted queries the backend loads on startup, so
+that it knows every query of the site by its hash.
+ */
+const crypto = require("crypto");
+const fs = require("fs");
+const path = require("path");
+const queries = require("../src/queries");
+
+const manifest = {};
+Object.values(queries).forEach(query => {
+  const hash = crypto
+    .createHash("sha256")
+    .update(query, "utf8")
+    .digest("hex");
+  manifest[hash] = query;
+});
+
+const target = path.join(
+  __dirname,
+  "..",
+  "..",
+  "backend",
+  "persisted_queries.json"
+);
+fs.writeFileSync(target, JSON.stringify(manifest, null, 2) + "\n");
+console.log(`Wrote ${Object.keys(manifest).length} queries to ${target}`);
@@ -1,22 +1,73 @@
+import { endpoint } from "@/utils";
+
 /*
-Mixin used to provide components / views with reloading capabilities
+Mixin used to provide components / views with reloading capabilities.
+
+Components that define liveServer() and applyDelta(delta) receive member
+changes of that server as they happen, and only reload fully every few
+minutes to catch up on anything the stream does not carry, or right away
+when the backend had to drop changes.
  */
+const RELOAD_INTERVAL = 30000; // Load every 30 seconds
+const LIVE_RELOAD_INTERVAL = 300000; // Load every 5 minutes when live
+
 const reloadMixin = {
   data: () => ({
-    interval: null
+    interval: null,
+    events: null
   }),
   mounted() {
     if (this.loadContent) {
       this.loadContent();
 
-      this.interval = setInterval(() => {
-        this.loadContent();
-      }, 30000); // Load every 30 seconds
+      if (this.applyDelta && this.liveServer && window.EventSource) {
+        this.startEvents();
+      } else {
+        this.startReloading(RELOAD_INTERVAL);
+      }
     }
   },
   beforeDestroy() {
-    if (this.interval) {
-      clearInterval(this.interval);
+    this.stopEvents();
+    this.stopReloading();
+  },
+  methods: {
+    startReloading(delay) {
+      this.stopReloading();
+      this.interval = setInterval(() => {
+        this.loadContent();
+      }, delay);
+    },
+    stopReloading() {
+      if (this.interval) {
+        clearInterval(this.interval);
+        this.interval = null;
+      }
+    },
+    startEvents() {
+      this.events = new EventSource(
+        `${endpoint}/servers/${this.liveServer()}/events`
+      );
+      this.events.addEventListener("members", event => {
+        this.applyDelta(JSON.parse(event.data));
+      });
+      this.events.addEventListener("reload", () => {
+        this.loadContent();
+      });
+      this.events.onerror = () => {
+        // The browser reconnects by itself unless the stream was closed
+        if (this.events.readyState === EventSource.CLOSED) {
+          this.stopEvents();
+          this.startReloading(RELOAD_INTERVAL);
+        }
+      };
+      this.startReloading(LIVE_RELOAD_INTERVAL);
+    },
+    stopEvents() {
+      if (this.events) {
+        this.events.close();
+        this.events = null;
+      }
     }
   }
 };
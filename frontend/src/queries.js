@@ -0,0 +1,125 @@
+/*
+Queries of the site. They are sent as persisted queries, so the backend only
+receives their hashes. Run `yarn persist-queries` after changing any of them
+to update the manifest of the backend.
+ */
+const memberFields = `
+  fragment MemberFields on Member {
+    uuid
+    player {
+      uuid
+      name
+      hidden
+    }
+    level {
+      uuid
+      value
+    }
+    exp
+  }
+`;
+
+const serverQuery = `
+  query Server($uuid: String!) {
+    server(uuid: $uuid) {
+      uuid
+      name
+      lastSeen
+    }
+  }
+`;
+
+const serverMembersQuery = `
+  query ServerMembers($serverUuid: String!, $first: Int!, $offset: Int!) {
+    member(
+      serverUuid: $serverUuid
+      excludeHidden: true
+      orderBy: NAME
+      first: $first
+      offset: $offset
+    ) {
+      ...MemberFields
+    }
+  }
+  ${memberFields}
+`;
+
+const topMembersQuery = `
+  query TopMembers($serverUuid: String!) {
+    topMembers(serverUuid: $serverUuid, n: 10) {
+      ...MemberFields
+    }
+  }
+  ${memberFields}
+`;
+
+const serversQuery = `
+  query Servers {
+    allServers {
+      edges {
+        node {
+          uuid
+          name
+        }
+      }
+    }
+  }
+`;
+
+const serverMemberCountsQuery = `
+  query ServerMemberCounts {
+    allServers {
+      edges {
+        node {
+          uuid
+          name
+          memberCount
+        }
+      }
+    }
+  }
+`;
+
+const levelQuery = `
+  query Level($value: Int!) {
+    level(value: $value) {
+      uuid
+      value
+      exp
+    }
+  }
+`;
+
+const allLevelsQuery = `
+  query AllLevels {
+    allLevels {
+      edges {
+        node {
+          uuid
+          value
+          exp
+        }
+      }
+    }
+  }
+`;
+
+const levelHistogramQuery = `
+  query LevelHistogram {
+    levelHistogram {
+      level
+      count
+    }
+  }
+`;
+
+module.exports = {
+  serverQuery,
+  serverMembersQuery,
+  topMembersQuery,
+  serversQuery,
+  serverMemberCountsQuery,
+  levelQuery,
+  allLevelsQuery,
+  levelHistogramQuery
+};
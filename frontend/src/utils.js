@@ -1,8 +1,68 @@
-import { GraphQLClient } from "graphql-request";
-
 const endpoint = "/api";
 
-const client = new GraphQLClient(endpoint, { headers: {} });
+const sha256 = async text => {
+  const digest = await window.crypto.subtle.digest(
+    "SHA-256",
+    new TextEncoder().encode(text)
+  );
+  return Array.from(new Uint8Array(digest))
+    .map(b => b.toString(16).padStart(2, "0"))
+    .join("");
+};
+
+const post = async body => {
+  const response = await fetch(endpoint, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body)
+  });
+  return response.json();
+};
+
+/*
+Persisted queries are sent with GET, so that the browser caches the response
+and revalidates it with its ETag.
+ */
+const get = async params => {
+  const search = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    search.set(key, JSON.stringify(value));
+  }
+  const response = await fetch(`${endpoint}?${search}`);
+  return response.json();
+};
+
+const notPersisted = result =>
+  (result.errors || []).some(
+    e => e.extensions && e.extensions.code === "PERSISTED_QUERY_NOT_FOUND"
+  );
+
+/*
+Send a query by its hash and only send the full query when the backend does
+not know it yet. Hashing needs a secure context, so the full query is sent
+where it is not available.
+ */
+const request = async (query, variables = {}) => {
+  let result;
+
+  if (window.crypto && window.crypto.subtle) {
+    const extensions = {
+      persistedQuery: { version: 1, sha256Hash: await sha256(query) }
+    };
+    result = await get({ variables, extensions });
+
+    if (notPersisted(result)) {
+      result = await post({ query, variables, extensions });
+    }
+  } else {
+    result = await post({ query, variables });
+  }
+
+  if (result.errors) {
+    throw new Error(result.errors.map(e => e.message).join("\n"));
+  }
+  return result.data;
+};
 
 const hexToRGB = (hex, alpha) => {
   const r = parseInt(hex.slice(1, 3), 16),
@@ -16,4 +76,4 @@ const hexToRGB = (hex, alpha) => {
   }
 };
 
-export { client, hexToRGB };
+export { endpoint, request, hexToRGB };
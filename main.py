@@ -12,6 +12,8 @@ from core.cogs.utility import Utility
 from core.cogs.roles import Roles
 
 from core.config import settings, logger
+from core.interfaces.http import http
+from core.metrics import instrument
 
 
 def main():
@@ -38,6 +40,8 @@ def main():
     bot.add_cog(Games(bot))
     bot.add_cog(Roles(bot))
 
+    instrument(bot)
+
     @bot.event
     async def on_ready():
         logger.info(f"\nLogged in as:\n{bot.user} (ID: {bot.user.id})")
@@ -66,6 +70,25 @@ def main():
     # Replace with a new command error handler
     bot.on_application_command_error = on_application_command_error
 
+    bot_close = bot.close
+
+    async def close():
+        """
+        Let cogs write their pending state before closing the bot
+        :return:
+        """
+        for cog in bot.cogs.values():
+            if hasattr(cog, "shutdown"):
+                try:
+                    await cog.shutdown()
+                except Exception as e:
+                    logger.exception(e)
+        await http.close()
+        await bot_close()
+
+    # Replace with a close that shuts down cogs first
+    bot.close = close
+
     def handle_sigterm(sig, frame):
         raise KeyboardInterrupt
 
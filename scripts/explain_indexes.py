@@ -0,0 +1,190 @@
+"""
+Query-plan benchmark of the lookup indexes.
+
+Seeds a scratch database with generated servers, members and roles. It then
+runs the hot CRUD lookups with EXPLAIN ANALYZE twice, first without the
+indexes of the lookup-indexes migration (3f9a1c2b7d54) and then with them,
+and prints the top plan node and the execution time of each run.
+
+Point DB_HOST, DB_USER, DB_PASS and DB_NAME to a scratch database, since the
+tables are created and dropped, and run from the repository root:
+
+    python -m scripts.explain_indexes --scratch --servers 200 --members 500
+"""
+import argparse
+import asyncio
+import re
+
+from sqlalchemy import text
+
+from core.database import engine
+from core.database.models import Base
+
+# Indexes and constraints added by the lookup-indexes migration
+DROP = [
+    "ALTER TABLE members "
+    "DROP CONSTRAINT uq_members_player_uuid_server_uuid",
+    "DROP INDEX ix_members_server_uuid_exp",
+    "DROP INDEX ix_member_role_association_member_uuid",
+    "DROP INDEX ix_levels_value",
+    "DROP INDEX ix_roles_server_uuid",
+    "DROP INDEX ix_roleemojis_identifier",
+    "DROP INDEX ix_commands_name_server_uuid",
+    "DROP INDEX ix_dota_guilds_server_uuid",
+    "DROP INDEX ix_steamposts_subscriptions_channel_id",
+]
+CREATE = [
+    "ALTER TABLE members ADD CONSTRAINT uq_members_player_uuid_server_uuid "
+    "UNIQUE (player_uuid, server_uuid)",
+    "CREATE INDEX ix_members_server_uuid_exp ON members "
+    "(server_uuid, exp DESC)",
+    "CREATE INDEX ix_member_role_association_member_uuid "
+    "ON member_role_association (member_uuid)",
+    "CREATE INDEX ix_levels_value ON levels (value)",
+    "CREATE INDEX ix_roles_server_uuid ON roles (server_uuid)",
+    "CREATE INDEX ix_roleemojis_identifier ON roleemojis (identifier)",
+    "CREATE INDEX ix_commands_name_server_uuid ON commands "
+    "(name, server_uuid)",
+    "CREATE INDEX ix_dota_guilds_server_uuid ON dota_guilds (server_uuid)",
+    "CREATE INDEX ix_steamposts_subscriptions_channel_id "
+    "ON steamposts_subscriptions (channel_id)",
+]
+
+# Lookups of the CRUD classes, with values that exist in the seeded data
+QUERIES = {
+    "member.get_by_ids": """
+        SELECT * FROM members
+        WHERE player_uuid = md5('p15')::uuid
+        AND server_uuid = md5('s2')::uuid
+    """,
+    "member.get_multi_by_server_uuid": """
+        SELECT * FROM members WHERE server_uuid = md5('s2')::uuid
+    """,
+    "member roles": """
+        SELECT * FROM member_role_association
+        WHERE member_uuid = md5('m2-0')::uuid
+    """,
+    "level.get_by_value": "SELECT * FROM levels WHERE value = 42",
+    "role.get_multi_by_server_uuid": """
+        SELECT * FROM roles WHERE server_uuid = md5('s2')::uuid
+    """,
+    "role_emoji.get_by_identifier": """
+        SELECT * FROM roleemojis WHERE identifier = ':e2_3:'
+    """,
+    "command.get_by_name": """
+        SELECT * FROM commands
+        WHERE name = 'cmd3' AND server_uuid = md5('s2')::uuid
+    """,
+    "dota_guild.get_by_server_uuid": """
+        SELECT * FROM dota_guilds WHERE server_uuid = md5('s2')::uuid
+    """,
+    "subscription.get_by_channel": """
+        SELECT * FROM steamposts_subscriptions WHERE channel_id = 'c42'
+    """,
+}
+
+
+def seed_statements(servers: int, members: int) -> list[str]:
+    players = max(members, servers * members // 4)
+    return [
+        """INSERT INTO levels (uuid, value, exp)
+        SELECT md5('l' || i)::uuid, i, 1000 FROM generate_series(1, 500) i""",
+        f"""INSERT INTO servers (uuid, discord_id, name)
+        SELECT md5('s' || i)::uuid, 's' || i, 'Server ' || i
+        FROM generate_series(1, {servers}) i""",
+        f"""INSERT INTO players (uuid, discord_id, name, hidden)
+        SELECT md5('p' || i)::uuid, 'p' || i, 'Player ' || i, false
+        FROM generate_series(1, {players}) i""",
+        f"""INSERT INTO members (uuid, exp, player_uuid, server_uuid,
+            level_uuid)
+        SELECT md5('m' || s || '-' || j)::uuid, (random() * 100000)::int,
+            md5('p' || ((s * 7 + j) % {players} + 1))::uuid,
+            md5('s' || s)::uuid, md5('l' || (1 + (random() * 499)::int))::uuid
+        FROM generate_series(1, {servers}) s,
+            generate_series(0, {members - 1}) j""",
+        f"""INSERT INTO roles (uuid, discord_id, name, server_uuid)
+        SELECT md5('r' || s || '_' || r)::uuid, 'r' || s || '_' || r,
+            'Role ' || r, md5('s' || s)::uuid
+        FROM generate_series(1, {servers}) s, generate_series(1, 20) r""",
+        f"""INSERT INTO roleemojis (uuid, identifier, role_uuid)
+        SELECT md5('e' || s || '_' || r)::uuid, ':e' || s || '_' || r || ':',
+            md5('r' || s || '_' || r)::uuid
+        FROM generate_series(1, {servers}) s, generate_series(1, 20) r""",
+        f"""INSERT INTO member_role_association (role_uuid, member_uuid)
+        SELECT md5('r' || s || '_' || (j % 20 + 1))::uuid,
+            md5('m' || s || '-' || j)::uuid
+        FROM generate_series(1, {servers}) s,
+            generate_series(0, {members - 1}) j""",
+        f"""INSERT INTO commands (uuid, name, server_uuid, status)
+        SELECT md5('c' || s || '_' || c)::uuid, 'cmd' || c,
+            md5('s' || s)::uuid, true
+        FROM generate_series(1, {servers}) s, generate_series(1, 30) c""",
+        f"""INSERT INTO dota_guilds (uuid, role_discord_id, name, server_uuid,
+            guild_id)
+        SELECT md5('d' || i)::uuid, 'd' || i, 'Guild ' || i,
+            md5('s' || i)::uuid, i
+        FROM generate_series(1, {servers}) i""",
+        f"""INSERT INTO steamposts_subscriptions (uuid, channel_id, app_id)
+        SELECT md5('sub' || i)::uuid, 'c' || i, 570
+        FROM generate_series(1, {servers * 10}) i""",
+    ]
+
+
+async def explain(conn) -> dict[str, tuple[str, float]]:
+    await conn.execute(text("ANALYZE"))
+
+    plans = {}
+    for name, query in QUERIES.items():
+        result = await conn.execute(
+            text(f"EXPLAIN (ANALYZE, BUFFERS) {query}")
+        )
+        lines = [row[0] for row in result]
+        time = next(
+            float(m.group(1)) for m in (
+                re.search(r"Execution Time: ([\d.]+) ms", x) for x in lines
+            ) if m
+        )
+        plans[name] = (lines[0].split("  (")[0].strip(), time)
+    return plans
+
+
+async def main(servers: int, members: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        async with engine.begin() as conn:
+            for statement in seed_statements(servers, members):
+                await conn.execute(text(statement))
+
+            for statement in DROP:
+                await conn.execute(text(statement))
+            before = await explain(conn)
+
+            for statement in CREATE:
+                await conn.execute(text(statement))
+            after = await explain(conn)
+
+        print(f"{servers} servers with {members} members each\n")
+        for name in QUERIES:
+            (plan_before, ms_before), (plan_after, ms_after) = \
+                before[name], after[name]
+            print(name)
+            print(f"  before: {ms_before:9.3f} ms  {plan_before}")
+            print(f"  after:  {ms_after:9.3f} ms  {plan_after}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scratch", action="store_true", required=True,
+        help="Confirm that the database is a scratch database"
+    )
+    parser.add_argument("--servers", type=int, default=200)
+    parser.add_argument("--members", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.servers, args.members))
@@ -0,0 +1,145 @@
+"""
+Query-count harness for the database access of bot commands.
+
+Seeds a small and a large server into a scratch database, runs what each
+command reads from the database against both and counts the statements,
+including lazy loads of the attributes the command touches. A command passes
+when both servers take the same number of statements.
+
+Point DB_HOST, DB_USER, DB_PASS and DB_NAME to a scratch database, since the
+tables are created and dropped, and run from the repository root:
+
+    python -m scripts.query_count --scratch
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import event, insert
+
+from core.database import Session, engine
+from core.database.crud.members import member as crud_member
+from core.database.crud.roles import role as crud_role
+from core.database.models import Base, Level, Member, Player, Role, \
+    RoleEmoji, Server
+from core.leaderboard import leaderboards
+
+SIZES = {"small": (10, 5), "large": (1000, 100)}
+
+
+async def seed(session, members: int, roles: int, levels: list) -> uuid.UUID:
+    server = uuid.uuid4()
+    players = [uuid.uuid4() for _ in range(members)]
+    role_uuids = [uuid.uuid4() for _ in range(roles)]
+
+    await session.execute(insert(Server), [{
+        "uuid": server, "discord_id": str(server), "name": str(members)
+    }])
+    await session.execute(insert(Player), [
+        {"uuid": u, "discord_id": str(u), "name": f"Player {i}",
+         "steam_id": str(i) if i % 2 else None, "hidden": False}
+        for i, u in enumerate(players)
+    ])
+    await session.execute(insert(Member), [
+        {"uuid": uuid.uuid4(), "player_uuid": p, "server_uuid": server,
+         "level_uuid": levels[i % len(levels)], "exp": i}
+        for i, p in enumerate(players)
+    ])
+    await session.execute(insert(Role), [
+        {"uuid": u, "discord_id": str(u), "name": f"Role {i}",
+         "server_uuid": server}
+        for i, u in enumerate(role_uuids)
+    ])
+    await session.execute(insert(RoleEmoji), [
+        {"uuid": uuid.uuid4(), "identifier": f":e{i}:", "role_uuid": u}
+        for i, u in enumerate(role_uuids[::2])
+    ])
+    return server
+
+
+async def leaderboard(session, server_uuid):
+    await leaderboards.rebuild(session)
+
+
+async def top(session, server_uuid):
+    # Served from the leaderboards built by the command above
+    for entry in leaderboards.get(server_uuid).top(10):
+        _ = entry.name, entry.level
+
+
+async def role_message(session, server_uuid):
+    for role, emoji in await crud_role.get_multi_with_emojis(
+            session, server_uuid
+    ):
+        _ = role.name, role.description, emoji and emoji.identifier
+
+
+async def dota_guild_sync(session, server_uuid):
+    await crud_member.get_steam_ids_by_server_uuids(session, [server_uuid])
+
+
+COMMANDS = {
+    "leaderboard rebuild": leaderboard,
+    "top": top,
+    "role init / role message update": role_message,
+    "dota_guild_sync": dota_guild_sync,
+}
+
+
+async def count(command, server_uuid) -> int:
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with Session() as session:
+            await command(session, server_uuid)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    return len(statements)
+
+
+async def main() -> bool:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    try:
+        async with Session() as session:
+            levels = [uuid.uuid4() for _ in range(10)]
+            await session.execute(insert(Level), [
+                {"uuid": u, "value": i + 1, "exp": 1000}
+                for i, u in enumerate(levels)
+            ])
+            servers = {
+                name: await seed(session, members, roles, levels)
+                for name, (members, roles) in SIZES.items()
+            }
+            await session.commit()
+
+        passed = True
+        print(f"{'command':<34}{'small':>8}{'large':>8}")
+        for name, command in COMMANDS.items():
+            counts = [await count(command, servers[size]) for size in SIZES]
+            ok = len(set(counts)) == 1
+            passed &= ok
+            print(f"{name:<34}" + "".join(f"{c:>8}" for c in counts) +
+                  ("" if ok else "  grows with the server!"))
+        return passed
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scratch", action="store_true", required=True,
+        help="Confirm that the database is a scratch database"
+    )
+    parser.parse_args()
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -0,0 +1,228 @@
+"""
+Steam news task of the Games cog.
+
+The task runs against in-memory replacements of the Steam API, the database
+session and Discord channels. Storing posts with a single INSERT needs a
+scratch PostgreSQL database and is skipped unless TEST_DB_NAME is set.
+Run from the repository root:
+
+    TEST_DB_NAME=scratch python -m pytest tests
+"""
+import asyncio
+import os
+
+import pytest
+
+# Settings are read on import
+os.environ.setdefault("ADMINS", "0")
+
+from core.cogs import games  # noqa: E402
+from core.database.schemas.steamnews import CreatePost  # noqa: E402
+from core.interfaces.steamapi import (  # noqa: E402
+    SteamAppNews,
+    SteamNewsItem,
+)
+
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME")
+
+
+class Subscription:
+    def __init__(self, app_id: int, channel_id: str):
+        self.app_id = app_id
+        self.channel_id = channel_id
+
+
+class Channel:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, embed):
+        self.sent.append(embed.title)
+
+
+class Bot:
+    def __init__(self, channel_ids: list[str]):
+        self.channels = {int(c): Channel() for c in channel_ids}
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+
+class Steam:
+    """Replaces get_app_news, serves news by app id"""
+
+    def __init__(self, news: dict[int, list[SteamNewsItem]]):
+        self.news = news
+        self.requests = []
+
+    async def get_app_news(self, client, app_id, count, etag=None,
+                           last_modified=None):
+        self.requests.append((app_id, etag))
+        if etag == f'"{app_id}"':
+            return SteamAppNews(app_id=app_id, modified=False, etag=etag)
+        return SteamAppNews(
+            app_id=app_id, etag=f'"{app_id}"', items=self.news[app_id]
+        )
+
+
+class Database:
+    """Replaces the session and the Steam news CRUD"""
+
+    def __init__(self, subs: list[Subscription], gids: set[str]):
+        self.subs = subs
+        self.gids = set(gids)
+        self.inserts = []
+        self.fail_commit = False
+
+    def session(self):
+        database = self
+
+        class Session:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *args):
+                pass
+
+            async def commit(self):
+                if database.fail_commit:
+                    raise RuntimeError("commit failed")
+
+        return Session()
+
+    async def get_multi(self, db):
+        return self.subs
+
+    async def get_existing_gids(self, db, gids):
+        return self.gids & set(gids)
+
+    async def create_many_missing(self, db, posts):
+        self.inserts.append([p.steam_gid for p in posts])
+        created = {p.steam_gid for p in posts} - self.gids
+        self.gids |= created
+        return created
+
+
+def item(gid: str) -> SteamNewsItem:
+    return SteamNewsItem(gid=gid, title=f"Post {gid}", url="", feed_type=1)
+
+
+@pytest.fixture
+def cog(monkeypatch):
+    steam = Steam({570: [item("1"), item("2")], 730: [item("3")]})
+    database = Database([
+        Subscription(570, "1"),
+        Subscription(570, "2"),
+        Subscription(730, "2"),
+    ], gids={"2"})
+
+    monkeypatch.setattr(games, "get_app_news", steam.get_app_news)
+    monkeypatch.setattr(games, "Session", database.session)
+    monkeypatch.setattr(
+        games.crud_subscription, "get_multi", database.get_multi
+    )
+    monkeypatch.setattr(
+        games.crud_post, "get_existing_gids", database.get_existing_gids
+    )
+    monkeypatch.setattr(
+        games.crud_post, "create_many_missing", database.create_many_missing
+    )
+
+    async def sleep(delay):
+        pass
+    monkeypatch.setattr(games.asyncio, "sleep", sleep)
+
+    # The task is run without starting the cog's loops
+    cog = games.Games.__new__(games.Games)
+    cog._Games__bot = Bot(["1", "2"])
+    cog._Games__app_news = {}
+    cog.steam, cog.database = steam, database
+    return cog
+
+
+def run(cog):
+    asyncio.run(games.Games.get_steam_news.coro(cog))
+
+
+def test_fetches_each_app_once(cog):
+    run(cog)
+
+    assert sorted(app_id for app_id, _ in cog.steam.requests) == [570, 730]
+
+
+def test_stores_only_missing_posts(cog):
+    run(cog)
+
+    assert cog.database.inserts == [["1", "3"]]
+
+
+def test_sends_new_posts_to_all_subscribed_channels(cog):
+    run(cog)
+
+    channels = cog._Games__bot.channels
+    assert channels[1].sent == ["Post 1"]
+    assert sorted(channels[2].sent) == ["Post 1", "Post 3"]
+
+
+def test_revalidates_after_posts_are_stored(cog):
+    run(cog)
+    run(cog)
+
+    assert sorted(cog.steam.requests[2:]) == [(570, '"570"'), (730, '"730"')]
+    assert cog.database.inserts == [["1", "3"]]
+
+
+def test_fetches_again_when_posts_are_not_stored(cog):
+    cog.database.fail_commit = True
+    with pytest.raises(RuntimeError):
+        run(cog)
+
+    cog.database.fail_commit = False
+    run(cog)
+
+    assert sorted(cog.steam.requests[2:]) == [(570, None), (730, None)]
+
+
+@pytest.mark.skipif(not TEST_DB_NAME, reason="TEST_DB_NAME is not set")
+def test_create_many_missing_skips_stored_gids():
+    from sqlalchemy.ext.asyncio import async_sessionmaker, \
+        create_async_engine
+
+    from core.database import DATABASE_URL
+    from core.database.crud.steamnews import post as crud_post
+    from core.database.models.steamnews import Post
+
+    # Same server and credentials as the bot, but a scratch database
+    engine = create_async_engine(
+        f"{DATABASE_URL.rsplit('/', 1)[0]}/{TEST_DB_NAME}"
+    )
+    Session = async_sessionmaker(bind=engine)
+
+    def post(gid: str) -> CreatePost:
+        return CreatePost(steam_gid=gid, title=gid, content="")
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(Post.__table__.create)
+        try:
+            async with Session() as session:
+                first = await crud_post.create_many_missing(
+                    session, [post("a"), post("b")]
+                )
+                second = await crud_post.create_many_missing(
+                    session, [post("b"), post("c")]
+                )
+                await session.commit()
+            return first, second
+        finally:
+            async with engine.begin() as conn:
+                await conn.run_sync(Post.__table__.drop)
+            await engine.dispose()
+
+    first, second = asyncio.run(main())
+
+    assert first == {"a", "b"}
+    assert second == {"c"}
@@ -0,0 +1,115 @@
+"""
+Steam news client against a local stub of the Steam Web API.
+
+Run from the repository root:
+
+    python -m pytest tests
+"""
+import asyncio
+import os
+
+# Settings are read on import
+os.environ.setdefault("ADMINS", "0")
+
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from core.config import settings  # noqa: E402
+from core.interfaces.http import HTTPClient  # noqa: E402
+from core.interfaces.steamapi import get_app_news  # noqa: E402
+
+ETAG = '"news-1"'
+LAST_MODIFIED = "Sun, 18 Oct 2026 12:00:00 GMT"
+NEWS = {
+    "appnews": {
+        "appid": 570,
+        "newsitems": [
+            {"gid": "1", "title": "Patch", "url": "https://example.com/1"},
+            {"gid": "2", "title": "Event", "url": "https://example.com/2"},
+        ]
+    }
+}
+
+
+class StubSteam:
+    def __init__(self):
+        self.requests = []
+        self.failures = 0
+
+    async def news(self, request: web.Request) -> web.Response:
+        self.requests.append(request)
+
+        if self.failures:
+            self.failures -= 1
+            return web.Response(status=503)
+
+        if request.query["appid"] == "404":
+            return web.Response(status=404)
+
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304)
+
+        return web.json_response(
+            NEWS, headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED}
+        )
+
+
+def run(steam: StubSteam, *calls):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/ISteamNews/GetNewsForApp/v0002/", steam.news)
+
+        server = TestServer(app)
+        await server.start_server()
+        client = HTTPClient(
+            timeout=5, limit=10, limit_per_host=10, retries=2, backoff=0
+        )
+        url, settings.STEAM_API_URL = \
+            settings.STEAM_API_URL, str(server.make_url("")).rstrip("/")
+        try:
+            return [await call(client) for call in calls]
+        finally:
+            settings.STEAM_API_URL = url
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_fetches_news_with_validators():
+    steam = StubSteam()
+    news, = run(steam, lambda c: get_app_news(c, 570, 20))
+
+    assert news.modified
+    assert [item.gid for item in news.items] == ["1", "2"]
+    assert (news.etag, news.last_modified) == (ETAG, LAST_MODIFIED)
+    assert steam.requests[0].query["count"] == "20"
+
+
+def test_revalidates_with_previous_validators():
+    steam = StubSteam()
+    news, = run(steam, lambda c: get_app_news(
+        c, 570, 20, etag=ETAG, last_modified=LAST_MODIFIED
+    ))
+
+    assert not news.modified
+    assert news.items == []
+    assert (news.etag, news.last_modified) == (ETAG, LAST_MODIFIED)
+    assert steam.requests[0].headers["If-None-Match"] == ETAG
+    assert steam.requests[0].headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_retries_temporary_failures():
+    steam = StubSteam()
+    steam.failures = 2
+    news, = run(steam, lambda c: get_app_news(c, 570, 20))
+
+    assert news.modified
+    assert len(steam.requests) == 3
+
+
+def test_missing_app_has_no_news():
+    steam = StubSteam()
+    news, = run(steam, lambda c: get_app_news(c, 404, 20))
+
+    assert news is None